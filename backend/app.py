@@ -1,15 +1,68 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, request, jsonify, render_template
 from datetime import datetime
-import csv
+from werkzeug.exceptions import HTTPException
+import math
 import os
+import time
+import numpy as np
+import config
 from logic import fuzzy_logic
+from logic.rescore import rescore_devices
+from server.downsample import DOWNSAMPLE_METHODS, MIN_POINTS, downsample
+from server.events import EventStream
+from server.ingest import IngestClosed, IngestQueue, QueueFull
+from server.registry import DeviceRegistry
+from server.wire import UnsupportedFormat, available_formats, decode_body, expand_usage
+from storage import create_storage
+from storage.app_usage import AppUsageStore
+from storage.rollups import RollupStore
+from storage.timeseries import TimeSeriesStore, make_record
 
 app = Flask(__name__)
+app.config["MAX_CONTENT_LENGTH"] = config.MAX_REQUEST_SIZE
 
 # === KONFIGURASI ===
 DATA_FOLDER = "data"
 os.makedirs(DATA_FOLDER, exist_ok=True)
 
+# Backend penyimpanan (config.STORAGE_BACKEND), ditulis di thread background
+STORAGE = create_storage(config.STORAGE_BACKEND, DATA_FOLDER)
+
+# Riwayat per device sebagai record biner (dibaca lewat memmap)
+TIMESERIES = None
+if config.TIMESERIES_ENABLED:
+    TIMESERIES = TimeSeriesStore(
+        config.TIMESERIES_FOLDER,
+        queue_size=config.WRITER_QUEUE_SIZE,
+        flush_rows=config.WRITER_FLUSH_ROWS,
+        flush_interval=config.WRITER_FLUSH_INTERVAL
+    )
+
+# Detail app usage terkompresi kamus (nama aplikasi -> app_id)
+APP_USAGE = None
+if config.APP_USAGE_STORE_ENABLED:
+    APP_USAGE = AppUsageStore(
+        config.APP_USAGE_FOLDER,
+        queue_size=config.WRITER_QUEUE_SIZE,
+        flush_rows=config.WRITER_FLUSH_ROWS,
+        flush_interval=config.WRITER_FLUSH_INTERVAL
+    )
+
+# Mode engine fuzzy & cache hasil inferensi (lihat config.py)
+fuzzy_logic.set_engine(config.FUZZY_ENGINE)
+if config.FUZZY_ENGINE == "mamdani":
+    # skfuzzy diimpor malas; bangun ControlSystem sekarang, bukan di upload pertama
+    fuzzy_logic.warm_engine()
+fuzzy_logic.configure_cache(
+    config.STRESS_CACHE_SIZE,
+    config.STRESS_CACHE_TTL,
+    config.STRESS_CACHE_DECIMALS
+)
+
+# Hot reload rule base (config.RULES_PATH) tanpa restart server
+if config.RULES_RELOAD_INTERVAL:
+    fuzzy_logic.start_rule_watcher(config.RULES_RELOAD_INTERVAL)
+
 # State Global untuk data IoT terakhir
 LAST_IOT_DATA = {
     "temperature": 25.0,
@@ -18,8 +71,19 @@ LAST_IOT_DATA = {
     "timestamp": datetime.now()
 }
 
-# State Global untuk data HP terakhir
-LATEST_PHONE_DATA = {}
+# Rollup per jam/hari per device (diperbarui setiap upload)
+ROLLUPS = None
+if config.ROLLUP_ENABLED:
+    ROLLUPS = RollupStore(
+        config.ROLLUP_FOLDER,
+        config.ROLLUP_SAVE_INTERVAL,
+        ttl=config.DEVICE_TTL,
+        max_devices=config.DEVICE_MAX,
+        max_hour_buckets=config.ROLLUP_MAX_HOUR_BUCKETS
+    )
+
+# State Global untuk data HP terakhir per device (thread-safe, TTL/LRU)
+DEVICES = DeviceRegistry(config.DEVICE_TTL, config.DEVICE_MAX)
 
 # State Global untuk screen time terakhir
 LAST_SCREEN_TIME = 0.0
@@ -31,9 +95,8 @@ def dashboard():
     """Halaman utama dashboard"""
     return render_template('dashboard.html')
 
-@app.route('/api/dashboard_data')
-def get_dashboard_data():
-    """API untuk frontend mengambil data real-time"""
+def build_dashboard_data():
+    """State dashboard: data IoT terakhir + analisis device terakhir"""
     
     # Default values
     current_device = "Menunggu Data..."
@@ -42,15 +105,14 @@ def get_dashboard_data():
     current_cat = "-"
     
     # Ambil data HP terakhir jika ada
-    if LATEST_PHONE_DATA:
-        last_device_id = list(LATEST_PHONE_DATA.keys())[-1]
-        data = LATEST_PHONE_DATA[last_device_id]
-        current_device = last_device_id
+    latest = DEVICES.latest()
+    if latest:
+        current_device, data = latest
         current_stress = data['stress_val']
         current_msg = data['msg']
         current_cat = data['category']
 
-    return jsonify({
+    return {
         "iot": {
             "temp": LAST_IOT_DATA["temperature"],
             "humid": LAST_IOT_DATA["humidity"],
@@ -64,131 +126,413 @@ def get_dashboard_data():
             "category": current_cat,
             "message": current_msg
         }
+    }
+
+# Push perubahan state ke dashboard (SSE)
+EVENTS = EventStream(
+    build_dashboard_data,
+    config.SSE_KEEPALIVE,
+    config.SSE_COALESCE,
+    config.SSE_MAX_CLIENTS
+)
+
+def too_many_viewers():
+    """503 + Retry-After saat SSE/long-poll sudah mencapai SSE_MAX_CLIENTS"""
+    return jsonify({"error": "Too many stream clients"}), 503, {"Retry-After": str(config.SSE_RETRY_AFTER)}
+
+@app.route('/api/dashboard_data')
+def get_dashboard_data():
+    """
+    API untuk frontend mengambil data real-time.
+    Mendukung If-None-Match (304 jika state belum berubah) dan long-poll
+    ?since=<versi>: menunggu sampai versi state berbeda (maks LONGPOLL_TIMEOUT),
+    304 jika tetap sama, 503 jika viewer sudah SSE_MAX_CLIENTS. Versi state
+    dikirim di header X-State-Version.
+    """
+    since = request.args.get("since", type=int)
+    if since is not None:
+        # Tanpa menunggu, klien long-poll akan mengulang request terus-menerus
+        if not EVENTS.connect():
+            return too_many_viewers()
+        try:
+            EVENTS.wait(since, config.LONGPOLL_TIMEOUT)
+        finally:
+            EVENTS.disconnect()
+
+    # Body JSON sudah diserialisasi sekali per versi state
+    version, body = EVENTS.payload()
+    response = Response(body, mimetype="application/json")
+    response.set_etag(EVENTS.etag(version))
+    response.headers["X-State-Version"] = str(version)
+    response.headers["Cache-Control"] = "no-cache"
+
+    if since is not None and version == since:
+        response.status_code = 304
+        response.set_data(b"")
+        return response
+    return response.make_conditional(request)
+
+@app.route('/api/stream')
+def stream():
+    """Server-Sent Events: state dashboard dikirim setiap kali berubah"""
+    if not EVENTS.connect():
+        return too_many_viewers()
+
+    response = Response(EVENTS.stream(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
     })
+    # Dilepas saat response ditutup, termasuk jika generator tidak pernah dimulai
+    response.call_on_close(EVENTS.disconnect)
+    return response
+
+# Kolom time-series yang dikirim /api/history
+HISTORY_SERIES = ("stress_val", "screen_hours", "temp", "humid", "aq")
+
+def parse_time(value):
+    """Parameter waktu: epoch detik, "YYYY-MM-DD HH:MM:SS", atau ISO 8601"""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+@app.route('/api/history/<device_id>')
+def history(device_id):
+    """
+    Riwayat skor stres + input satu device dalam rentang ?from=&to=,
+    di-downsample di server menjadi maks ?points=N titik per series
+    (?method=lttb|minmax). Rentang dicari dengan binary search di
+    time-series biner (storage/timeseries.py), bukan scan CSV.
+    """
+    if TIMESERIES is None:
+        return jsonify({"error": "Time-series store is disabled"}), 404
+
+    try:
+        start = parse_time(request.args.get("from"))
+        end = parse_time(request.args.get("to"))
+        points = min(request.args.get("points", config.HISTORY_POINTS, type=int), config.HISTORY_MAX_POINTS)
+        method = request.args.get("method", "lttb")
+        if method not in DOWNSAMPLE_METHODS:
+            raise ValueError(f"Unknown method: {method}")
+        if points < MIN_POINTS[method]:
+            raise ValueError(f"points must be at least {MIN_POINTS[method]} for {method}")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    records = TIMESERIES.read(device_id, start, end)
+    timestamps = records["timestamp"]
+    series = {}
+    for name in HISTORY_SERIES:
+        values = records[name]
+        index = downsample(timestamps, values, points, method)
+        series[name] = {
+            "t": timestamps[index].tolist(),
+            "v": np.round(values[index].astype(float), 3).tolist()
+        }
+
+    return jsonify({
+        "device_id": device_id,
+        "from": start,
+        "to": end,
+        "total": len(records),
+        "method": method,
+        "series": series
+    }), 200
+
+@app.route('/api/rollups/<device_id>')
+def rollups(device_id):
+    """
+    Rollup per jam/hari satu device (?period=hour|day&from=&to=):
+    count, mean/min/max stres & input, histogram 5 kategori stres.
+    """
+    if ROLLUPS is None:
+        return jsonify({"error": "Rollups are disabled"}), 404
+
+    try:
+        period = request.args.get("period", "day")
+        buckets = ROLLUPS.query(
+            device_id,
+            period,
+            parse_time(request.args.get("from")),
+            parse_time(request.args.get("to"))
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"device_id": device_id, "period": period, "buckets": buckets}), 200
 
 # === ROUTE PENERIMA DATA ===
 
+def read_payload():
+    """Body request ingest: JSON/MessagePack/CBOR, opsional gzip (lihat server/wire.py)"""
+    return decode_body(
+        request.get_data(cache=False),
+        request.mimetype,
+        request.content_encoding,
+        config.MAX_DECOMPRESSED_SIZE
+    )
+
 @app.route('/receive_sensor', methods=['POST'])
 def receive_sensor():
     """Menerima data dari IoT sensor (simulator)"""
     global LAST_IOT_DATA
     
     try:
-        data = request.get_json(force=True)
+        try:
+            data = read_payload()
+        except UnsupportedFormat as e:
+            return jsonify({"error": str(e)}), 415
         
         LAST_IOT_DATA["temperature"] = float(data.get("temperature", 25))
         LAST_IOT_DATA["humidity"] = float(data.get("humidity", 50))
         LAST_IOT_DATA["air_quality"] = float(data.get("air_quality", 0.1))
         LAST_IOT_DATA["timestamp"] = datetime.now()
+
+        STORAGE.record_sensor(
+            data.get("sensor_id", "room"),
+            LAST_IOT_DATA["timestamp"].strftime("%Y-%m-%d %H:%M:%S"),
+            LAST_IOT_DATA["temperature"],
+            LAST_IOT_DATA["humidity"],
+            LAST_IOT_DATA["air_quality"]
+        )
         
         print(f"[IoT] T:{LAST_IOT_DATA['temperature']}°C H:{LAST_IOT_DATA['humidity']}% AQ:{LAST_IOT_DATA['air_quality']}")
+
+        # Hitung ulang skor device aktif dengan kondisi ruangan baru
+        rescored = rescore_phone_data() if config.RESCORE_ENABLED else 0
+        EVENTS.publish()
         
-        return jsonify({"status": "updated"}), 200
+        return jsonify({"status": "updated", "rescored": rescored}), 200
     
+    except HTTPException:
+        # Mis. 413 dari werkzeug (body > MAX_REQUEST_SIZE): teruskan status aslinya
+        raise
     except Exception as e:
         print(f"[ERROR] receive_sensor: {e}")
         return jsonify({"error": str(e)}), 400
 
-@app.route('/receive_usage', methods=['POST'])
-def receive_usage():
-    """Menerima data screen time dari Android"""
-    global LATEST_PHONE_DATA, LAST_SCREEN_TIME
-    
+def rescore_phone_data():
+    """Rescore semua device aktif (batch) lalu terapkan hasilnya sekaligus"""
+    devices = DEVICES.active(config.RESCORE_ACTIVE_WINDOW)
+    updates = rescore_devices(devices, LAST_IOT_DATA)
+    if not updates:
+        return 0
+
+    # Device yang upload baru selama rescoring berjalan dilewati
+    applied = DEVICES.replace_many(updates, devices)
+    print(f"[RESCORE] {applied} device dihitung ulang")
+    return applied
+
+def parse_usage(data):
+    """Validasi payload upload HP -> (device_id, total_sec, usage_list)"""
+    if not data or not isinstance(data, dict):
+        raise ValueError("No data")
+
+    device_id = str(data.get("device_id", "unknown_device"))
     try:
-        data = request.get_json(force=True)
-        if not data:
-            return jsonify({"error": "No data"}), 400
-
-        # 1. Identifikasi Device
-        device_id = data.get("device_id", "unknown_device")
-        total_sec = data.get("total_screen_time_s", 0)
-        usage_list = data.get("usage_data", [])
-        
-        # 2. Konversi ke jam
-        total_hours = total_sec / 3600
-        LAST_SCREEN_TIME = total_hours  # ✅ TAMBAHAN INI
-        
-        # 3. Hitung dengan Fuzzy Logic
-        fuzzy_result = fuzzy_logic.calculate_stress(
-            total_hours, 
-            LAST_IOT_DATA["temperature"], 
-            LAST_IOT_DATA["humidity"], 
-            LAST_IOT_DATA["air_quality"]
-        )
-        
-        # 4. Simpan ke CSV (terpisah per device)
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        # File summary: data/dataset_{device_id}.csv
-        filename_summary = os.path.join(DATA_FOLDER, f"dataset_{device_id}.csv")
-        file_exists = os.path.isfile(filename_summary)
-        
-        with open(filename_summary, 'a', newline='') as f:
-            writer = csv.writer(f)
-            if not file_exists:
-                writer.writerow([
-                    "timestamp", "temp", "humid", "aq", 
-                    "screen_hours", "stress_val", "category"
-                ])
-            writer.writerow([
-                timestamp,
-                LAST_IOT_DATA["temperature"],
-                LAST_IOT_DATA["humidity"],
-                LAST_IOT_DATA["air_quality"],
-                f"{total_hours:.2f}",
-                fuzzy_result["stress_value"],
-                fuzzy_result["category"]
-            ])
-        
-        # File detail app usage: data/detail_{device_id}.csv (opsional)
-        if usage_list:
-            filename_detail = os.path.join(DATA_FOLDER, f"detail_{device_id}.csv")
-            detail_exists = os.path.isfile(filename_detail)
-            
-            with open(filename_detail, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                if not detail_exists:
-                    writer.writerow(["timestamp", "app_name", "duration_sec"])
-                for app in usage_list:
-                    writer.writerow([
-                        timestamp,
-                        app.get("app_name", "unknown"),
-                        app.get("foreground_time_s", 0)
-                    ])
-        
-        # 5. Update state global untuk dashboard
-        LATEST_PHONE_DATA[device_id] = {
+        total_sec = float(data.get("total_screen_time_s", 0))
+    except (TypeError, ValueError):
+        raise ValueError("total_screen_time_s must be a number")
+    usage_list = expand_usage(data.get("usage_data") or [])
+    if not isinstance(usage_list, list) or not all(isinstance(app, dict) for app in usage_list):
+        raise ValueError("usage_data must be a list of objects")
+    for app in usage_list:
+        try:
+            seconds = float(app.get("foreground_time_s", 0))
+        except (TypeError, ValueError):
+            seconds = None
+        if seconds is None or not math.isfinite(seconds):
+            raise ValueError("foreground_time_s must be a number")
+    return device_id, total_sec, usage_list
+
+def room_snapshot():
+    """Salinan input ruangan terakhir (LAST_IOT_DATA diubah in-place oleh receive_sensor)"""
+    return {
+        "temperature": LAST_IOT_DATA["temperature"],
+        "humidity": LAST_IOT_DATA["humidity"],
+        "air_quality": LAST_IOT_DATA["air_quality"]
+    }
+
+def process_usage(device_id, total_sec, usage_list, iot=None):
+    """
+    Scoring fuzzy + penyimpanan + update state untuk satu upload HP.
+    iot: kondisi ruangan saat upload diterima (default: LAST_IOT_DATA sekarang)
+    """
+    global LAST_SCREEN_TIME
+    iot = iot or room_snapshot()
+
+    # 2. Konversi ke jam
+    total_hours = total_sec / 3600
+    LAST_SCREEN_TIME = total_hours  # ✅ TAMBAHAN INI
+    
+    # 3. Hitung dengan Fuzzy Logic (tanpa detail membership, tidak dipakai di sini)
+    fuzzy_result = fuzzy_logic.calculate_stress(
+        total_hours, 
+        iot["temperature"], 
+        iot["humidity"], 
+        iot["air_quality"],
+        detail="none"
+    )
+    
+    # 4. Simpan reading + detail app usage (per device, ditulis di background)
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    STORAGE.record_usage(
+        device_id,
+        timestamp,
+        {
+            "temp": iot["temperature"],
+            "humid": iot["humidity"],
+            "aq": iot["air_quality"],
+            "screen_hours": f"{total_hours:.2f}",
+            "stress_val": fuzzy_result["stress_value"],
+            "category": fuzzy_result["category"]
+        },
+        [(app.get("app_name", "unknown"), app.get("foreground_time_s", 0)) for app in usage_list]
+    )
+    if APP_USAGE is not None and usage_list:
+        APP_USAGE.append(device_id, timestamp, [
+            (app.get("app_name", "unknown"), app.get("foreground_time_s", 0)) for app in usage_list
+        ])
+    if ROLLUPS is not None:
+        ROLLUPS.add(device_id, time.time(), {
             "stress_val": fuzzy_result["stress_value"],
+            "screen_hours": total_hours,
+            "temp": iot["temperature"],
+            "humid": iot["humidity"],
+            "aq": iot["air_quality"]
+        }, fuzzy_result["category"])
+    if TIMESERIES is not None:
+        TIMESERIES.append(device_id, make_record(
+            timestamp,
+            iot["temperature"],
+            iot["humidity"],
+            iot["air_quality"],
+            total_hours,
+            fuzzy_result["stress_value"],
+            fuzzy_result["category"]
+        ))
+    
+    # 5. Update state global untuk dashboard (+ input untuk rescoring)
+    DEVICES.put(device_id, {
+        "stress_val": fuzzy_result["stress_value"],
+        "category": fuzzy_result["category"],
+        "msg": fuzzy_result["message"],
+        "screen_hours": total_hours,
+        "inputs": {
+            "temperature": iot["temperature"],
+            "humidity": iot["humidity"],
+            "air_quality": iot["air_quality"]
+        },
+        "updated_at": time.time()
+    })
+    EVENTS.publish()
+
+    # Log
+    print(f"\n✅ [Android:{device_id}] Screen:{total_hours:.1f}h | Stress:{fuzzy_result['stress_value']:.0f} ({fuzzy_result['category']})")
+    print(f"   Rules activated: {fuzzy_result['fuzzy_details']['total_rules']}")
+    print(f"   IoT: T={iot['temperature']}°C, H={iot['humidity']}%, AQ={iot['air_quality']}\n")
+    print(f"   Proximity activated: diff under 5 minute accepted \n")
+
+    return {
+        "status": "success",
+        "device_id": device_id,
+        "level" : fuzzy_result["category"],
+        "message": fuzzy_result["message"], 
+        "fuzzy_analysis": {
+            "stress_value": fuzzy_result["stress_value"],
             "category": fuzzy_result["category"],
-            "msg": fuzzy_result["message"]
+            "message": fuzzy_result["message"],
+            "activated_rules": fuzzy_result['fuzzy_details']['total_rules']
         }
+    }
+
+# Antrean ingest asinkron (INGEST_MODE = "async" atau ?async=1)
+INGEST = IngestQueue(
+    lambda upload: process_usage(*upload),
+    config.INGEST_WORKERS,
+    config.INGEST_MAX_DEPTH,
+    config.INGEST_MAX_RESULTS
+)
+
+@app.route('/receive_usage', methods=['POST'])
+def receive_usage():
+    """Menerima data screen time dari Android"""
+    try:
+        # 1. Identifikasi Device + validasi payload
+        try:
+            upload = parse_usage(read_payload())
+        except UnsupportedFormat as e:
+            return jsonify({"error": str(e)}), 415
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Mode async: balas segera, scoring & penyimpanan di worker.
+        # Kondisi ruangan diambil sekarang, bukan saat worker memproses.
+        if config.INGEST_MODE == "async" or request.args.get("async") == "1":
+            try:
+                ingest_id = INGEST.submit(upload[0], upload + (room_snapshot(),))
+            except QueueFull:
+                return jsonify({"error": "Ingest queue is full"}), 429, {"Retry-After": str(config.INGEST_RETRY_AFTER)}
+            except IngestClosed:
+                return jsonify({"error": "Server is shutting down"}), 503
+
+            return jsonify({
+                "status": "accepted",
+                "device_id": upload[0],
+                "ingest_id": ingest_id,
+                "result_url": f"/api/ingest/{ingest_id}"
+            }), 202
 
-        # Log
-        print(f"\n✅ [Android:{device_id}] Screen:{total_hours:.1f}h | Stress:{fuzzy_result['stress_value']:.0f} ({fuzzy_result['category']})")
-        print(f"   Rules activated: {fuzzy_result['fuzzy_details']['total_rules']}")
-        print(f"   IoT: T={LAST_IOT_DATA['temperature']}°C, H={LAST_IOT_DATA['humidity']}%, AQ={LAST_IOT_DATA['air_quality']}\n")
-        print(f"   Proximity activated: diff under 5 minute accepted \n")
-
-        return jsonify({
-            "status": "success",
-            "device_id": device_id,
-            "level" : fuzzy_result["category"],
-            "message": fuzzy_result["message"], 
-            "fuzzy_analysis": {
-                "stress_value": fuzzy_result["stress_value"],
-                "category": fuzzy_result["category"],
-                "message": fuzzy_result["message"],
-                "activated_rules": fuzzy_result['fuzzy_details']['total_rules']
-            }
-        }), 200
+        return jsonify(process_usage(*upload)), 200
     
+    except HTTPException:
+        # Mis. 413 dari werkzeug (body > MAX_REQUEST_SIZE): teruskan status aslinya
+        raise
     except Exception as e:
         print(f"[ERROR] receive_usage: {e}")
         import traceback
         traceback.print_exc()  # ✅ Print full error untuk debugging
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/ingest/<ingest_id>', methods=['GET'])
+def ingest_result(ingest_id):
+    """Status upload async: queued / done (+ hasil fuzzy) / error"""
+    status = INGEST.result(ingest_id)
+    if status is None:
+        return jsonify({"error": "Unknown ingest id"}), 404
+    return jsonify({"ingest_id": ingest_id, **status}), 200
+
 # === ENDPOINT UNTUK DEBUGGING ===
+@app.route('/api/engine_stats', methods=['GET'])
+def engine_stats():
+    """Mode engine fuzzy dan counter cache (hit/miss/eviction)"""
+    return jsonify({
+        "engine": fuzzy_logic.ENGINE_MODE,
+        "rules": fuzzy_logic.active_rulebase().source_hash[:12],
+        "cache": fuzzy_logic.cache_stats(),
+        "devices": DEVICES.stats(),
+        "wire_formats": available_formats(),
+        "ingest": {"mode": config.INGEST_MODE, "depth": INGEST.depth(), **INGEST.stats},
+        "storage": {"backend": config.STORAGE_BACKEND, **STORAGE.stats}
+    }), 200
+
+@app.route('/api/reload_rules', methods=['POST'])
+def reload_rules():
+    """Compile ulang rule base dari config + file aturan dan langsung dipakai"""
+    try:
+        reloaded = fuzzy_logic.reload_rules()
+    except (OSError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    rulebase = fuzzy_logic.active_rulebase()
+    return jsonify({
+        "reloaded": reloaded,
+        "rules": rulebase.source_hash[:12],
+        "total_rules": len(rulebase.rule_consequents)
+    }), 200
+
 @app.route('/test', methods=['GET'])
 def test_endpoint():
     """Endpoint untuk test koneksi dari Android"""
@@ -207,9 +551,16 @@ if __name__ == "__main__":
     print("Test dari HP: http://192.168.1.50:5000/test")
     print("\nAPI Endpoints:")
     print("  - POST /receive_sensor (IoT data)")
-    print("  - POST /receive_usage (Android screen time)")
+    print("  - POST /receive_usage (Android screen time, ?async=1 -> 202 + ingest_id)")
+    print("  - GET  /api/ingest/<ingest_id> (Hasil upload async)")
+    print("  - GET  /api/dashboard_data (ETag / long-poll ?since=<versi>)")
+    print("  - GET  /api/stream (SSE push dashboard)")
+    print("  - GET  /api/history/<device_id>?from=&to=&points=N (Riwayat)")
+    print("  - GET  /api/rollups/<device_id>?period=hour|day (Rollup)")
     print("  - GET  /test (Connection test)")
+    print("  - GET  /api/engine_stats (Fuzzy engine & cache stats)")
+    print("  - POST /api/reload_rules (Muat ulang rule base)")
     print("=" * 60)
     
     # Host 0.0.0.0 agar bisa diakses dari jaringan lokal
-    app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
+    app.run(host="0.0.0.0", port=5000, debug=True, threaded=True)
\ No newline at end of file
@@ -0,0 +1,423 @@
+"""
+benchmark_fuzzy.py
+Benchmark dan regression suite untuk semua engine inferensi fuzzy:
+  - latency per panggilan (mean, p50, p90, p99) setiap engine,
+  - throughput batch (baris/detik) setiap engine,
+  - cold start (import + inferensi pertama) di proses Python baru,
+  - akurasi terhadap grid referensi skfuzzy yang dibekukan
+    (benchmark_reference.json): error maksimum + category flip rate,
+    dibandingkan dengan ACCURACY_THRESHOLDS (titik interior dan batas
+    range) atau HUMIDITY_EDGE_THRESHOLDS (titik di humidity maksimum).
+
+Hasil ditulis ke JSON (default benchmark_results.json) agar bisa
+dibandingkan antar commit dengan --compare.
+
+Usage:
+    python benchmark_fuzzy.py
+    python benchmark_fuzzy.py --output hasil_baru.json --compare hasil_lama.json
+    python benchmark_fuzzy.py --freeze     # bangun ulang grid referensi (skfuzzy, ~2 menit)
+"""
+
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from logic import fuzzy_logic
+
+# ========================================
+# KONFIGURASI
+# ========================================
+NUM_INPUTS = 2000                 # jumlah input acak per engine
+SLOW_ENGINE_INPUTS = 50           # skfuzzy ~80 ms/panggilan, cukup sampel kecil
+BATCH_ROWS = 200000               # baris per pengukuran throughput batch
+ENGINE_MODES = ["mamdani", "analytic", "sparse", "kernel", "surface", "sugeno"]
+BASELINE_MODE = "mamdani"
+DETAIL_LEVELS = ["none", "memberships", "full"]
+STARTUP_RUNS = 3
+
+# Grid referensi: titik interior per sumbu (tanpa batas range, karena
+# skfuzzy salah di humidity = 90, lihat logic/centroid.py). Batas range
+# dicek terpisah: setiap sisi (low/high satu input) dengan titik interior
+# di input lain.
+REFERENCE_PATH = "benchmark_reference.json"
+REFERENCE_POINTS_PER_AXIS = 6
+BOUNDARY_POINTS_PER_AXIS = 3
+SLOW_ENGINE_REFERENCE_POINTS = 150   # mamdani hanya dicek di sebagian titik
+RESULTS_PATH = "benchmark_results.json"
+
+# Batas akurasi terhadap grid skfuzzy: (error maksimum, category flip rate)
+ACCURACY_THRESHOLDS = {
+    "mamdani": (1e-6, 0.0),
+    "analytic": (0.05, 0.0),
+    "sparse": (0.05, 0.0),
+    "kernel": (0.05, 0.0),
+    "surface": (10.0, 0.02),
+    "sugeno": (8.0, 0.05),
+}
+
+# Skor yang berjarak kurang dari ini dari batas kategori (mis. tepat 40.0)
+# tidak dihitung sebagai category flip: selisih float 1e-12 bukan regresi.
+CATEGORY_EPSILON = 1e-6
+
+# Titik batas memakai ACCURACY_THRESHOLDS, kecuali sisi humidity maksimum
+# (90): engine closed-form memberi humidity['high'] = 1.0 di sana, skfuzzy
+# ~0 (lihat logic/centroid.py). Selisih skor terukur 2.29 poin tanpa
+# category flip; hanya batas error maksimum yang dilonggarkan.
+HUMIDITY_EDGE_THRESHOLDS = dict(
+    ACCURACY_THRESHOLDS,
+    analytic=(2.5, 0.0),
+    sparse=(2.5, 0.0),
+    kernel=(2.5, 0.0),
+)
+
+# Dijalankan di proses baru agar cache import / ControlSystem tidak terbawa
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from logic import fuzzy_logic
+imported = time.perf_counter()
+skfuzzy_loaded = "skfuzzy" in sys.modules
+fuzzy_logic.set_engine(sys.argv[1])
+fuzzy_logic.calculate_stress(10, 35, 85, 1.0)
+done = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - start,
+    "first_call_s": done - imported,
+    "skfuzzy_on_import": skfuzzy_loaded,
+}))
+"""
+
+
+def print_header(text):
+    """Print header dengan border"""
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70)
+
+def make_inputs(n, seed=0):
+    """Input acak (screen, temp, humid, aq) di dalam range masing-masing"""
+    rng = random.Random(seed)
+    return [
+        tuple(rng.uniform(low, high) for low, high in fuzzy_logic.INPUT_RANGES)
+        for _ in range(n)
+    ]
+
+def time_engine(engine, inputs):
+    """Latency per panggilan (mikrodetik) untuk setiap input"""
+    timings = []
+    for case in inputs:
+        start = time.perf_counter()
+        engine(*case)
+        timings.append((time.perf_counter() - start) * 1e6)
+    return timings
+
+def latency_stats(timings):
+    """mean, p50, p90, p99 (mikrodetik) dari list timing"""
+    cuts = statistics.quantiles(timings, n=100)
+    return {
+        "mean_us": statistics.fmean(timings),
+        "p50_us": statistics.median(timings),
+        "p90_us": cuts[89],
+        "p99_us": cuts[98],
+        "calls": len(timings),
+    }
+
+def benchmark_engines(modes=ENGINE_MODES):
+    """Statistik latency per engine: {mode: {"mean_us", "p50_us", "p90_us", "p99_us", "calls"}}"""
+    results = {}
+    for mode in modes:
+        engine = fuzzy_logic.get_engine(mode)
+        n = SLOW_ENGINE_INPUTS if mode == "mamdani" else NUM_INPUTS
+        inputs = make_inputs(n)
+
+        engine(*inputs[0])  # warm-up (pool simulasi, cache import)
+        results[mode] = latency_stats(time_engine(engine, inputs))
+    return results
+
+def batch_function(mode):
+    """Jalur batch (array) untuk setiap engine"""
+    if mode == "mamdani":
+        return lambda *x: fuzzy_logic.calculate_stress_batch(*x, defuzzify="sampled")
+    if mode in ("analytic", "sparse", "kernel"):
+        return lambda *x: fuzzy_logic.calculate_stress_batch(*x, defuzzify="analytic")
+    if mode == "surface":
+        from logic import surface
+        return surface.load_or_build().values
+    if mode == "sugeno":
+        from logic import sugeno
+        return sugeno.load_or_fit().values
+    raise ValueError(f"Unknown fuzzy engine mode: {mode!r}")
+
+def benchmark_batch(modes=ENGINE_MODES, rows=BATCH_ROWS):
+    """Throughput batch per engine (baris/detik)"""
+    rng = np.random.default_rng(0)
+    inputs = [rng.uniform(low, high, rows) for low, high in fuzzy_logic.INPUT_RANGES]
+
+    results = {}
+    for mode in modes:
+        func = batch_function(mode)
+        func(*(x[:100] for x in inputs))  # warm-up
+        start = time.perf_counter()
+        func(*inputs)
+        elapsed = time.perf_counter() - start
+        results[mode] = {"rows": rows, "seconds": elapsed, "rows_per_s": rows / elapsed}
+    return results
+
+def benchmark_details(levels=DETAIL_LEVELS):
+    """Latency calculate_stress (engine aktif, tanpa cache) per level detail"""
+    inputs = make_inputs(NUM_INPUTS)
+    results = {}
+    for level in levels:
+        timings = time_engine(lambda *case: fuzzy_logic.calculate_stress(*case, detail=level), inputs)
+        results[level] = latency_stats(timings)
+    return results
+
+def benchmark_startup(modes=ENGINE_MODES, runs=STARTUP_RUNS):
+    """Cold start per mode (median dari beberapa proses baru)"""
+    results = {}
+    for mode in modes:
+        samples = []
+        for _ in range(runs):
+            output = subprocess.run(
+                [sys.executable, "-c", STARTUP_SCRIPT, mode],
+                capture_output=True, text=True, check=True
+            ).stdout
+            samples.append(json.loads(output.strip().splitlines()[-1]))
+        results[mode] = {
+            "import_s": statistics.median(x["import_s"] for x in samples),
+            "first_call_s": statistics.median(x["first_call_s"] for x in samples),
+            "skfuzzy_on_import": any(x["skfuzzy_on_import"] for x in samples),
+        }
+    return results
+
+def reference_grid(points=REFERENCE_POINTS_PER_AXIS):
+    """Titik grid referensi (list array per input, sudah di-flatten)"""
+    axes = [np.linspace(low, high, points + 2)[1:-1] for low, high in fuzzy_logic.INPUT_RANGES]
+    return [x.ravel() for x in np.meshgrid(*axes, indexing="ij")]
+
+def boundary_grid(points=BOUNDARY_POINTS_PER_AXIS):
+    """Titik di setiap sisi range (satu input di low/high, input lain interior)"""
+    interior = [np.linspace(low, high, points + 2)[1:-1] for low, high in fuzzy_logic.INPUT_RANGES]
+    faces = []
+    for axis, edges in enumerate(fuzzy_logic.INPUT_RANGES):
+        for edge in edges:
+            axes = list(interior)
+            axes[axis] = np.array([float(edge)])
+            faces.append([x.ravel() for x in np.meshgrid(*axes, indexing="ij")])
+    return [np.concatenate(columns) for columns in zip(*faces)]
+
+def evaluate(mode, inputs):
+    """Skor engine (jalur skalar) untuk setiap titik"""
+    engine = fuzzy_logic.get_engine(mode)
+    return np.array([engine(*case) for case in zip(*(np.asarray(x).tolist() for x in inputs))])
+
+def freeze_reference(path=REFERENCE_PATH):
+    """Menghitung grid referensi dengan skfuzzy (engine mamdani) lalu menyimpannya"""
+    grid = reference_grid()
+    boundary = boundary_grid()
+    reference = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "rules": fuzzy_logic.active_rulebase().source_hash,
+        "points_per_axis": REFERENCE_POINTS_PER_AXIS,
+        "inputs": [x.tolist() for x in grid],
+        "stress": evaluate("mamdani", grid).tolist(),
+        "boundary": {
+            "points_per_axis": BOUNDARY_POINTS_PER_AXIS,
+            "inputs": [x.tolist() for x in boundary],
+            "stress": evaluate("mamdani", boundary).tolist(),
+        },
+    }
+    with open(path, "w") as f:
+        json.dump(reference, f)
+    return reference
+
+def load_reference(path=REFERENCE_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+def check_accuracy(reference, modes=ENGINE_MODES, thresholds=ACCURACY_THRESHOLDS):
+    """
+    Error setiap engine terhadap grid skfuzzy + status PASS/FAIL per threshold.
+    reference: {"inputs", "stress"} (grid utama atau bagian grid batas)
+    """
+    expected = np.asarray(reference["stress"])
+    expected_codes = np.digitize(expected, fuzzy_logic.CATEGORY_THRESHOLDS)
+
+    results = {}
+    for mode in modes:
+        points = slice(None)
+        if mode == "mamdani":
+            points = slice(None, None, max(1, expected.size // SLOW_ENGINE_REFERENCE_POINTS))
+
+        values = evaluate(mode, [np.asarray(x)[points] for x in reference["inputs"]])
+        diff = np.abs(values - expected[points])
+        # Flip hanya jika tidak ada nilai dalam +-CATEGORY_EPSILON yang masuk kategori referensi
+        low = np.digitize(values - CATEGORY_EPSILON, fuzzy_logic.CATEGORY_THRESHOLDS)
+        high = np.digitize(values + CATEGORY_EPSILON, fuzzy_logic.CATEGORY_THRESHOLDS)
+        codes = expected_codes[points]
+        flip_rate = float(np.mean((codes < low) | (codes > high)))
+        max_error, max_flip = thresholds[mode]
+        results[mode] = {
+            "points": int(diff.size),
+            "max_error": float(diff.max()),
+            "mean_error": float(diff.mean()),
+            "category_flip_rate": flip_rate,
+            "threshold_max_error": max_error,
+            "threshold_flip_rate": max_flip,
+            "passed": bool(diff.max() <= max_error and flip_rate <= max_flip),
+        }
+    return results
+
+def split_humidity_edge(reference):
+    """Grid batas -> (titik lain, titik di humidity maksimum)"""
+    axis = fuzzy_logic.INPUT_LABELS.index("humidity")
+    edge = np.asarray(reference["inputs"][axis]) == fuzzy_logic.INPUT_RANGES[axis][1]
+    return tuple(
+        {"inputs": [np.asarray(x)[mask] for x in reference["inputs"]],
+         "stress": np.asarray(reference["stress"])[mask]}
+        for mask in (~edge, edge)
+    )
+
+def git_commit():
+    """Hash commit saat ini (None jika bukan repo git)"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_latency(results, label="Engine"):
+    """Tabel latency + speedup terhadap baseline"""
+    baseline = results.get(BASELINE_MODE)
+
+    print(f"\n{label:<12}{'Calls':>7}{'Mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'Speedup':>10}   (us)")
+    print("-" * 72)
+    for mode, stats in results.items():
+        speedup = f"{baseline['p50_us'] / stats['p50_us']:.1f}x" if baseline else "-"
+        print(f"{mode:<12}{stats['calls']:>7}{stats['mean_us']:>10.1f}{stats['p50_us']:>10.1f}"
+              f"{stats['p90_us']:>10.1f}{stats['p99_us']:>10.1f}{speedup:>10}")
+
+def print_batch(results):
+    """Tabel throughput batch"""
+    print(f"\n{'Engine':<12}{'Rows':>10}{'Detik':>10}{'Baris/detik':>16}")
+    print("-" * 48)
+    for mode, stats in results.items():
+        print(f"{mode:<12}{stats['rows']:>10}{stats['seconds']:>10.3f}{stats['rows_per_s']:>16,.0f}")
+
+def print_startup(results):
+    """Tabel waktu cold start"""
+    print(f"\n{'Engine':<12}{'Import (s)':>14}{'1st call (s)':>16}{'Total (s)':>14}{'skfuzzy':>10}")
+    print("-" * 66)
+    for mode, stats in results.items():
+        total = stats["import_s"] + stats["first_call_s"]
+        loaded = "ya" if stats["skfuzzy_on_import"] else "tidak"
+        print(f"{mode:<12}{stats['import_s']:>14.3f}{stats['first_call_s']:>16.3f}{total:>14.3f}{loaded:>10}")
+
+def print_accuracy(results):
+    """Tabel error vs grid referensi + status threshold"""
+    print(f"\n{'Engine':<12}{'Max err':>10}{'Mean err':>10}{'Flip rate':>11}{'Batas':>16}   Status")
+    print("-" * 70)
+    for mode, stats in results.items():
+        limit = f"{stats['threshold_max_error']:g} / {stats['threshold_flip_rate']:.0%}"
+        status = "✅ PASS" if stats["passed"] else "❌ FAIL"
+        print(f"{mode:<12}{stats['max_error']:>10.4f}{stats['mean_error']:>10.4f}"
+              f"{stats['category_flip_rate']:>11.2%}{limit:>16}   {status}")
+
+def print_comparison(current, previous):
+    """Rasio p50/p99 latency dan perubahan error maksimum terhadap hasil sebelumnya"""
+    print(f"\nDibandingkan dengan commit {previous.get('commit')} ({previous.get('timestamp')}):")
+    print(f"{'Engine':<12}{'p50':>10}{'p99':>10}{'Max err (lama -> baru)':>28}")
+    print("-" * 60)
+    for mode, stats in current["latency"].items():
+        old = previous.get("latency", {}).get(mode)
+        if not old:
+            continue
+        old_acc = previous.get("accuracy", {}).get(mode)
+        new_acc = current["accuracy"].get(mode)
+        err = f"{old_acc['max_error']:.4f} -> {new_acc['max_error']:.4f}" if old_acc and new_acc else "-"
+        print(f"{mode:<12}{stats['p50_us'] / old['p50_us']:>9.2f}x{stats['p99_us'] / old['p99_us']:>9.2f}x{err:>28}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark + accuracy regression engine fuzzy")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--compare", help="file JSON hasil benchmark sebelumnya")
+    parser.add_argument("--freeze", action="store_true", help="bangun ulang grid referensi skfuzzy")
+    args = parser.parse_args()
+
+    if args.freeze:
+        print_header("🧊 MEMBEKUKAN GRID REFERENSI SKFUZZY")
+        reference = freeze_reference()
+        print(f"{len(reference['stress'])} titik + {len(reference['boundary']['stress'])} titik batas "
+              f"tersimpan di {REFERENCE_PATH}")
+        return
+
+    print_header("🚀 LATENCY PER PANGGILAN")
+    latency = benchmark_engines()
+    print_latency(latency)
+
+    print_header(f"📦 calculate_stress PER LEVEL DETAIL (engine {fuzzy_logic.ENGINE_MODE})")
+    details = benchmark_details()
+    print_latency(details, label="Detail")
+
+    print_header("📊 THROUGHPUT BATCH")
+    batch = benchmark_batch()
+    print_batch(batch)
+
+    print_header("🧊 COLD START (proses baru)")
+    startup = benchmark_startup()
+    print_startup(startup)
+
+    print_header("🎯 AKURASI VS GRID REFERENSI SKFUZZY")
+    reference = load_reference()
+    if reference["rules"] != fuzzy_logic.active_rulebase().source_hash:
+        print("⚠️  Rule base berubah sejak grid referensi dibuat, jalankan --freeze")
+    accuracy = check_accuracy(reference)
+    print_accuracy(accuracy)
+
+    print_header("🧱 AKURASI DI BATAS RANGE")
+    boundary, humidity_edge = {}, {}
+    if "boundary" in reference:
+        edges, humid_max = split_humidity_edge(reference["boundary"])
+        boundary = check_accuracy(edges)
+        print_accuracy(boundary)
+
+        print_header("💧 AKURASI DI HUMIDITY MAKSIMUM")
+        humidity_edge = check_accuracy(humid_max, thresholds=HUMIDITY_EDGE_THRESHOLDS)
+        print_accuracy(humidity_edge)
+    else:
+        print("⚠️  Grid referensi belum punya titik batas, jalankan --freeze")
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "rules": fuzzy_logic.active_rulebase().source_hash,
+        "latency": latency,
+        "details": details,
+        "batch": batch,
+        "startup": startup,
+        "accuracy": accuracy,
+        "boundary_accuracy": boundary,
+        "humidity_edge_accuracy": humidity_edge,
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=1)
+    print(f"\nHasil tersimpan di {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(results, json.load(f))
+
+    if not all(stats["passed"] for stats in (*accuracy.values(), *boundary.values(), *humidity_edge.values())):
+        print("\n⚠️  ADA ENGINE DI LUAR BATAS AKURASI!")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+benchmark_wire.py
+Benchmark format body ingest (server/wire.py): ukuran di jaringan dan waktu
+decode per format, memakai payload seperti test_connection.TEST_ANDROID_DATA
+yang diperbesar menjadi ratusan aplikasi.
+
+Format yang paketnya tidak terpasang (msgpack, cbor2, orjson) dilewati.
+
+Usage:
+    python benchmark_wire.py
+    python benchmark_wire.py --apps 100 500 --repeats 200
+"""
+
+import argparse
+import gzip
+import json
+import random
+import time
+
+from server import wire
+
+# Jumlah aplikasi per payload yang diuji
+APP_COUNTS = [4, 100, 300, 1000]
+REPEATS = 200
+
+APP_NAMES = [
+    "com.instagram.android", "com.whatsapp", "com.google.android.youtube",
+    "com.ss.android.ugc.trill", "com.mobile.legends", "com.twitter.android",
+]
+
+
+def make_payload(apps, seed=0):
+    """Payload upload HP (format TEST_ANDROID_DATA) dengan `apps` aplikasi."""
+    rng = random.Random(seed)
+    usage = [
+        {
+            "app_name": f"{APP_NAMES[i % len(APP_NAMES)]}.{i}" if i >= len(APP_NAMES) else APP_NAMES[i],
+            "foreground_time_s": rng.randint(1, 7200)
+        }
+        for i in range(apps)
+    ]
+    return {
+        "device_id": "test_phone_12345",
+        "total_screen_time_s": sum(app["foreground_time_s"] for app in usage),
+        "usage_data": usage,
+    }
+
+
+def columnar(payload):
+    """usage_data dalam bentuk kolom (key tidak diulang per aplikasi)."""
+    usage = payload["usage_data"]
+    return dict(payload, usage_data={
+        "app_name": [app["app_name"] for app in usage],
+        "foreground_time_s": [app["foreground_time_s"] for app in usage],
+    })
+
+
+def encoders():
+    """(nama format, fungsi payload -> bytes, Content-Type, Content-Encoding)"""
+    formats = [
+        ("json", lambda p: json.dumps(p).encode(), "application/json", None),
+        ("json+gzip", lambda p: gzip.compress(json.dumps(p).encode()), "application/json", "gzip"),
+        ("json-kolom+gzip", lambda p: gzip.compress(json.dumps(columnar(p)).encode()), "application/json", "gzip"),
+    ]
+    if wire.msgpack:
+        formats += [
+            ("msgpack", wire.msgpack.packb, "application/msgpack", None),
+            ("msgpack+gzip", lambda p: gzip.compress(wire.msgpack.packb(p)), "application/msgpack", "gzip"),
+            ("msgpack-kolom", lambda p: wire.msgpack.packb(columnar(p)), "application/msgpack", None),
+        ]
+    if wire.cbor2:
+        formats += [
+            ("cbor", wire.cbor2.dumps, "application/cbor", None),
+            ("cbor+gzip", lambda p: gzip.compress(wire.cbor2.dumps(p)), "application/cbor", "gzip"),
+        ]
+    return formats
+
+
+def print_header(text):
+    """Print header dengan border"""
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70)
+
+
+def print_info(text):
+    """Print info message"""
+    print(f"ℹ️  {text}")
+
+
+def time_decode(body, content_type, encoding, repeats):
+    """Rata-rata waktu decode_body (µs), termasuk dekompresi."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        wire.decode_body(body, content_type, encoding)
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def time_stdlib_json(body, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        json.loads(body)
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def benchmark(apps, repeats):
+    payload = make_payload(apps)
+    baseline = json.dumps(payload).encode()
+
+    print_header(f"PAYLOAD {apps} APLIKASI")
+    print(f"{'format':<18}{'bytes':>10}{'vs json':>9}{'decode µs':>12}")
+    print(f"{'json (stdlib)':<18}{len(baseline):>10,}{1:>8.2f}x{time_stdlib_json(baseline, repeats):>12.1f}")
+
+    for name, encode, content_type, encoding in encoders():
+        body = encode(payload)
+        decoded = wire.decode_body(body, content_type, encoding)
+        if name.split("+")[0].endswith("kolom"):
+            decoded = dict(decoded, usage_data=wire.expand_usage(decoded["usage_data"]))
+        if decoded != payload:
+            print(f"{name:<18} ❌ hasil decode berbeda dengan payload")
+            continue
+
+        label = name if name != "json" else f"json ({'orjson' if wire.orjson else 'stdlib'})"
+        print(f"{label:<18}{len(body):>10,}{len(body) / len(baseline):>8.2f}x"
+              f"{time_decode(body, content_type, encoding, repeats):>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark wire format ingest")
+    parser.add_argument("--apps", type=int, nargs="+", default=APP_COUNTS)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    args = parser.parse_args()
+
+    print_header("📦 BENCHMARK WIRE FORMAT INGEST")
+    print_info(f"Format tersedia: {', '.join(wire.available_formats())}")
+    for name, module in (("orjson", wire.orjson), ("msgpack", wire.msgpack), ("cbor2", wire.cbor2)):
+        if module is None:
+            print_info(f"{name} tidak terpasang, format terkait dilewati")
+
+    for apps in args.apps:
+        benchmark(apps, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
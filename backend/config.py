@@ -1,6 +1,12 @@
 # config.py
 # Konfigurasi untuk Stress Detection System
 
+import os
+
+# Folder backend/ (path engine fuzzy di bawah di-resolve dari sini agar
+# logic.fuzzy_logic bisa diimpor dari working directory mana pun)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # ============================================
 # NETWORK CONFIGURATION
 # ============================================
@@ -28,6 +34,43 @@ ANDROID_SERVER_URL = "http://192.168.1.11:5000"  # ⚠️ UBAH INI!
 # ============================================
 DATA_FOLDER = "data"
 
+# Backend penyimpanan (storage/):
+# "csv"    : dataset_{device_id}.csv + detail_{device_id}.csv (format lama)
+# "sqlite" : SQLITE_FILENAME di DATA_FOLDER (mode WAL, index per device+waktu)
+#            data CSV lama bisa diimpor: python -m storage.import_csv
+STORAGE_BACKEND = "csv"
+SQLITE_FILENAME = "stress.db"
+
+# Salinan ringkasan per upload sebagai record biner per device (memmap),
+# untuk membaca riwayat tanpa parsing CSV (storage/timeseries.py).
+# Konversi CSV lama: python -m storage.timeseries
+TIMESERIES_ENABLED = True
+TIMESERIES_FOLDER = "data/series"
+
+# Rollup per jam/hari per device (storage/rollups.py, /api/rollups/<device_id>)
+# Bangun ulang dari CSV lama: python -m storage.rollups
+ROLLUP_ENABLED = True
+ROLLUP_FOLDER = "data/rollups"
+ROLLUP_SAVE_INTERVAL = 5.0     # detik antar penyimpanan rollup yang berubah
+ROLLUP_MAX_HOUR_BUCKETS = 24 * 90   # bucket jam terbaru per device (bucket hari tidak dibatasi)
+# Device rollup idle dilepas dari memori memakai DEVICE_TTL / DEVICE_MAX
+
+# /api/history/<device_id> (dibaca dari TIMESERIES_FOLDER, di-downsample server)
+HISTORY_POINTS = 300           # default jumlah titik per series
+HISTORY_MAX_POINTS = 5000
+
+# Detail app usage terkompresi kamus (storage/app_usage.py):
+# nama aplikasi -> app_id, record (upload_id, app_id, seconds) per device.
+# Konversi detail_*.csv lama: python -m storage.app_usage
+APP_USAGE_STORE_ENABLED = True
+APP_USAGE_FOLDER = "data/app_usage"
+
+# Penulisan di thread background (storage/writer.py)
+WRITER_QUEUE_SIZE = 10000      # maks item antrean sebelum request menunggu
+WRITER_FLUSH_ROWS = 500        # flush jika baris tertunda mencapai jumlah ini
+WRITER_FLUSH_INTERVAL = 1.0    # detik, flush baris tertua paling lambat
+CSV_MAX_OPEN_FILES = 64        # file handle CSV yang dibiarkan terbuka (LRU)
+
 # ============================================
 # FUZZY LOGIC PARAMETERS
 # ============================================
@@ -43,6 +86,7 @@ STRESS_RANGE = (0, 100)          # stress score
 
 # Membership Function Parameters
 # Format: (low_end, low_peak, high_peak, high_end)
+# Dipakai langsung oleh engine fuzzy (logic/compiled.py); nama term dipakai di RULES_PATH
 MF_SCREEN_TIME = {
     'low': (0, 0, 2, 4),
     'medium': (3, 5, 7, 9),
@@ -75,6 +119,85 @@ MF_STRESS = {
     'very_high': (75, 85, 100, 100)
 }
 
+# ============================================
+# FUZZY ENGINE
+# ============================================
+
+# Mode engine untuk calculate_stress:
+#   "mamdani"  -> inferensi skfuzzy (referensi)
+#   "analytic" -> tabel aturan + centroid closed-form (tanpa sampling universe)
+#   "sparse"   -> seperti "analytic", hanya aturan yang aktif (maks 16 dari 81)
+#   "surface" -> lookup grid 4-D yang sudah dihitung + interpolasi multilinear
+#   "sugeno"  -> surrogate Sugeno orde-0 yang di-fit ke Mamdani (tanpa centroid)
+#   "kernel"  -> fungsi Python hasil generate dari rule base (hasil = "analytic")
+FUZZY_ENGINE = "mamdani"
+
+# Rule base = parameter MF di atas + tabel aturan (CSV/JSON, lihat logic/compiled.py).
+# Hasil compile di-cache per hash konten, jadi worker lain tidak compile ulang.
+RULES_PATH = os.path.join(BASE_DIR, "logic", "rules.csv")
+ENGINE_CACHE_FOLDER = os.path.join(BASE_DIR, "data", "engine_cache")
+RULES_RELOAD_INTERVAL = 5      # detik antar cek perubahan rule base (None = tanpa hot reload)
+
+# Jumlah titik grid per input untuk mode "surface" (total = resolusi^4)
+SURFACE_RESOLUTION = 25
+SURFACE_PATH = "data/stress_surface.npy"
+
+# Model Sugeno: konstanta per aturan hasil fit least squares
+SUGENO_PATH = "data/sugeno_model.json"
+SUGENO_SAMPLES = 200000        # titik acak untuk fit
+
+# Presisi calculate_stress_batch (lihat fuzzy_logic.PRECISION_MODES):
+# "exact" (float64, centroid closed-form), "float32", "coarse", "draft"
+BATCH_PRECISION = "exact"
+PRECISION_REPORT_PATH = "data/precision_report.json"
+PRECISION_SAMPLES = 200000     # titik acak untuk laporan error
+
+# Cache LRU hasil calculate_stress (0 = nonaktif)
+STRESS_CACHE_SIZE = 4096
+STRESS_CACHE_TTL = None        # detik, None = tanpa kedaluwarsa
+STRESS_CACHE_DECIMALS = 2      # pembulatan input sebelum jadi key cache
+
+# Registry device HP (server/registry.py): device yang tidak upload selama
+# DEVICE_TTL detik dibuang; jika lebih dari DEVICE_MAX device, yang paling
+# lama tidak aktif dibuang lebih dulu. None = tanpa batas.
+DEVICE_TTL = 24 * 60 * 60
+DEVICE_MAX = 10000
+
+# Body request ingest (server/wire.py): JSON / MessagePack / CBOR, boleh
+# Content-Encoding: gzip. MAX_REQUEST_SIZE membatasi body terkompresi,
+# MAX_DECOMPRESSED_SIZE membatasi hasil dekompresi.
+MAX_REQUEST_SIZE = 4 * 1024 * 1024
+MAX_DECOMPRESSED_SIZE = 16 * 1024 * 1024
+
+# Ingest /receive_usage: "sync" (skor dihitung sebelum membalas) atau
+# "async" (divalidasi, masuk antrean, dibalas 202 + ingest_id; hasil di
+# /api/ingest/<ingest_id>). Per request bisa dipaksa async dengan ?async=1.
+INGEST_MODE = "sync"
+INGEST_WORKERS = 2
+INGEST_MAX_DEPTH = 1000        # total antrean; penuh -> 429 + Retry-After
+INGEST_MAX_RESULTS = 10000     # status ingest yang disimpan (LRU)
+INGEST_RETRY_AFTER = 5         # detik, header Retry-After saat antrean penuh
+
+# Push dashboard lewat Server-Sent Events (/api/stream, server/events.py)
+SSE_KEEPALIVE = 15.0           # detik tanpa perubahan sebelum kirim keepalive
+SSE_COALESCE = 0.25            # detik menunggu agar burst update jadi satu event
+SSE_MAX_CLIENTS = 100          # viewer SSE + long-poll maksimum, sisanya 503
+SSE_RETRY_AFTER = 5            # detik, header Retry-After saat viewer penuh
+LONGPOLL_TIMEOUT = 25.0        # detik maks /api/dashboard_data?since=<versi> menunggu perubahan
+
+# Rescoring saat data sensor ruangan berubah (/receive_sensor):
+# device yang upload dalam RESCORE_ACTIVE_WINDOW detik terakhir dihitung
+# ulang dengan calculate_stress_batch, kecuali perubahan setiap input
+# ruangan sejak skor terakhir tidak melebihi RESCORE_THRESHOLDS.
+RESCORE_ENABLED = True
+RESCORE_ACTIVE_WINDOW = 30 * 60
+RESCORE_MAX_DEVICES = 500      # maks device per update sensor (yang paling baru upload)
+RESCORE_THRESHOLDS = {
+    "temperature": 0.2,
+    "humidity": 1.0,
+    "air_quality": 0.02,
+}
+
 # ============================================
 # SIMULATION SETTINGS
 # ============================================
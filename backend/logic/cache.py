@@ -0,0 +1,73 @@
+"""
+Cache hasil inferensi untuk calculate_stress.
+
+Input dibulatkan (quantized) ke sejumlah desimal sebelum dipakai sebagai key,
+sehingga pembacaan sensor yang hampir sama (mis. dibulatkan 0.1 / 0.01 oleh
+RealisticSensor) dan screen time yang tidak berubah antar upload langsung
+mendapat hasil dari cache tanpa inferensi ulang.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class StressCache:
+    """LRU cache thread-safe dengan TTL opsional dan counter hit/miss/eviction."""
+
+    def __init__(self, maxsize=4096, ttl=None, decimals=2):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.decimals = decimals
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def quantize(self, *values):
+        """Key cache: tuple input yang sudah dibulatkan."""
+        return tuple(round(float(v), self.decimals) for v in values)
+
+    def get(self, key):
+        """Nilai untuk key, atau None jika tidak ada / sudah kedaluwarsa."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                if self.ttl is None or time.monotonic() - stored_at < self.ttl:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "decimals": self.decimals,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
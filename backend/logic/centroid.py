@@ -0,0 +1,155 @@
+"""
+Closed-form Centroid Defuzzification
+====================================
+Output Mamdani = max dari trapesium-trapesium output yang dipotong (clip) pada
+tingkat aktivasinya. Fungsi hasil agregasi ini linear sepotong-sepotong, dan
+semua titik patahnya bisa dihitung langsung dari parameter trapesium:
+  - titik sudut trapesium (a, b, c, d),
+  - titik di mana sisi naik/turun sebuah trapesium mencapai tingkat aktivasi
+    (aktivasi miliknya sendiri maupun milik trapesium lain),
+  - perpotongan sisi miring dua trapesium.
+Di antara dua titik patah fungsi tersebut linear, sehingga luas dan momennya
+dihitung exact tanpa sampling universe (tidak ada error kuantisasi 0.1).
+
+Derajat keanggotaan input juga dihitung langsung dari parameter trapesium.
+Catatan: np.arange(30, 90.1, 0.1) berakhir di 90.00000000000085, sehingga
+trapmf skfuzzy memberi humidity['high'] ~0 tepat di humidity = 90 (batas
+clamping). Perhitungan di sini memberi 1.0 sesuai parameter (70, 80, 90, 90),
+jadi hasilnya berbeda dari skfuzzy untuk input humidity >= 90.
+"""
+
+import numpy as np
+
+
+def trapezoid(x, params):
+    """Derajat keanggotaan trapesium (a, b, c, d) di titik x (float)."""
+    a, b, c, d = params
+    if x < a or x > d:
+        return 0.0
+    if x < b:
+        return (x - a) / (b - a)
+    if x <= c:
+        return 1.0
+    return (d - x) / (d - c)
+
+
+def _edges(params):
+    """Sisi miring trapesium sebagai (x0, dx): x = x0 + level * dx."""
+    a, b, c, d = params
+    edges = []
+    if b > a:
+        edges.append((a, b - a))
+    if d > c:
+        edges.append((d, c - d))
+    return edges
+
+
+def _line_crossings(first, second):
+    """Titik x di mana sisi miring dua trapesium berpotongan."""
+    points = []
+    for x1, dx1 in _edges(first):
+        for x2, dx2 in _edges(second):
+            # level = (x - x1) / dx1 = (x - x2) / dx2
+            if dx1 != dx2:
+                points.append((x2 * dx1 - x1 * dx2) / (dx1 - dx2))
+    return points
+
+
+def _integrate(xs, ys):
+    """Luas dan momen dari fungsi linear sepotong-sepotong (xs terurut)."""
+    area = 0.0
+    moment = 0.0
+    for x1, x2, y1, y2 in zip(xs, xs[1:], ys, ys[1:]):
+        dx = x2 - x1
+        area += 0.5 * dx * (y1 + y2)
+        moment += dx / 6.0 * (y1 * (2 * x1 + x2) + y2 * (x1 + 2 * x2))
+    return area, moment
+
+
+def centroid(trapezoids, activations):
+    """
+    Centroid exact dari max(min(aktivasi_k, trapesium_k)).
+    Hanya term dengan aktivasi > 0 yang diproses, jadi biayanya bergantung
+    pada jumlah consequent yang aktif, bukan ukuran universe.
+    Mengembalikan None jika tidak ada term yang aktif.
+    """
+    fired = [(params, h) for params, h in zip(trapezoids, activations) if h > 0]
+    if not fired:
+        return None
+
+    low = min(params[0] for params, _ in fired)
+    high = max(params[3] for params, _ in fired)
+    levels = [h for _, h in fired]
+
+    points = set()
+    for i, (params, _) in enumerate(fired):
+        points.update(params)
+        for x0, dx in _edges(params):
+            points.update(x0 + level * dx for level in levels)
+        for other, _ in fired[i + 1:]:
+            points.update(_line_crossings(params, other))
+
+    xs = sorted(x for x in points if low <= x <= high)
+    ys = [max(min(h, trapezoid(x, params)) for params, h in fired) for x in xs]
+
+    area, moment = _integrate(xs, ys)
+    if area <= 0:
+        return None
+    return moment / area
+
+
+def trapezoid_batch(x, params):
+    """Versi array dari trapezoid()."""
+    a, b, c, d = params
+    rising = (x - a) / (b - a) if b > a else np.ones_like(x)
+    falling = (d - x) / (d - c) if d > c else np.ones_like(x)
+    mf = np.clip(np.fmin(rising, falling), 0.0, 1.0)
+    return np.where((x < a) | (x > d), 0.0, mf)
+
+
+def breakpoints(trapezoids):
+    """
+    Titik patah agregasi yang tidak bergantung pada aktivasi: titik sudut
+    dan perpotongan sisi miring antar trapesium (terurut, di dalam support).
+    """
+    fixed = set()
+    for i, params in enumerate(trapezoids):
+        fixed.update(params)
+        for other in trapezoids[i + 1:]:
+            fixed.update(_line_crossings(params, other))
+
+    low = min(params[0] for params in trapezoids)
+    high = max(params[3] for params in trapezoids)
+    return sorted(x for x in fixed if low <= x <= high)
+
+
+def centroid_batch(trapezoids, activations, fallback=50.0):
+    """
+    Versi array dari centroid(); activations berbentuk (N, jumlah term).
+    Baris tanpa term aktif mendapat nilai fallback. Dihitung dengan dtype
+    activations (float32 tetap float32).
+    """
+    activations = np.asarray(activations)
+    if activations.dtype.kind != "f":
+        activations = activations.astype(float)
+    n = activations.shape[0]
+
+    columns = [np.full(n, x, dtype=activations.dtype) for x in breakpoints(trapezoids)]
+
+    # Titik di mana setiap sisi miring mencapai setiap tingkat aktivasi
+    for params in trapezoids:
+        for x0, dx in _edges(params):
+            columns.extend(x0 + activations[:, k] * dx for k in range(activations.shape[1]))
+
+    xs = np.sort(np.stack(columns, axis=1), axis=1)
+    ys = np.zeros_like(xs)
+    for k, params in enumerate(trapezoids):
+        np.fmax(ys, np.fmin(activations[:, k:k + 1], trapezoid_batch(xs, params)), out=ys)
+
+    dx = np.diff(xs, axis=1)
+    x1, x2 = xs[:, :-1], xs[:, 1:]
+    y1, y2 = ys[:, :-1], ys[:, 1:]
+    area = (0.5 * dx * (y1 + y2)).sum(axis=1)
+    moment = (dx / 6.0 * (y1 * (2 * x1 + x2) + y2 * (x1 + 2 * x2))).sum(axis=1)
+
+    return np.where(area > 0, moment / np.where(area > 0, area, 1.0), fallback)
@@ -0,0 +1,186 @@
+"""
+Compiled Fuzzy Engine
+=====================
+Rule base dibangun dari config.py (range input + parameter trapesium
+MF_SCREEN_TIME, MF_TEMPERATURE, MF_HUMIDITY, MF_AIR_QUALITY, MF_STRESS) dan
+file tabel aturan (config.RULES_PATH, CSV atau JSON). Hasilnya artefak JSON
+berisi semua yang dibutuhkan engine numerik: range input, parameter
+trapesium setiap term, dan tabel aturan dalam bentuk index.
+
+Artefak disimpan di config.ENGINE_CACHE_FOLDER dengan nama file = hash
+SHA-256 dari sumbernya (parameter config + isi file aturan). Worker lain
+atau restart berikutnya dengan sumber yang sama langsung memuat artefak
+tersebut tanpa compile ulang.
+
+Format tabel aturan (CSV):
+    screen,temperature,humidity,air_quality,stress
+    low,cold,low,good,low
+    ...
+Format JSON: list of object dengan key yang sama.
+Kombinasi yang tidak ada di tabel tidak punya aturan.
+
+Usage:
+    python -m logic.compiled                  # compile config.RULES_PATH
+    python -m logic.compiled rules_baru.csv   # compile + validasi file lain
+"""
+
+import csv
+import hashlib
+import json
+import os
+import sys
+
+import config
+
+FORMAT_VERSION = 2
+
+
+def config_spec():
+    """Range dan parameter trapesium dari config, urutan input = urutan kolom aturan."""
+    inputs = [
+        ("screen", config.SCREEN_TIME_RANGE, config.MF_SCREEN_TIME),
+        ("temperature", config.TEMPERATURE_RANGE, config.MF_TEMPERATURE),
+        ("humidity", config.HUMIDITY_RANGE, config.MF_HUMIDITY),
+        ("air_quality", config.AIR_QUALITY_RANGE, config.MF_AIR_QUALITY),
+    ]
+    output = ("stress", config.STRESS_RANGE, config.MF_STRESS)
+
+    def variable(label, value_range, terms):
+        return {
+            "label": label,
+            "range": list(value_range),
+            "terms": {term: list(params) for term, params in terms.items()},
+        }
+
+    return {
+        "inputs": [variable(*var) for var in inputs],
+        "output": variable(*output),
+    }
+
+
+def source_hash(rules_path=None, spec=None):
+    """Hash SHA-256 dari parameter config + isi file aturan."""
+    rules_path = rules_path or config.RULES_PATH
+    spec = spec or config_spec()
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps([FORMAT_VERSION, spec], sort_keys=True).encode())
+    with open(rules_path, "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def read_rules(rules_path):
+    """Baris tabel aturan sebagai list of dict {kolom: label term}."""
+    with open(rules_path, newline="") as f:
+        if rules_path.endswith(".json"):
+            return json.load(f)
+        return list(csv.DictReader(f))
+
+
+def _check_trapezoid(label, term, params, value_range):
+    if len(params) != 4 or list(params) != sorted(params):
+        raise ValueError(f"MF {label}.{term} harus (a, b, c, d) dengan a <= b <= c <= d, dapat {params}")
+    if params[3] < value_range[0] or params[0] > value_range[1]:
+        raise ValueError(f"MF {label}.{term} {params} di luar range {value_range}")
+
+
+def compile_engine(rules_path=None):
+    """Menyusun dict engine dari config + tabel aturan (ValueError jika tidak valid)."""
+    rules_path = rules_path or config.RULES_PATH
+    spec = config_spec()
+
+    variables = spec["inputs"] + [spec["output"]]
+    for var in variables:
+        for term, params in var["terms"].items():
+            _check_trapezoid(var["label"], term, params, var["range"])
+
+    # Setiap aturan -> [index term screen, temp, humid, aq, index term output]
+    labels = [var["label"] for var in variables]
+    term_labels = [list(var["terms"]) for var in variables]
+    rules = []
+    seen = {}
+    for line, row in enumerate(read_rules(rules_path), 2):
+        missing = [label for label in labels if not row.get(label)]
+        if missing:
+            raise ValueError(f"{rules_path}:{line}: kolom {missing} kosong/tidak ada")
+
+        indices = []
+        for label, terms in zip(labels, term_labels):
+            term = row[label].strip()
+            if term not in terms:
+                raise ValueError(f"{rules_path}:{line}: term {label}={term!r} tidak ada (pilih dari {terms})")
+            indices.append(terms.index(term))
+
+        antecedent = tuple(indices[:-1])
+        if antecedent in seen:
+            raise ValueError(f"{rules_path}:{line}: kombinasi input sama dengan baris {seen[antecedent]}")
+        seen[antecedent] = line
+        rules.append(indices)
+
+    if not rules:
+        raise ValueError(f"{rules_path}: tabel aturan kosong")
+
+    return {
+        "format_version": FORMAT_VERSION,
+        "source_hash": source_hash(rules_path, spec),
+        "rules_path": rules_path,
+        **spec,
+        "rules": rules,
+    }
+
+
+def artifact_path(digest, folder=None):
+    return os.path.join(folder or config.ENGINE_CACHE_FOLDER, f"engine_{digest[:16]}.json")
+
+
+def save_engine(engine, path):
+    """Menulis artefak secara atomic (file sementara lalu rename)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(engine, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def load_engine(path, digest):
+    """Artefak dari file, atau None jika tidak ada / versi atau hash berbeda."""
+    try:
+        with open(path) as f:
+            engine = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if engine.get("format_version") != FORMAT_VERSION or engine.get("source_hash") != digest:
+        return None
+    return engine
+
+
+def load_or_compile(rules_path=None, folder=None):
+    """
+    Artefak untuk sumber saat ini: dimuat dari cache jika hash-nya sudah
+    pernah di-compile, jika tidak compile lalu simpan ke cache.
+    """
+    digest = source_hash(rules_path)
+    path = artifact_path(digest, folder)
+
+    engine = load_engine(path, digest)
+    if engine is not None:
+        return engine
+
+    engine = compile_engine(rules_path)
+    try:
+        save_engine(engine, path)
+    except OSError as e:
+        print(f"[FUZZY] Gagal menyimpan artefak engine ke {path}: {e}")
+    return engine
+
+
+if __name__ == "__main__":
+    rules_path = sys.argv[1] if len(sys.argv) > 1 else config.RULES_PATH
+    engine = compile_engine(rules_path)
+    path = artifact_path(engine["source_hash"])
+    save_engine(engine, path)
+    print(f"Artefak engine tersimpan di {path}")
+    print(f"  format_version={engine['format_version']}  source_hash={engine['source_hash'][:12]}")
+    print(f"  {len(engine['inputs'])} input, {len(engine['rules'])} aturan dari {rules_path}")
@@ -1,219 +1,565 @@
+import os
+import sys
+import threading
+import time
+
 import numpy as np
-import skfuzzy as fuzz
-from skfuzzy import control as ctrl
-
-# 1. Definisi Universe (Semesta Pembicaraan)
-screen_universe = np.arange(0, 24.1, 0.1) 
-temp_universe = np.arange(15, 35.1, 0.1) 
-humid_universe = np.arange(30, 90.1, 0.1) 
-aq_universe = np.arange(0, 5.1, 0.1)    
-stress_universe = np.arange(0, 100.1, 0.1)
-
-# 2. Antecedents (Input) dan Consequent (Output)
-screen = ctrl.Antecedent(screen_universe, "screen") 
-temp = ctrl.Antecedent(temp_universe, "temperature")
-humid = ctrl.Antecedent(humid_universe, "humidity")
-airq = ctrl.Antecedent(aq_universe, "air_quality")
-stress = ctrl.Consequent(stress_universe, "stress", defuzzify_method='centroid')
-
-# 3. Membership Functions (Trapmf - Berdasarkan parameter teman Anda)
-screen['low'] = fuzz.trapmf(screen_universe, [0, 0, 2, 4])
-screen['medium'] = fuzz.trapmf(screen_universe, [3, 5, 7, 9])
-screen['high'] = fuzz.trapmf(screen_universe, [8, 12, 24, 24])
-
-temp['cold'] = fuzz.trapmf(temp_universe, [15, 15, 18, 22])
-temp['normal'] = fuzz.trapmf(temp_universe, [20, 24, 26, 28])
-temp['hot'] = fuzz.trapmf(temp_universe, [26, 30, 35, 35])
-
-humid['low'] = fuzz.trapmf(humid_universe, [30, 30, 40, 50])
-humid['medium'] = fuzz.trapmf(humid_universe, [45, 55, 65, 75])
-humid['high'] = fuzz.trapmf(humid_universe, [70, 80, 90, 90])
-
-airq['good'] = fuzz.trapmf(aq_universe, [0, 0, 0.5, 1.5])
-airq['moderate'] = fuzz.trapmf(aq_universe, [1.0, 2.0, 3.0, 3.5])
-airq['poor'] = fuzz.trapmf(aq_universe, [3.0, 4.0, 5.0, 5.0])
-
-stress['very_low'] = fuzz.trapmf(stress_universe, [0, 0, 10, 25])
-stress['low'] = fuzz.trapmf(stress_universe, [15, 25, 35, 45])
-stress['medium'] = fuzz.trapmf(stress_universe, [35, 45, 55, 65])
-stress['high'] = fuzz.trapmf(stress_universe, [55, 65, 75, 85])
-stress['very_high'] = fuzz.trapmf(stress_universe, [75, 85, 100, 100])
-
-# 
-
-# 4. Definisi 81 Aturan Secara Eksplisit (ctrl.Rule)
-rules = [
-    # === SCREEN LOW ===
-    ctrl.Rule(screen['low'] & temp['cold'] & humid['low'] & airq['good'], stress['low']),
-    ctrl.Rule(screen['low'] & temp['cold'] & humid['low'] & airq['moderate'], stress['low']),
-    ctrl.Rule(screen['low'] & temp['cold'] & humid['low'] & airq['poor'], stress['medium']),
-    ctrl.Rule(screen['low'] & temp['cold'] & humid['medium'] & airq['good'], stress['very_low']),
-    ctrl.Rule(screen['low'] & temp['cold'] & humid['medium'] & airq['moderate'], stress['low']),
-    ctrl.Rule(screen['low'] & temp['cold'] & humid['medium'] & airq['poor'], stress['low']),
-    ctrl.Rule(screen['low'] & temp['cold'] & humid['high'] & airq['good'], stress['low']),
-    ctrl.Rule(screen['low'] & temp['cold'] & humid['high'] & airq['moderate'], stress['low']),
-    ctrl.Rule(screen['low'] & temp['cold'] & humid['high'] & airq['poor'], stress['medium']),
-    ctrl.Rule(screen['low'] & temp['normal'] & humid['low'] & airq['good'], stress['very_low']),
-    ctrl.Rule(screen['low'] & temp['normal'] & humid['low'] & airq['moderate'], stress['very_low']),
-    ctrl.Rule(screen['low'] & temp['normal'] & humid['low'] & airq['poor'], stress['low']),
-    ctrl.Rule(screen['low'] & temp['normal'] & humid['medium'] & airq['good'], stress['very_low']),
-    ctrl.Rule(screen['low'] & temp['normal'] & humid['medium'] & airq['moderate'], stress['very_low']),
-    ctrl.Rule(screen['low'] & temp['normal'] & humid['medium'] & airq['poor'], stress['low']),
-    ctrl.Rule(screen['low'] & temp['normal'] & humid['high'] & airq['good'], stress['very_low']),
-    ctrl.Rule(screen['low'] & temp['normal'] & humid['high'] & airq['moderate'], stress['low']),
-    ctrl.Rule(screen['low'] & temp['normal'] & humid['high'] & airq['poor'], stress['low']),
-    ctrl.Rule(screen['low'] & temp['hot'] & humid['low'] & airq['good'], stress['low']),
-    ctrl.Rule(screen['low'] & temp['hot'] & humid['low'] & airq['moderate'], stress['low']),
-    ctrl.Rule(screen['low'] & temp['hot'] & humid['low'] & airq['poor'], stress['medium']),
-    ctrl.Rule(screen['low'] & temp['hot'] & humid['medium'] & airq['good'], stress['low']),
-    ctrl.Rule(screen['low'] & temp['hot'] & humid['medium'] & airq['moderate'], stress['low']),
-    ctrl.Rule(screen['low'] & temp['hot'] & humid['medium'] & airq['poor'], stress['medium']),
-    ctrl.Rule(screen['low'] & temp['hot'] & humid['high'] & airq['good'], stress['low']),
-    ctrl.Rule(screen['low'] & temp['hot'] & humid['high'] & airq['moderate'], stress['medium']),
-    ctrl.Rule(screen['low'] & temp['hot'] & humid['high'] & airq['poor'], stress['medium']),
-
-    # === SCREEN MEDIUM ===
-    ctrl.Rule(screen['medium'] & temp['cold'] & humid['low'] & airq['good'], stress['low']),
-    ctrl.Rule(screen['medium'] & temp['cold'] & humid['low'] & airq['moderate'], stress['medium']),
-    ctrl.Rule(screen['medium'] & temp['cold'] & humid['low'] & airq['poor'], stress['medium']),
-    ctrl.Rule(screen['medium'] & temp['cold'] & humid['medium'] & airq['good'], stress['low']),
-    ctrl.Rule(screen['medium'] & temp['cold'] & humid['medium'] & airq['moderate'], stress['low']),
-    ctrl.Rule(screen['medium'] & temp['cold'] & humid['medium'] & airq['poor'], stress['medium']),
-    ctrl.Rule(screen['medium'] & temp['cold'] & humid['high'] & airq['good'], stress['medium']),
-    ctrl.Rule(screen['medium'] & temp['cold'] & humid['high'] & airq['moderate'], stress['medium']),
-    ctrl.Rule(screen['medium'] & temp['cold'] & humid['high'] & airq['poor'], stress['high']),
-    ctrl.Rule(screen['medium'] & temp['normal'] & humid['low'] & airq['good'], stress['low']),
-    ctrl.Rule(screen['medium'] & temp['normal'] & humid['low'] & airq['moderate'], stress['low']),
-    ctrl.Rule(screen['medium'] & temp['normal'] & humid['low'] & airq['poor'], stress['medium']),
-    ctrl.Rule(screen['medium'] & temp['normal'] & humid['medium'] & airq['good'], stress['low']),
-    ctrl.Rule(screen['medium'] & temp['normal'] & humid['medium'] & airq['moderate'], stress['medium']),
-    ctrl.Rule(screen['medium'] & temp['normal'] & humid['medium'] & airq['poor'], stress['medium']),
-    ctrl.Rule(screen['medium'] & temp['normal'] & humid['high'] & airq['good'], stress['medium']),
-    ctrl.Rule(screen['medium'] & temp['normal'] & humid['high'] & airq['moderate'], stress['medium']),
-    ctrl.Rule(screen['medium'] & temp['normal'] & humid['high'] & airq['poor'], stress['high']),
-    ctrl.Rule(screen['medium'] & temp['hot'] & humid['low'] & airq['good'], stress['medium']),
-    ctrl.Rule(screen['medium'] & temp['hot'] & humid['low'] & airq['moderate'], stress['medium']),
-    ctrl.Rule(screen['medium'] & temp['hot'] & humid['low'] & airq['poor'], stress['high']),
-    ctrl.Rule(screen['medium'] & temp['hot'] & humid['medium'] & airq['good'], stress['medium']),
-    ctrl.Rule(screen['medium'] & temp['hot'] & humid['medium'] & airq['moderate'], stress['medium']),
-    ctrl.Rule(screen['medium'] & temp['hot'] & humid['medium'] & airq['poor'], stress['high']),
-    ctrl.Rule(screen['medium'] & temp['hot'] & humid['high'] & airq['good'], stress['medium']),
-    ctrl.Rule(screen['medium'] & temp['hot'] & humid['high'] & airq['moderate'], stress['high']),
-    ctrl.Rule(screen['medium'] & temp['hot'] & humid['high'] & airq['poor'], stress['high']),
-
-    # === SCREEN HIGH ===
-    ctrl.Rule(screen['high'] & temp['cold'] & humid['low'] & airq['good'], stress['medium']),
-    ctrl.Rule(screen['high'] & temp['cold'] & humid['low'] & airq['moderate'], stress['high']),
-    ctrl.Rule(screen['high'] & temp['cold'] & humid['low'] & airq['poor'], stress['high']),
-    ctrl.Rule(screen['high'] & temp['cold'] & humid['medium'] & airq['good'], stress['medium']),
-    ctrl.Rule(screen['high'] & temp['cold'] & humid['medium'] & airq['moderate'], stress['high']),
-    ctrl.Rule(screen['high'] & temp['cold'] & humid['medium'] & airq['poor'], stress['high']),
-    ctrl.Rule(screen['high'] & temp['cold'] & humid['high'] & airq['good'], stress['high']),
-    ctrl.Rule(screen['high'] & temp['cold'] & humid['high'] & airq['moderate'], stress['high']),
-    ctrl.Rule(screen['high'] & temp['cold'] & humid['high'] & airq['poor'], stress['very_high']),
-    ctrl.Rule(screen['high'] & temp['normal'] & humid['low'] & airq['good'], stress['medium']),
-    ctrl.Rule(screen['high'] & temp['normal'] & humid['low'] & airq['moderate'], stress['high']),
-    ctrl.Rule(screen['high'] & temp['normal'] & humid['low'] & airq['poor'], stress['high']),
-    ctrl.Rule(screen['high'] & temp['normal'] & humid['medium'] & airq['good'], stress['high']),
-    ctrl.Rule(screen['high'] & temp['normal'] & humid['medium'] & airq['moderate'], stress['high']),
-    ctrl.Rule(screen['high'] & temp['normal'] & humid['medium'] & airq['poor'], stress['very_high']),
-    ctrl.Rule(screen['high'] & temp['normal'] & humid['high'] & airq['good'], stress['high']),
-    ctrl.Rule(screen['high'] & temp['normal'] & humid['high'] & airq['moderate'], stress['high']),
-    ctrl.Rule(screen['high'] & temp['normal'] & humid['high'] & airq['poor'], stress['very_high']),
-    ctrl.Rule(screen['high'] & temp['hot'] & humid['low'] & airq['good'], stress['high']),
-    ctrl.Rule(screen['high'] & temp['hot'] & humid['low'] & airq['moderate'], stress['high']),
-    ctrl.Rule(screen['high'] & temp['hot'] & humid['low'] & airq['poor'], stress['very_high']),
-    ctrl.Rule(screen['high'] & temp['hot'] & humid['medium'] & airq['good'], stress['high']),
-    ctrl.Rule(screen['high'] & temp['hot'] & humid['medium'] & airq['moderate'], stress['very_high']),
-    ctrl.Rule(screen['high'] & temp['hot'] & humid['medium'] & airq['poor'], stress['very_high']),
-    ctrl.Rule(screen['high'] & temp['hot'] & humid['high'] & airq['good'], stress['high']),
-    ctrl.Rule(screen['high'] & temp['hot'] & humid['high'] & airq['moderate'], stress['very_high']),
-    ctrl.Rule(screen['high'] & temp['hot'] & humid['high'] & airq['poor'], stress['very_high']),
+
+try:
+    from logic import cache as _cache_module
+    from logic import centroid as _centroid
+    from logic import compiled as _compiled
+except ImportError:  # dijalankan langsung: python logic/fuzzy_logic.py
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from logic import cache as _cache_module
+    from logic import centroid as _centroid
+    from logic import compiled as _compiled
+
+
+def _reference():
+    """Modul referensi skfuzzy (logic/mamdani.py), diimpor saat pertama dipakai."""
+    from logic import mamdani
+    return mamdani
+
+
+# 6. Kategori Output
+# Format: (batas atas skor, kategori, pesan). Index list = category code.
+CATEGORIES = [
+    (20, "Very Low Stress", "Kondisi sangat baik! Tetap jaga pola hidup sehat."),
+    (40, "Low Stress", "Kondisi baik. Pertahankan keseimbangan aktivitas digital."),
+    (60, "Medium Stress", "Perlu perhatian. Kurangi screen time dan perbaiki lingkungan."),
+    (80, "High Stress", "Kondisi tidak ideal. Segera istirahat dan perbaiki lingkungan sekitar."),
+    (None, "Very High Stress", "PERINGATAN! Segera kurangi penggunaan HP dan perbaiki kondisi ruangan!"),
 ]
+CATEGORY_LABELS = [label for _, label, _ in CATEGORIES]
+CATEGORY_THRESHOLDS = np.array([limit for limit, _, _ in CATEGORIES[:-1]], dtype=float)
+
+
+def categorize(value):
+    """Mengembalikan (category code, category, message) untuk skor stres."""
+    for code, (limit, category, message) in enumerate(CATEGORIES):
+        if limit is None or value < limit:
+            return code, category, message
+
+
+# 7. Rule Base
+class RuleBase:
+    """
+    Rule base terkompilasi (artefak logic/compiled.py) dalam bentuk siap
+    pakai: parameter trapesium per term + setiap aturan sebagai index term
+    per input dan index term output. Objek ini tidak pernah diubah; hot
+    reload membuat RuleBase baru lalu menukar referensinya.
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.source_hash = spec["source_hash"]
+        self.input_labels = [var["label"] for var in spec["inputs"]]
+        self.input_ranges = [tuple(var["range"]) for var in spec["inputs"]]
+        self.input_trapezoids = [list(var["terms"].values()) for var in spec["inputs"]]
+        self.mf_params = {var["label"]: var["terms"] for var in spec["inputs"] + [spec["output"]]}
+        self.stress_terms = list(spec["output"]["terms"])
+        self.stress_trapezoids = list(spec["output"]["terms"].values())
+
+        rule_array = np.array(spec["rules"], dtype=np.intp).reshape(-1, len(self.input_labels) + 1)
+        self.rule_antecedents = rule_array[:, :-1]
+        self.rule_consequents = rule_array[:, -1]
+
+        # Tabel aturan padat (3x3x3x3): rule_table[screen, temp, humid, aq] =
+        # index term output (-1 jika kombinasi tidak punya aturan).
+        self.rule_table = np.full([len(t) for t in self.input_trapezoids], -1, dtype=np.intp)
+        self.rule_table[tuple(self.rule_antecedents.T)] = self.rule_consequents
+
+        self._universes = {}
+        self._rule_list = list(zip(map(tuple, self.rule_antecedents.tolist()), self.rule_consequents.tolist()))
+        self._rule_table_list = self.rule_table.tolist()
+
+    def reference(self):
+        """ReferenceSystem skfuzzy untuk rule base ini (mengimpor skfuzzy)."""
+        return _reference().get_system(self.spec)
+
+    def output_universe(self, points, dtype):
+        """
+        Universe output adaptif untuk mode presisi: linspace(points) digabung
+        dengan titik patah term output, plus nilai semua term di universe
+        tersebut. Di-cache per (points, dtype).
+        """
+        key = (points, np.dtype(dtype).str)
+        if key not in self._universes:
+            low, high = self.spec["output"]["range"]
+            universe = np.union1d(np.linspace(low, high, points), _centroid.breakpoints(self.stress_trapezoids))
+            mfs = np.stack([_centroid.trapezoid_batch(universe, params) for params in self.stress_trapezoids])
+            self._universes[key] = (universe.astype(dtype), mfs.astype(dtype))
+        return self._universes[key]
+
+    def memberships(self, screentime, temperature, humidity, air_quality):
+        """Derajat keanggotaan setiap term per input, dihitung dari parameter trapesium."""
+        return [
+            [_centroid.trapezoid(x, params) for params in trapezoids]
+            for x, trapezoids in zip((screentime, temperature, humidity, air_quality), self.input_trapezoids)
+        ]
+
+    def explain(self, screentime, temperature, humidity, air_quality):
+        """
+        Detail inferensi untuk visualisasi: aturan yang aktif (kekuatan > 0)
+        dan aktivasi (max) setiap term output.
+        """
+        memberships = self.memberships(screentime, temperature, humidity, air_quality)
+        term_labels = [list(self.mf_params[label]) for label in self.input_labels]
+
+        fired = []
+        activations = [0.0] * len(self.stress_terms)
+        for number, (antecedent, out) in enumerate(self._rule_list, 1):
+            strength = min(m[t] for m, t in zip(memberships, antecedent))
+            if strength > 0:
+                fired.append({
+                    "rule": number,
+                    "if": {label: terms[t] for label, terms, t in zip(self.input_labels, term_labels, antecedent)},
+                    "then": self.stress_terms[out],
+                    "strength": strength,
+                })
+                activations[out] = max(activations[out], strength)
+
+        return fired, dict(zip(self.stress_terms, activations))
+
+    def infer_mamdani(self, screentime, temperature, humidity, air_quality):
+        """Inferensi exact memakai ControlSystemSimulation skfuzzy (logic/mamdani.py)."""
+        return self.reference().infer(screentime, temperature, humidity, air_quality)
+
+    def infer_analytic(self, screentime, temperature, humidity, air_quality):
+        """Inferensi min-max dari tabel aturan + centroid closed-form (float murni)."""
+        m_screen, m_temp, m_humid, m_aq = self.memberships(screentime, temperature, humidity, air_quality)
+
+        activations = [0.0] * len(self.stress_terms)
+        for (i, j, k, l), out in self._rule_list:
+            strength = min(m_screen[i], m_temp[j], m_humid[k], m_aq[l])
+            if strength > activations[out]:
+                activations[out] = strength
+
+        value = _centroid.centroid(self.stress_trapezoids, activations)
+        return 50.0 if value is None else value
+
+    def infer_sparse(self, screentime, temperature, humidity, air_quality):
+        """
+        Seperti infer_analytic, tetapi hanya mengevaluasi sel rule_table yang
+        semua inputnya punya keanggotaan > 0. Fungsi keanggotaan paling banyak
+        overlap berpasangan, jadi maksimal 2x2x2x2 = 16 aturan (bukan 81).
+        """
+        active = [
+            [(t, mu) for t, mu in enumerate(memberships) if mu > 0]
+            for memberships in self.memberships(screentime, temperature, humidity, air_quality)
+        ]
+
+        activations = [0.0] * len(self.stress_terms)
+        for i, m_screen in active[0]:
+            table_i = self._rule_table_list[i]
+            for j, m_temp in active[1]:
+                table_ij = table_i[j]
+                w_ij = min(m_screen, m_temp)
+                for k, m_humid in active[2]:
+                    table_ijk = table_ij[k]
+                    w_ijk = min(w_ij, m_humid)
+                    for l, m_aq in active[3]:
+                        out = table_ijk[l]
+                        strength = min(w_ijk, m_aq)
+                        if out >= 0 and strength > activations[out]:
+                            activations[out] = strength
+
+        value = _centroid.centroid(self.stress_trapezoids, activations)
+        return 50.0 if value is None else value
+
+
+# Batch diproses per potongan agar memori tetap kecil
+# (setiap baris membutuhkan array sepanjang stress_universe).
+BATCH_CHUNK_SIZE = 2048
+
+# Mode presisi calculate_stress_batch: (dtype, jumlah titik universe output).
+# None = centroid closed-form; selain itu centroid di-sampling pada universe
+# adaptif (linspace + titik patah term output), tanpa sorting per baris
+# sehingga jauh lebih cepat. Deviasi maksimum & ketidaksamaan kategori
+# terhadap "exact" diukur oleh `python -m logic.precision`.
+PRECISION_MODES = {
+    "exact": (np.float64, None),
+    "float32": (np.float32, None),
+    "coarse": (np.float32, 101),
+    "draft": (np.float32, 51),
+}
+
+# Selisih maksimum calculate_stress_batch(defuzzify="sampled") terhadap
+# engine "mamdani". Batch tidak menyisipkan titik potong (cut) ke
+# stress_universe seperti skfuzzy, sehingga centroid sedikit bergeser di
+# sekitar titik potong. defuzzify="analytic" identik dengan engine "analytic".
+BATCH_TOLERANCE = 0.05
+
+
+def _batch_memberships(values, i, defuzzify, rulebase):
+    """Derajat keanggotaan setiap term untuk array input, shape (N, jumlah term)."""
+    if defuzzify == "analytic":
+        mfs = [_centroid.trapezoid_batch(values, params) for params in rulebase.input_trapezoids[i]]
+    else:
+        var = rulebase.reference().inputs[i]
+        mfs = [np.interp(values, var.universe, term.mf) for term in var.terms.values()]
+    return np.stack(mfs, axis=1)
+
+
+def _batch_centroid(x, mfx):
+    """Centroid per baris dari fungsi keanggotaan linear sepotong-sepotong."""
+    dx = np.diff(x)
+    y1 = mfx[:, :-1]
+    y2 = mfx[:, 1:]
+    area = (0.5 * dx * (y1 + y2)).sum(axis=1)
+    moment = (dx / 6.0 * (y1 * (2 * x[:-1] + x[1:]) + y2 * (x[:-1] + 2 * x[1:]))).sum(axis=1)
+
+    # Fallback sama seperti calculate_stress jika tidak ada aturan aktif
+    return np.where(area > 0, moment / np.where(area > 0, area, 1.0), 50.0)
+
+
+def _batch_infer(inputs, defuzzify, rulebase, points=None):
+    """Inferensi Mamdani (min-max, centroid) untuk satu potongan batch."""
+    # Kekuatan aturan = AND (min) dari keanggotaan keempat input
+    strength = None
+    for i, values in enumerate(inputs):
+        mf = _batch_memberships(values, i, defuzzify, rulebase)[:, rulebase.rule_antecedents[:, i]]
+        strength = mf if strength is None else np.fmin(strength, mf)
+
+    # Akumulasi (max) aktivasi per term output
+    activations = np.stack([
+        strength[:, rulebase.rule_consequents == k].max(axis=1, initial=0.0)
+        for k in range(len(rulebase.stress_terms))
+    ], axis=1)
+
+    if defuzzify == "analytic" and points is None:
+        return _centroid.centroid_batch(rulebase.stress_trapezoids, activations)
+
+    # Potong (clip) setiap term output lalu gabungkan di universe output
+    if defuzzify == "analytic":
+        universe, mfs = rulebase.output_universe(points, activations.dtype)
+    else:
+        reference = rulebase.reference()
+        universe = reference.stress_universe
+        mfs = [reference.stress[label].mf for label in rulebase.stress_terms]
+
+    aggregated = np.zeros((strength.shape[0], len(universe)), dtype=activations.dtype)
+    for k, mf in enumerate(mfs):
+        np.fmax(aggregated, np.fmin(activations[:, k:k + 1], mf[None, :]), out=aggregated)
+
+    return _batch_centroid(universe, aggregated)
+
+
+def calculate_stress_batch(screentime, temperature, humidity, air_quality, defuzzify="sampled", rulebase=None,
+                           precision="exact"):
+    """
+    Menghitung tingkat stres untuk banyak data sekaligus (array NumPy).
+    Memakai aturan Mamdani yang sama dengan calculate_stress, tetapi
+    sebagai operasi array.
+
+    defuzzify: "sampled" (default; centroid di atas stress_universe seperti
+    skfuzzy, mengimpor skfuzzy; berbeda dari engine "mamdani" maksimal
+    BATCH_TOLERANCE poin) atau "analytic" (keanggotaan + centroid
+    closed-form, lihat logic/centroid.py, identik dengan engine
+    "analytic"/"sparse"; di humidity = 90 berbeda dari skfuzzy).
+    rulebase: RuleBase yang dipakai (default: rule base aktif).
+    precision: salah satu PRECISION_MODES (hanya untuk defuzzify="analytic");
+    mode selain "exact" menukar akurasi dengan memori/CPU.
+
+    Mengembalikan (stress values, category codes); category code adalah
+    index ke CATEGORY_LABELS.
+    """
+    rulebase = rulebase or _state[0]
+    if precision not in PRECISION_MODES:
+        raise ValueError(f"Unknown precision mode: {precision!r} (pilih dari {tuple(PRECISION_MODES)})")
+    if precision != "exact" and defuzzify != "analytic":
+        raise ValueError("precision hanya berlaku untuk defuzzify='analytic'")
+    dtype, points = PRECISION_MODES[precision]
+
+    arrays = np.broadcast_arrays(
+        np.asarray(screentime, dtype=float),
+        np.asarray(temperature, dtype=float),
+        np.asarray(humidity, dtype=float),
+        np.asarray(air_quality, dtype=float)
+    )
+    shape = arrays[0].shape
+
+    # Clamping input (sama seperti calculate_stress)
+    inputs = [
+        np.clip(values.ravel(), low, high).astype(dtype, copy=False)
+        for values, (low, high) in zip(arrays, rulebase.input_ranges)
+    ]
+
+    values = np.empty(inputs[0].shape[0], dtype=dtype)
+    for start in range(0, values.shape[0], BATCH_CHUNK_SIZE):
+        chunk = slice(start, start + BATCH_CHUNK_SIZE)
+        values[chunk] = _batch_infer([x[chunk] for x in inputs], defuzzify, rulebase, points)
+
+    codes = np.digitize(values, CATEGORY_THRESHOLDS)
+    return values.reshape(shape), codes.reshape(shape)
+
+# 8. Mode Engine
+# Engine yang tidak perlu dimuat dari file (nama method RuleBase);
+# "surface", "sugeno" dan "kernel" dimuat di get_engine()
+ENGINES = {
+    "mamdani": "infer_mamdani",
+    "analytic": "infer_analytic",
+    "sparse": "infer_sparse",
+}
+ENGINE_MODES = ("mamdani", "analytic", "sparse", "surface", "sugeno", "kernel")
+# Mode yang hasilnya sama dengan calculate_stress_batch(defuzzify="analytic")
+ANALYTIC_MODES = ("analytic", "sparse", "kernel")
+
+
+def get_engine(mode, rulebase=None, **options):
+    """
+    Fungsi inferensi f(screentime, temperature, humidity, air_quality) -> skor
+    untuk mode tertentu dan rule base tertentu (default: rule base aktif).
+    Mode "surface" menerima opsi resolution dan path (lihat logic/surface.py),
+    mode "sugeno" opsi path dan samples (lihat logic/sugeno.py), mode
+    "kernel" opsi folder (lihat logic/kernel.py).
+    """
+    rulebase = rulebase or _state[0]
+    if mode in ENGINES:
+        return getattr(rulebase, ENGINES[mode])
+    if mode == "surface":
+        from logic import surface
+        return surface.load_or_build(rulebase=rulebase, **options).value
+    if mode == "sugeno":
+        from logic import sugeno
+        return sugeno.load_or_fit(rulebase=rulebase, **options).value
+    if mode == "kernel":
+        from logic import kernel
+        return kernel.load_or_generate(rulebase, **options)
+    raise ValueError(f"Unknown fuzzy engine mode: {mode!r} (pilih dari {ENGINE_MODES})")
+
 
-# 5. Inisialisasi Sistem Kontrol
-stress_ctrl = ctrl.ControlSystem(rules)
-stress_sim = ctrl.ControlSystemSimulation(stress_ctrl)
+# State aktif (rule base, mode, fungsi engine) disimpan dalam satu tuple
+# dan selalu diganti utuh, sehingga setiap request membaca kombinasi yang
+# konsisten walaupun set_engine/reload_rules berjalan bersamaan.
+_swap_lock = threading.Lock()
+_state = (None, None, None)
+_engine_options = {}
+ENGINE_MODE = "mamdani"
 
-def calculate_stress(screentime, temperature, humidity, air_quality):
+
+def _activate(rulebase, mode, engine):
+    global _state, ENGINE_MODE
+    _state = (rulebase, mode, engine)
+    ENGINE_MODE = mode
+    if _cache is not None:
+        _cache.clear()
+
+
+def _warm(rulebase, engine):
+    """Satu inferensi di tengah range: membangun state malas engine (ControlSystem skfuzzy untuk mamdani)."""
+    engine(*[(low + high) / 2 for low, high in rulebase.input_ranges])
+
+
+def warm_engine():
+    """
+    Menjalankan engine aktif sekali agar request pertama tidak menanggung
+    biaya inisialisasi (engine "mamdani": ~4 detik membangun ControlSystem).
+    """
+    rulebase, _, engine = _state
+    _warm(rulebase, engine)
+
+
+def active_rulebase():
+    """RuleBase yang sedang dipakai calculate_stress."""
+    return _state[0]
+
+
+def set_engine(mode, **options):
+    """Mengganti engine yang dipakai calculate_stress (lihat get_engine)."""
+    global _engine_options
+    with _swap_lock:
+        rulebase = _state[0]
+        _activate(rulebase, mode, get_engine(mode, rulebase, **options))
+        _engine_options = options
+
+
+def reload_rules(rules_path=None):
+    """
+    Compile rule base dari config + file aturan (atau ambil dari cache per
+    hash) lalu menukarnya secara atomic bersama engine aktif. Engine untuk
+    rule base baru disiapkan dulu, jadi request yang sedang berjalan tetap
+    memakai rule base lama sampai selesai.
+    Mengembalikan True jika rule base berubah. ValueError/OSError jika file
+    aturan tidak valid (rule base lama tetap dipakai).
+    """
+    with _swap_lock:
+        spec = _compiled.load_or_compile(rules_path)
+        if _state[0] is not None and spec["source_hash"] == _state[0].source_hash:
+            return False
+
+        rulebase = RuleBase(spec)
+        mode = _state[1] or ENGINE_MODE
+        engine = get_engine(mode, rulebase, **_engine_options)
+        # Saat hot reload, engine mamdani baru dibangun dulu sebelum dipakai request
+        if _state[0] is not None and mode == "mamdani":
+            _warm(rulebase, engine)
+        _activate(rulebase, mode, engine)
+        return True
+
+
+def start_rule_watcher(interval, rules_path=None):
+    """
+    Thread daemon yang memanggil reload_rules() setiap `interval` detik.
+    Setiap worker menjalankan watcher sendiri; compile hanya terjadi sekali
+    karena artefak di-cache per hash di config.ENGINE_CACHE_FOLDER.
+    """
+    def watch():
+        last_error = None
+        while True:
+            time.sleep(interval)
+            try:
+                if reload_rules(rules_path):
+                    print(f"[FUZZY] Rule base dimuat ulang ({_state[0].source_hash[:12]}, "
+                          f"{len(_state[0].rule_consequents)} aturan)")
+                last_error = None
+            except (OSError, ValueError) as e:
+                if str(e) != last_error:
+                    print(f"[FUZZY] Rule base baru ditolak, tetap memakai yang lama: {e}")
+                last_error = str(e)
+
+    thread = threading.Thread(target=watch, name="rule-watcher", daemon=True)
+    thread.start()
+    return thread
+
+
+# Cache hasil inferensi (nonaktif sampai configure_cache dipanggil)
+_cache = None
+
+
+def configure_cache(maxsize, ttl=None, decimals=2):
+    """
+    Mengaktifkan cache LRU di depan engine. Input dibulatkan ke `decimals`
+    angka di belakang koma lalu inferensi dihitung dari input yang sudah
+    dibulatkan. maxsize 0 menonaktifkan cache.
+    """
+    global _cache
+    _cache = _cache_module.StressCache(maxsize, ttl, decimals) if maxsize else None
+
+
+def quantize_inputs(*values):
+    """Membulatkan input (array) seperti cache aktif; apa adanya jika cache nonaktif."""
+    cache = _cache
+    if cache is None:
+        return values
+    return tuple(np.round(np.asarray(v, dtype=float), cache.decimals) for v in values)
+
+
+def cache_stats():
+    """Counter cache (hits, misses, evictions, ...) atau None jika nonaktif."""
+    return _cache.stats() if _cache is not None else None
+
+
+def input_memberships(screentime, temperature, humidity, air_quality):
+    """Derajat keanggotaan setiap term per input untuk rule base aktif."""
+    return _state[0].memberships(screentime, temperature, humidity, air_quality)
+
+
+# Nama lama tetap tersedia sebagai atribut modul: tabel rule base aktif
+# (INPUT_RANGES, RULE_TABLE, ...) dan objek skfuzzy (universe, Antecedent,
+# rules, stress_ctrl, ...; baru mengimpor skfuzzy saat diakses).
+_RULEBASE_NAMES = {
+    "ENGINE_SPEC": "spec",
+    "INPUT_LABELS": "input_labels",
+    "INPUT_RANGES": "input_ranges",
+    "INPUT_TRAPEZOIDS": "input_trapezoids",
+    "MF_PARAMS": "mf_params",
+    "STRESS_TERMS": "stress_terms",
+    "STRESS_TRAPEZOIDS": "stress_trapezoids",
+    "RULE_ANTECEDENTS": "rule_antecedents",
+    "RULE_CONSEQUENTS": "rule_consequents",
+    "RULE_TABLE": "rule_table",
+}
+_REFERENCE_NAMES = {
+    "screen_universe", "temp_universe", "humid_universe", "aq_universe", "stress_universe",
+    "screen", "temp", "humid", "airq", "stress", "rules", "stress_ctrl", "stress_sim",
+}
+
+
+def __getattr__(name):
+    if name in _RULEBASE_NAMES:
+        return getattr(_state[0], _RULEBASE_NAMES[name])
+    if name in _REFERENCE_NAMES:
+        return getattr(_state[0].reference(), name)
+    if name == "INPUT_VARIABLES":
+        return _state[0].reference().inputs
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+reload_rules()
+
+
+# Level isi fuzzy_details di hasil calculate_stress:
+#   "none"        -> hanya total_rules (jalur ingest, tanpa payload visualisasi)
+#   "memberships" -> + derajat keanggotaan setiap input (default)
+#   "full"        -> + aturan yang aktif dan aktivasi term output
+DETAIL_LEVELS = ("none", "memberships", "full")
+
+# Key fuzzy_details per input (urutan = urutan input rule base)
+MEMBERSHIP_KEYS = ("screen_membership", "temp_membership", "humid_membership", "aq_membership")
+
+
+def calculate_stress(screentime, temperature, humidity, air_quality, detail="memberships"):
     """
     Menghitung tingkat stres berdasarkan input sensor.
-    Mengembalikan stress value, category, message, dan membership degrees.
-    """
-    # Clamping input
-    screentime = float(np.clip(screentime, 0, 24))
-    temperature = float(np.clip(temperature, 15, 35))
-    humidity = float(np.clip(humidity, 30, 90))
-    air_quality = float(np.clip(air_quality, 0, 5))
-
-    try:
-        stress_sim.input['screen'] = screentime
-        stress_sim.input['temperature'] = temperature
-        stress_sim.input['humidity'] = humidity
-        stress_sim.input['air_quality'] = air_quality
-        stress_sim.compute()
-        
-        value = float(stress_sim.output['stress'])
-    except Exception as e:
-        print(f"[FUZZY ERROR] {e}")
-        value = 50.0
+    Mengembalikan stress value, category, message, dan fuzzy_details sesuai
+    level `detail` (lihat DETAIL_LEVELS).
+    """
+    if detail not in DETAIL_LEVELS:
+        raise ValueError(f"Unknown detail level: {detail!r} (pilih dari {DETAIL_LEVELS})")
 
-    # Kategorisasi Output
-    if value < 20:
-        category = "Very Low Stress"
-        message = "Kondisi sangat baik! Tetap jaga pola hidup sehat."
-    elif value < 40:
-        category = "Low Stress"
-        message = "Kondisi baik. Pertahankan keseimbangan aktivitas digital."
-    elif value < 60:
-        category = "Medium Stress"
-        message = "Perlu perhatian. Kurangi screen time dan perbaiki lingkungan."
-    elif value < 80:
-        category = "High Stress"
-        message = "Kondisi tidak ideal. Segera istirahat dan perbaiki lingkungan sekitar."
+    rulebase, mode, engine = _state
+
+    # Clamping input (min/max float biasa, np.clip skalar jauh lebih lambat)
+    screentime, temperature, humidity, air_quality = (
+        min(max(float(x), low), high)
+        for x, (low, high) in zip((screentime, temperature, humidity, air_quality), rulebase.input_ranges)
+    )
+
+    cache = _cache
+    if cache is None:
+        value = engine(screentime, temperature, humidity, air_quality)
     else:
-        category = "Very High Stress"
-        message = "PERINGATAN! Segera kurangi penggunaan HP dan perbaiki kondisi ruangan!"
+        key = cache.quantize(screentime, temperature, humidity, air_quality)
+        screentime, temperature, humidity, air_quality = key
+        # Hash rule base + mode ikut jadi key agar hasil engine lama yang
+        # selesai setelah reload tidak tercampur ke cache.
+        cache_key = (rulebase.source_hash, mode) + key
+        value = cache.get(cache_key)
+        if value is None:
+            value = engine(*key)
+            cache.put(cache_key, value)
 
-    # Hitung membership degrees untuk visualisasi
-    screen_mf = {
-        'low': float(fuzz.interp_membership(screen_universe, screen['low'].mf, screentime)),
-        'medium': float(fuzz.interp_membership(screen_universe, screen['medium'].mf, screentime)),
-        'high': float(fuzz.interp_membership(screen_universe, screen['high'].mf, screentime))
-    }
-    
-    temp_mf = {
-        'cold': float(fuzz.interp_membership(temp_universe, temp['cold'].mf, temperature)),
-        'normal': float(fuzz.interp_membership(temp_universe, temp['normal'].mf, temperature)),
-        'hot': float(fuzz.interp_membership(temp_universe, temp['hot'].mf, temperature))
-    }
-    
-    humid_mf = {
-        'low': float(fuzz.interp_membership(humid_universe, humid['low'].mf, humidity)),
-        'medium': float(fuzz.interp_membership(humid_universe, humid['medium'].mf, humidity)),
-        'high': float(fuzz.interp_membership(humid_universe, humid['high'].mf, humidity))
-    }
-    
-    aq_mf = {
-        'good': float(fuzz.interp_membership(aq_universe, airq['good'].mf, air_quality)),
-        'moderate': float(fuzz.interp_membership(aq_universe, airq['moderate'].mf, air_quality)),
-        'poor': float(fuzz.interp_membership(aq_universe, airq['poor'].mf, air_quality))
-    }
+    # Kategorisasi Output
+    _, category, message = categorize(value)
 
-    return {
+    result = {
         "stress_value": round(value, 2),
         "category": category,
         "message": message,
         "fuzzy_details": {
-            "total_rules": len(rules),
-            "screen_membership": screen_mf,
-            "temp_membership": temp_mf,
-            "humid_membership": humid_mf,
-            "aq_membership": aq_mf
+            "total_rules": len(rulebase.rule_consequents)
         }
     }
+    if detail == "none":
+        return result
+
+    # Hitung membership degrees untuk visualisasi
+    details = result["fuzzy_details"]
+    memberships = rulebase.memberships(screentime, temperature, humidity, air_quality)
+    for field, label, degrees in zip(MEMBERSHIP_KEYS, rulebase.input_labels, memberships):
+        details[field] = dict(zip(rulebase.mf_params[label], degrees))
 
-# 6. Bagian Testing (MAIN)
+    if detail == "full":
+        details["fired_rules"], details["output_activations"] = rulebase.explain(
+            screentime, temperature, humidity, air_quality
+        )
+
+    return result
+
+
+# 9. Bagian Testing (MAIN)
 if __name__ == '__main__':
     print("="*70)
     print("SISTEM DETEKSI STRES - PENGUJIAN SKENARIO FUZZY MAMDANI")
@@ -238,6 +584,12 @@ if __name__ == '__main__':
         print(f"Input  => Screen: {st}h, Temp: {temp_val}°C, Humid: {hum}%, AQ: {aq}")
         print(f"Output => Skor: {result['stress_value']}, Kategori: {result['category']}")
         print(f"Pesan  => {result['message']}")
+
+    # Bandingkan jalur batch dengan jalur skalar
+    batch_values, batch_codes = calculate_stress_batch(*np.array(test_cases).T)
+    scalar_values = [calculate_stress(*case)["stress_value"] for case in test_cases]
+    max_diff = float(np.max(np.abs(batch_values - scalar_values)))
+    print(f"\n[BATCH] Selisih maksimum vs skalar: {max_diff:.4f} (toleransi {BATCH_TOLERANCE})")
         
     print("\n" + "="*70)
     print("PENGUJIAN SELESAI")
@@ -0,0 +1,216 @@
+"""
+Generated Scalar Kernel
+=======================
+Menghasilkan fungsi Python khusus (float murni, tanpa NumPy) dari rule base
+aktif untuk inferensi satu sampel:
+  - uji keanggotaan setiap term di-unroll dengan parameter trapesium
+    sebagai konstanta,
+  - aturan di-unroll sebagai if bersarang per input, sehingga hanya cabang
+    dengan keanggotaan > 0 yang dievaluasi (maks 16 aturan),
+  - centroid dihitung closed-form: jumlah luas/momen setiap term output
+    yang dipotong, dikurangi daerah overlap term yang bersebelahan
+    (max(f, g) = f + g - min(f, g)). Ini hanya berlaku jika term output
+    hanya overlap dengan tetangganya di sisi miring; jika tidak, kernel
+    memakai centroid() generik dari logic/centroid.py.
+
+Source kernel disimpan di config.ENGINE_CACHE_FOLDER dengan nama berisi
+hash rule base, jadi hanya dibuat ulang saat aturan/MF berubah.
+
+Usage:
+    python -m logic.kernel        # generate + bandingkan dengan engine analytic
+"""
+
+import os
+
+import config
+from logic import centroid as _centroid
+
+KERNEL_VERSION = 1
+
+
+def _f(value):
+    return repr(float(value))
+
+
+def _membership_lines(var, term, x, params):
+    """Kode keanggotaan trapesium (a, b, c, d) untuk variabel x."""
+    a, b, c, d = params
+    name = f"m{var}_{term}"
+    lines = [f"    if {x} < {_f(a)} or {x} > {_f(d)}:", f"        {name} = 0.0"]
+    if b > a:
+        lines += [f"    elif {x} < {_f(b)}:", f"        {name} = ({x} - {_f(a)}) / {_f(b - a)}"]
+    if d > c:
+        lines += [f"    elif {x} <= {_f(c)}:", f"        {name} = 1.0",
+                  "    else:", f"        {name} = ({_f(d)} - {x}) / {_f(d - c)}"]
+    else:
+        lines += ["    else:", f"        {name} = 1.0"]
+    return lines
+
+
+def _rule_lines(rulebase):
+    """If bersarang per input; daun = update aktivasi term output."""
+    table = rulebase.rule_table
+    sizes = table.shape
+    lines = []
+
+    def visit(prefix, weight, depth):
+        indent = "    " * (depth + 1)
+        for t in range(sizes[depth]):
+            index = prefix + (t,)
+            # Lewati cabang yang tidak berisi satu pun aturan
+            if (table[index] < 0).all():
+                continue
+
+            m = f"m{depth}_{t}"
+            lines.append(f"{indent}if {m} > 0.0:")
+            if weight is None:
+                w = m
+            else:
+                w = f"w{depth}"
+                lines.append(f"{indent}    {w} = {weight} if {weight} < {m} else {m}")
+
+            if depth == len(sizes) - 1:
+                h = f"h{table[index]}"
+                lines.append(f"{indent}    if {w} > {h}:")
+                lines.append(f"{indent}        {h} = {w}")
+            else:
+                visit(index, w, depth + 1)
+
+    visit((), None, 0)
+    return lines
+
+
+def _clipped_lines(sign, h, a, b, c, d):
+    """Luas & momen trapesium (a, b, c, d) yang dipotong setinggi h (h <= tinggi puncak)."""
+    op = "+=" if sign > 0 else "-="
+    return [
+        f"p = {_f(a)} + {h} * {_f(b - a)}",
+        f"q = {_f(d)} - {h} * {_f(d - c)}",
+        f"area {op} {h} * (q - p + {_f(d - a)}) * 0.5",
+        f"moment {op} {h} * ((p - {_f(a)}) * ({_f(a)} + 2.0 * p) + 3.0 * (q - p) * (p + q)"
+        f" + ({_f(d)} - q) * (2.0 * q + {_f(d)})) / 6.0",
+    ]
+
+
+def adjacent_overlaps(trapezoids):
+    """
+    Daerah overlap (L, P, Q, R) setiap pasangan term bersebelahan, atau None
+    jika ada overlap yang tidak hanya di sisi miring (closed-form tidak berlaku).
+    Di [L, R] overlap = min(sisi turun kiri, sisi naik kanan) = segitiga
+    dengan kemiringan naik 1/P dan turun 1/Q.
+    """
+    order = sorted(range(len(trapezoids)), key=lambda k: trapezoids[k][0])
+    overlaps = []
+    for n, k in enumerate(order):
+        a, b, c, d = trapezoids[k]
+        for other in order[n + 2:]:
+            if trapezoids[other][0] < d:
+                return None
+        if n + 1 < len(order):
+            k2 = order[n + 1]
+            a2, b2, c2, d2 = trapezoids[k2]
+            if a2 < d:
+                if c > a2 or d > b2 or d == c or b2 == a2:
+                    return None
+                overlaps.append((k, k2, a2, b2 - a2, d - c, d))
+    return overlaps
+
+
+def _centroid_lines(rulebase):
+    trapezoids = rulebase.stress_trapezoids
+    overlaps = adjacent_overlaps(trapezoids)
+    if overlaps is None:
+        activations = ", ".join(f"h{k}" for k in range(len(trapezoids)))
+        return [
+            f"    value = _centroid.centroid(STRESS_TRAPEZOIDS, [{activations}])",
+            "    return 50.0 if value is None else value",
+        ]
+
+    lines = ["    area = 0.0", "    moment = 0.0"]
+    for k, params in enumerate(trapezoids):
+        lines.append(f"    if h{k} > 0.0:")
+        lines += ["        " + line for line in _clipped_lines(1, f"h{k}", *params)]
+
+    for k, k2, left, rise, fall, right in overlaps:
+        peak = (right - left) / (rise + fall)
+        lines += [
+            f"    if h{k} > 0.0 and h{k2} > 0.0:",
+            f"        h = h{k} if h{k} < h{k2} else h{k2}",
+            f"        if h > {_f(peak)}:",
+            f"            h = {_f(peak)}",
+        ]
+        lines += ["        " + line for line in _clipped_lines(-1, "h", left, left + rise, right - fall, right)]
+
+    lines += ["    return moment / area if area > 0.0 else 50.0"]
+    return lines
+
+
+def generate_source(rulebase):
+    """Source Python modul kernel untuk rule base."""
+    args = ", ".join(f"x{i}" for i in range(len(rulebase.input_labels)))
+    lines = [
+        f"# Kernel fuzzy hasil generate (logic/kernel.py v{KERNEL_VERSION}), jangan diedit.",
+        f"# Rule base: {rulebase.source_hash}",
+        f"STRESS_TRAPEZOIDS = {rulebase.stress_trapezoids!r}",
+        "",
+        "",
+        f"def score({args}):",
+        f'    """Skor stres ({", ".join(rulebase.input_labels)}), input sudah di-clamp."""',
+    ]
+    for var, trapezoids in enumerate(rulebase.input_trapezoids):
+        for term, params in enumerate(trapezoids):
+            lines += _membership_lines(var, term, f"x{var}", params)
+
+    lines.append("    " + " = ".join(f"h{k}" for k in range(len(rulebase.stress_terms))) + " = 0.0")
+    lines += _rule_lines(rulebase)
+    lines += _centroid_lines(rulebase)
+    return "\n".join(lines) + "\n"
+
+
+def kernel_path(rulebase, folder=None):
+    folder = folder or config.ENGINE_CACHE_FOLDER
+    return os.path.join(folder, f"kernel_v{KERNEL_VERSION}_{rulebase.source_hash[:16]}.py")
+
+
+def _compile(source, path):
+    namespace = {"_centroid": _centroid}
+    exec(compile(source, path, "exec"), namespace)
+    return namespace["score"]
+
+
+def load_or_generate(rulebase, folder=None):
+    """Fungsi score() dari cache disk, atau generate + simpan jika belum ada."""
+    path = kernel_path(rulebase, folder)
+    try:
+        with open(path) as f:
+            return _compile(f.read(), path)
+    except (OSError, SyntaxError):
+        pass
+
+    source = generate_source(rulebase)
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(source)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[FUZZY] Gagal menyimpan kernel ke {path}: {e}")
+    return _compile(source, path)
+
+
+if __name__ == "__main__":
+    import random
+
+    from logic import fuzzy_logic
+
+    rulebase = fuzzy_logic.active_rulebase()
+    score = load_or_generate(rulebase)
+    print(f"Kernel: {kernel_path(rulebase)}")
+
+    rng = random.Random(0)
+    max_diff = 0.0
+    for _ in range(20000):
+        case = [rng.uniform(low, high) for low, high in rulebase.input_ranges]
+        max_diff = max(max_diff, abs(score(*case) - rulebase.infer_analytic(*case)))
+    print(f"Selisih maksimum vs engine analytic (20000 input acak): {max_diff:.2e}")
@@ -0,0 +1,146 @@
+"""
+Sistem Referensi skfuzzy (Fuzzy Mamdani)
+========================================
+Membangun ControlSystem skfuzzy (universe, fungsi keanggotaan trapmf,
+ctrl.Rule) dari rule base terkompilasi (logic/compiled.py). Dipakai oleh
+engine "mamdani" sebagai referensi exact dan oleh calculate_stress_batch
+dengan defuzzify="sampled".
+
+Mengimpor skfuzzy + networkx dan menyusun ControlSystem itu mahal, jadi
+modul ini hanya diimpor saat engine "mamdani" dipakai, dan ControlSystem
+dibangun saat inferensi pertama.
+"""
+
+import copy
+import queue
+import threading
+from functools import reduce
+
+import numpy as np
+import skfuzzy as fuzz
+from skfuzzy import control as ctrl
+
+# Jarak titik universe (sama untuk semua variabel)
+UNIVERSE_STEP = 0.1
+
+# Nama atribut per input (nama variabel lama di fuzzy_logic.py)
+INPUT_NAMES = ("screen", "temp", "humid", "airq")
+UNIVERSE_NAMES = ("screen_universe", "temp_universe", "humid_universe", "aq_universe")
+
+# Jumlah simulasi cadangan di pool per sistem
+SIM_POOL_SIZE = 8
+
+
+def _universe(value_range):
+    low, high = value_range
+    return np.arange(low, high + UNIVERSE_STEP, UNIVERSE_STEP)
+
+
+def _variable(kind, spec):
+    """Antecedent/Consequent dengan term trapmf sesuai spec."""
+    variable = kind(_universe(spec["range"]), spec["label"])
+    for label, params in spec["terms"].items():
+        variable[label] = fuzz.trapmf(variable.universe, params)
+    return variable
+
+
+class ReferenceSystem:
+    """ControlSystem skfuzzy untuk satu rule base + pool simulasi."""
+
+    def __init__(self, spec):
+        self.source_hash = spec["source_hash"]
+        self.inputs = [_variable(ctrl.Antecedent, var) for var in spec["inputs"]]
+        self.stress = _variable(ctrl.Consequent, spec["output"])
+        self.stress.defuzzify_method = 'centroid'
+
+        for name, universe_name, var in zip(INPUT_NAMES, UNIVERSE_NAMES, self.inputs):
+            setattr(self, name, var)
+            setattr(self, universe_name, var.universe)
+        self.stress_universe = self.stress.universe
+
+        term_labels = [list(var.terms) for var in self.inputs]
+        output_labels = list(self.stress.terms)
+        self.rules = [
+            ctrl.Rule(
+                reduce(lambda a, b: a & b, (
+                    var[labels[i]] for var, labels, i in zip(self.inputs, term_labels, row[:-1])
+                )),
+                self.stress[output_labels[row[-1]]]
+            )
+            for row in spec["rules"]
+        ]
+
+        # ControlSystem (graf networkx dari semua aturan) butuh beberapa
+        # detik, jadi dibangun saat pertama kali dibutuhkan.
+        self._sim_pool = queue.LifoQueue(maxsize=SIM_POOL_SIZE)
+        self._ctrl_lock = threading.Lock()
+        self._stress_ctrl = None
+        self._stress_sim = None
+
+    @property
+    def stress_ctrl(self):
+        """ControlSystem bersama (dibangun sekali, thread-safe)."""
+        with self._ctrl_lock:
+            if self._stress_ctrl is None:
+                self._stress_ctrl = ctrl.ControlSystem(self.rules)
+                self._stress_sim = ctrl.ControlSystemSimulation(self._stress_ctrl)
+                self._sim_pool.put(self._stress_sim)
+        return self._stress_ctrl
+
+    @property
+    def stress_sim(self):
+        self.stress_ctrl
+        return self._stress_sim
+
+    def _build_simulation(self):
+        """
+        Membuat ControlSystemSimulation yang tidak berbagi state dengan stress_sim.
+        State skfuzzy disimpan per objek Term/variabel, jadi simulasi independen
+        butuh salinan sistem kontrol sendiri (deepcopy jauh lebih cepat daripada
+        menyusun ulang semua aturan).
+        """
+        return ctrl.ControlSystemSimulation(copy.deepcopy(self.stress_ctrl))
+
+    # Pool simulasi: setiap thread meminjam simulasi sendiri selama compute(),
+    # sehingga request paralel tidak saling menimpa input. Simulasi baru dibuat
+    # jika pool kosong; yang melebihi SIM_POOL_SIZE dibuang saat dikembalikan.
+    def infer(self, screentime, temperature, humidity, air_quality):
+        """Inferensi exact memakai ControlSystemSimulation skfuzzy."""
+        self.stress_ctrl
+        try:
+            sim = self._sim_pool.get_nowait()
+        except queue.Empty:
+            sim = self._build_simulation()
+
+        try:
+            for var, value in zip(self.inputs, (screentime, temperature, humidity, air_quality)):
+                sim.input[var.label] = value
+            sim.compute()
+
+            return float(sim.output[self.stress.label])
+        except Exception as e:
+            print(f"[FUZZY ERROR] {e}")
+            return 50.0
+        finally:
+            try:
+                self._sim_pool.put_nowait(sim)
+            except queue.Full:
+                pass
+
+
+# Sistem untuk rule base terakhir yang diminta (dibangun ulang saat hash berubah)
+_system = None
+_system_lock = threading.Lock()
+
+
+def get_system(spec):
+    """ReferenceSystem untuk spec rule base (di-cache per source_hash)."""
+    global _system
+    system = _system
+    if system is not None and system.source_hash == spec["source_hash"]:
+        return system
+
+    with _system_lock:
+        if _system is None or _system.source_hash != spec["source_hash"]:
+            _system = ReferenceSystem(spec)
+        return _system
@@ -0,0 +1,87 @@
+"""
+Laporan Mode Presisi Batch
+==========================
+Mengukur setiap mode di fuzzy_logic.PRECISION_MODES terhadap "exact"
+(float64, centroid closed-form) pada titik acak di seluruh ruang input:
+deviasi stres (max, p99, mean), ketidaksamaan kategori, throughput dan
+memori per baris. Hasilnya dicetak dan disimpan sebagai JSON agar batas
+error setiap mode terdokumentasi sebelum dipakai (config.BATCH_PRECISION).
+
+Usage:
+    python -m logic.precision
+    python -m logic.precision --samples 500000
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+import config
+from logic import fuzzy_logic
+
+
+def _random_inputs(rulebase, samples, seed):
+    rng = np.random.default_rng(seed)
+    return [rng.uniform(low, high, samples) for low, high in rulebase.input_ranges]
+
+
+def measure(samples=config.PRECISION_SAMPLES, seed=0, rulebase=None):
+    """Laporan error + kecepatan setiap mode presisi terhadap "exact"."""
+    rulebase = rulebase or fuzzy_logic.active_rulebase()
+    inputs = _random_inputs(rulebase, samples, seed)
+    exact, exact_codes = fuzzy_logic.calculate_stress_batch(*inputs, rulebase=rulebase, defuzzify="analytic")
+
+    modes = {}
+    for mode, (dtype, points) in fuzzy_logic.PRECISION_MODES.items():
+        start = time.perf_counter()
+        values, codes = fuzzy_logic.calculate_stress_batch(
+            *inputs, rulebase=rulebase, defuzzify="analytic", precision=mode
+        )
+        elapsed = time.perf_counter() - start
+
+        diff = np.abs(values.astype(float) - exact)
+        universe_points = 0 if points is None else len(rulebase.output_universe(points, dtype)[0])
+        modes[mode] = {
+            "dtype": np.dtype(dtype).name,
+            "universe_points": universe_points or None,
+            "max_deviation": float(diff.max()),
+            "p99_deviation": float(np.percentile(diff, 99)),
+            "mean_deviation": float(diff.mean()),
+            "category_disagreement": float(np.mean(codes != exact_codes)),
+            "rows_per_second": samples / elapsed,
+            # Memori kerja per baris: aktivasi per aturan + agregasi output
+            "bytes_per_row": np.dtype(dtype).itemsize * (len(rulebase.rule_consequents) + universe_points),
+        }
+
+    return {"source_hash": rulebase.source_hash, "samples": samples, "seed": seed, "modes": modes}
+
+
+def save_report(report, path=config.PRECISION_REPORT_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(report, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ukur error & kecepatan mode presisi batch")
+    parser.add_argument("--samples", type=int, default=config.PRECISION_SAMPLES)
+    parser.add_argument("--path", default=config.PRECISION_REPORT_PATH)
+    args = parser.parse_args()
+
+    report = measure(args.samples)
+    save_report(report, args.path)
+
+    print("=" * 78)
+    print(f"Mode presisi vs exact ({report['samples']} titik acak)")
+    print(f"{'mode':<9}{'dtype':<9}{'universe':>9}{'max':>10}{'p99':>10}{'kategori':>10}{'rows/s':>12}{'B/row':>8}")
+    for mode, r in report["modes"].items():
+        print(f"{mode:<9}{r['dtype']:<9}{str(r['universe_points'] or '-'):>9}"
+              f"{r['max_deviation']:>10.4f}{r['p99_deviation']:>10.4f}{r['category_disagreement']:>10.3%}"
+              f"{r['rows_per_second']:>12,.0f}{r['bytes_per_row']:>8}")
+    print(f"Laporan tersimpan di {args.path}")
+    print("=" * 78)
@@ -0,0 +1,104 @@
+"""
+Rescoring Device saat Kondisi Ruangan Berubah
+=============================================
+Skor stres device biasanya hanya dihitung saat HP upload screen time. Saat
+sensor ruangan mengirim data baru, rescore_devices() menghitung ulang semua
+device aktif sekaligus (satu panggilan calculate_stress_batch) memakai
+screen time terakhir masing-masing dan kondisi ruangan baru.
+
+Device dilewati jika sudah tidak aktif (upload terakhir lebih lama dari
+active_window) atau jika tidak ada input ruangan yang bergeser melebihi
+threshold dibanding input yang dipakai untuk skor terakhirnya.
+
+Skor mengikuti engine aktif + pembulatan cache seperti upload biasa:
+engine analitik (fuzzy_logic.ANALYTIC_MODES) memakai batch analitik yang
+identik, engine "mamdani" memakai batch sampled (selisih maksimal
+fuzzy_logic.BATCH_TOLERANCE, tanpa panggilan skfuzzy per device). Engine
+lain (surface, sugeno) sudah cepat per panggilan dan dihitung per device.
+Satu update sensor menghitung paling banyak max_devices device (yang
+paling baru upload).
+"""
+
+import time
+
+import numpy as np
+
+import config
+from logic import fuzzy_logic
+
+ROOM_INPUTS = ("temperature", "humidity", "air_quality")
+
+
+def needs_rescore(entry, room, thresholds):
+    """True jika ada input ruangan yang bergeser melebihi threshold."""
+    previous = entry.get("inputs")
+    if previous is None:
+        return True
+    return any(abs(room[name] - previous[name]) > thresholds.get(name, 0.0) for name in ROOM_INPUTS)
+
+
+def rescore_devices(devices, room, thresholds=None, active_window=None, now=None, precision=None,
+                    max_devices=None):
+    """
+    Menghitung ulang skor device aktif untuk kondisi ruangan baru.
+
+    devices: {device_id: entry}, entry berisi "screen_hours", "inputs"
+    (input ruangan saat skor terakhir) dan "updated_at" (epoch detik).
+    precision hanya berlaku untuk batch analitik (lihat calculate_stress_batch).
+    Mengembalikan {device_id: entry baru} hanya untuk device yang berubah.
+    """
+    thresholds = config.RESCORE_THRESHOLDS if thresholds is None else thresholds
+    active_window = config.RESCORE_ACTIVE_WINDOW if active_window is None else active_window
+    max_devices = config.RESCORE_MAX_DEVICES if max_devices is None else max_devices
+    precision = precision or config.BATCH_PRECISION
+    now = time.time() if now is None else now
+
+    selected = [
+        (device_id, entry) for device_id, entry in devices.items()
+        if "screen_hours" in entry
+        and now - entry.get("updated_at", 0) <= active_window
+        and needs_rescore(entry, room, thresholds)
+    ]
+    if not selected:
+        return {}
+    if len(selected) > max_devices:
+        selected.sort(key=lambda item: item[1].get("updated_at", 0), reverse=True)
+        selected = selected[:max_devices]
+
+    screen_hours = np.array([entry["screen_hours"] for _, entry in selected], dtype=float)
+    mode = fuzzy_logic.ENGINE_MODE
+    if mode in fuzzy_logic.ANALYTIC_MODES or mode == "mamdani":
+        if mode == "mamdani":
+            options = {"defuzzify": "sampled"}
+        else:
+            options = {"defuzzify": "analytic", "precision": precision}
+        values, codes = fuzzy_logic.calculate_stress_batch(
+            *fuzzy_logic.quantize_inputs(
+                screen_hours, room["temperature"], room["humidity"], room["air_quality"]
+            ),
+            **options
+        )
+        scores = [
+            (round(value, 2),) + fuzzy_logic.CATEGORIES[code][1:]
+            for value, code in zip(values.tolist(), codes.tolist())
+        ]
+    else:
+        scores = []
+        for hours in screen_hours.tolist():
+            result = fuzzy_logic.calculate_stress(
+                hours, room["temperature"], room["humidity"], room["air_quality"], detail="none"
+            )
+            scores.append((result["stress_value"], result["category"], result["message"]))
+
+    inputs = {name: room[name] for name in ROOM_INPUTS}
+    updates = {}
+    for (device_id, entry), (value, category, message) in zip(selected, scores):
+        updates[device_id] = dict(
+            entry,
+            stress_val=value,
+            category=category,
+            msg=message,
+            inputs=inputs,
+            rescored_at=now,
+        )
+    return updates
@@ -0,0 +1,211 @@
+"""
+Zero-order Sugeno Surrogate
+===========================
+Engine pengganti Mamdani untuk scoring massal: setiap aturan punya satu
+konstanta output, dan skor = rata-rata konstanta berbobot kekuatan aturan
+yang aktif (maks 16 aturan, tanpa defuzzifikasi centroid).
+
+Konstanta di-fit dengan least squares terhadap output Mamdani (engine
+analytic) pada titik acak di seluruh ruang input, lalu disimpan sebagai
+JSON bersama hash rule base. Model di-fit ulang otomatis jika rule base
+berubah. Karena bentuk permukaan Sugeno berbeda dari Mamdani, error
+terhadap Mamdani selalu dilaporkan (RMSE, max, kesamaan kategori).
+
+Usage:
+    python -m logic.sugeno                     # fit dengan jumlah sampel dari config
+    python -m logic.sugeno --samples 400000
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+import config
+from logic import centroid as _centroid
+from logic import fuzzy_logic
+
+# Titik acak terpisah untuk mengukur error model
+VALIDATION_SAMPLES = 50000
+# Titik validasi diambil dari range yang diperlebar 10% per sisi lalu
+# di-clamp, sehingga batas range (mis. humidity = 90) ikut terukur
+VALIDATION_EDGE_MARGIN = 0.1
+
+
+def _random_inputs(rulebase, samples, seed, edge_margin=0.0):
+    """Input acak; edge_margin > 0 memperlebar range lalu clamp agar batas range ikut terambil."""
+    rng = np.random.default_rng(seed)
+    inputs = []
+    for low, high in rulebase.input_ranges:
+        margin = (high - low) * edge_margin
+        inputs.append(np.clip(rng.uniform(low - margin, high + margin, samples), low, high))
+    return inputs
+
+
+def rule_weights(rulebase, inputs):
+    """Kekuatan (min) setiap aturan untuk array input, shape (N, jumlah aturan)."""
+    strength = None
+    for i, values in enumerate(inputs):
+        mf = np.stack([_centroid.trapezoid_batch(values, params) for params in rulebase.input_trapezoids[i]], axis=1)
+        mf = mf[:, rulebase.rule_antecedents[:, i]]
+        strength = mf if strength is None else np.fmin(strength, mf)
+    return strength
+
+
+def _predict(constants, weights):
+    total = weights.sum(axis=1)
+    return np.where(total > 0, weights @ constants / np.where(total > 0, total, 1.0), 50.0)
+
+
+class SugenoModel:
+    """Konstanta output per aturan + inferensi rata-rata berbobot."""
+
+    def __init__(self, rulebase, constants, report=None):
+        self.rulebase = rulebase
+        self.constants = np.asarray(constants, dtype=float)
+        self.report = report or {}
+
+        # Tabel konstanta sejajar dengan rule_table (None = tidak ada aturan)
+        table = np.full(rulebase.rule_table.shape, None, dtype=object)
+        table[tuple(rulebase.rule_antecedents.T)] = self.constants.tolist()
+        self._table = table.tolist()
+
+    def value(self, screentime, temperature, humidity, air_quality):
+        """Skor stres untuk satu input (hanya aturan dengan kekuatan > 0)."""
+        active = [
+            [(t, mu) for t, mu in enumerate(memberships) if mu > 0]
+            for memberships in self.rulebase.memberships(screentime, temperature, humidity, air_quality)
+        ]
+
+        weighted = 0.0
+        total = 0.0
+        for i, m_screen in active[0]:
+            table_i = self._table[i]
+            for j, m_temp in active[1]:
+                table_ij = table_i[j]
+                w_ij = min(m_screen, m_temp)
+                for k, m_humid in active[2]:
+                    table_ijk = table_ij[k]
+                    w_ijk = min(w_ij, m_humid)
+                    for l, m_aq in active[3]:
+                        c = table_ijk[l]
+                        if c is not None:
+                            w = min(w_ijk, m_aq)
+                            weighted += w * c
+                            total += w
+
+        return weighted / total if total > 0 else 50.0
+
+    def values(self, screentime, temperature, humidity, air_quality):
+        """Versi array dari value()."""
+        arrays = np.broadcast_arrays(
+            *(np.asarray(x, dtype=float) for x in (screentime, temperature, humidity, air_quality))
+        )
+        inputs = [
+            np.clip(x.ravel(), low, high)
+            for x, (low, high) in zip(arrays, self.rulebase.input_ranges)
+        ]
+        return _predict(self.constants, rule_weights(self.rulebase, inputs)).reshape(arrays[0].shape)
+
+
+def _error_stats(approx, exact, exact_codes):
+    diff = approx - exact
+    return {
+        "rmse": float(np.sqrt(np.mean(diff ** 2))),
+        "max": float(np.abs(diff).max()),
+        "category_agreement": float(np.mean(np.digitize(approx, fuzzy_logic.CATEGORY_THRESHOLDS) == exact_codes)),
+    }
+
+
+def measure_error(model, samples=VALIDATION_SAMPLES, seed=1):
+    """
+    Error model pada titik acak yang tidak dipakai fit. Acuan utama adalah
+    referensi Mamdani skfuzzy (batch defuzzify="sampled"); error terhadap
+    target fit (analytic) dilaporkan di kunci "analytic".
+    """
+    inputs = _random_inputs(model.rulebase, samples, seed, VALIDATION_EDGE_MARGIN)
+    approx = model.values(*inputs)
+
+    reference = fuzzy_logic.calculate_stress_batch(*inputs, rulebase=model.rulebase, defuzzify="sampled")
+    analytic = fuzzy_logic.calculate_stress_batch(*inputs, rulebase=model.rulebase, defuzzify="analytic")
+    return dict(
+        samples=samples,
+        **_error_stats(approx, *reference),
+        analytic=_error_stats(approx, *analytic),
+    )
+
+
+def fit(rulebase=None, samples=config.SUGENO_SAMPLES, seed=0):
+    """Fit konstanta per aturan (least squares) terhadap Mamdani analytic."""
+    rulebase = rulebase or fuzzy_logic.active_rulebase()
+    inputs = _random_inputs(rulebase, samples, seed)
+    target, _ = fuzzy_logic.calculate_stress_batch(*inputs, rulebase=rulebase, defuzzify="analytic")
+
+    weights = rule_weights(rulebase, inputs)
+    total = weights.sum(axis=1, keepdims=True)
+    covered = total[:, 0] > 0
+    normalized = weights[covered] / total[covered]
+
+    constants, *_ = np.linalg.lstsq(normalized, target[covered], rcond=None)
+
+    # Aturan yang tidak pernah aktif di sampel: pakai puncak term output-nya
+    unused = ~(weights[covered] > 0).any(axis=0)
+    for r in np.flatnonzero(unused):
+        _, b, c, _ = rulebase.stress_trapezoids[rulebase.rule_consequents[r]]
+        constants[r] = (b + c) / 2
+
+    low, high = rulebase.spec["output"]["range"]
+    model = SugenoModel(rulebase, np.clip(constants, low, high))
+    model.report = measure_error(model)
+    model.report["fit_samples"] = samples
+    return model
+
+
+def save_model(model, path=config.SUGENO_PATH):
+    """Menulis konstanta + laporan error secara atomic."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    data = {
+        "source_hash": model.rulebase.source_hash,
+        "constants": model.constants.tolist(),
+        "report": model.report,
+    }
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def load_or_fit(path=config.SUGENO_PATH, rulebase=None, samples=config.SUGENO_SAMPLES):
+    """Memuat model jika hash rule base sama, jika tidak fit ulang lalu simpan."""
+    rulebase = rulebase or fuzzy_logic.active_rulebase()
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        if data["source_hash"] == rulebase.source_hash:
+            return SugenoModel(rulebase, data["constants"], data["report"])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    model = fit(rulebase, samples)
+    save_model(model, path)
+    return model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit zero-order Sugeno surrogate")
+    parser.add_argument("--samples", type=int, default=config.SUGENO_SAMPLES)
+    parser.add_argument("--path", default=config.SUGENO_PATH)
+    args = parser.parse_args()
+
+    model = fit(samples=args.samples)
+    save_model(model, args.path)
+    report = model.report
+
+    print("=" * 70)
+    print(f"Model Sugeno tersimpan di {args.path} ({len(model.constants)} konstanta)")
+    print(f"Error ({report['samples']} titik validasi):")
+    for label, stats in (("vs Mamdani (skfuzzy)", report), ("vs analytic", report["analytic"])):
+        print(f"  {label:<21} RMSE={stats['rmse']:.4f}  max={stats['max']:.4f}  "
+              f"kesamaan kategori={stats['category_agreement']:.2%}")
+    print("=" * 70)
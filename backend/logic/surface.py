@@ -0,0 +1,230 @@
+"""
+Precomputed Stress Surface
+==========================
+Seluruh output Mamdani dihitung sekali pada grid 4-D (screen, temperature,
+humidity, air quality) lalu disimpan sebagai file .npy. Saat server berjalan,
+file dibuka dengan memory-mapping (beberapa worker berbagi satu salinan di
+page cache) dan calculate_stress dijawab dengan interpolasi multilinear.
+
+Sumbu grid = linspace(resolusi) digabung dengan semua titik sudut trapesium
+input, sehingga patahan fungsi keanggotaan selalu jatuh tepat di titik grid.
+Error terbesar tetap muncul di sekitar titik di mana operator min berpindah
+antar input (tidak sejajar sumbu), jadi error maksimum selalu dilaporkan.
+
+Usage:
+    python -m logic.surface                 # build dengan resolusi dari config
+    python -m logic.surface --resolution 41
+"""
+
+import argparse
+import bisect
+import json
+import os
+
+import numpy as np
+
+import config
+from logic import fuzzy_logic
+
+# Jumlah titik acak untuk mengukur error surface terhadap engine Mamdani
+ERROR_SAMPLES = 50000
+# Titik acak diambil dari range yang diperlebar 10% per sisi lalu di-clamp
+# (seperti calculate_stress), sehingga batas range (mis. humidity = 90)
+# ikut terukur
+ERROR_EDGE_MARGIN = 0.1
+
+
+def _metadata_path(path):
+    return os.path.splitext(path)[0] + ".json"
+
+
+def surface_axes(resolution, rulebase=None):
+    """Sumbu grid per input: linspace + titik sudut trapesium (terurut, unik)."""
+    rulebase = rulebase or fuzzy_logic.active_rulebase()
+    axes = []
+    for (low, high), trapezoids in zip(rulebase.input_ranges, rulebase.input_trapezoids):
+        corners = [p for params in trapezoids for p in params if low <= p <= high]
+        axes.append(np.union1d(np.linspace(low, high, resolution), corners).tolist())
+    return axes
+
+
+class StressSurface:
+    """Grid 4-D skor stres dengan interpolasi multilinear."""
+
+    def __init__(self, grid, axes, error=None, source_hash=None):
+        # np.asarray membuat view ndarray biasa di atas buffer memmap yang sama
+        # (slicing subclass memmap jauh lebih lambat untuk lookup skalar).
+        self.grid = np.asarray(grid)
+        self.axes = [[float(x) for x in axis] for axis in axes]
+        self.error = error or {}
+        self.source_hash = source_hash
+        self._arrays = [np.asarray(axis) for axis in self.axes]
+
+    @property
+    def max_error(self):
+        return self.error.get("max")
+
+    def _locate(self, x, axis):
+        """Index sel kiri dan fraksi posisi x di dalam sel (input di-clamp)."""
+        points = self.axes[axis]
+        x = min(max(x, points[0]), points[-1])
+        i = min(bisect.bisect_right(points, x) - 1, len(points) - 2)
+        return i, (x - points[i]) / (points[i + 1] - points[i])
+
+    def value(self, screentime, temperature, humidity, air_quality):
+        """Skor stres untuk satu input (interpolasi 16 titik sudut sel)."""
+        (i0, f0), (i1, f1), (i2, f2), (i3, f3) = (
+            self._locate(float(x), axis)
+            for axis, x in enumerate((screentime, temperature, humidity, air_quality))
+        )
+        cube = self.grid[i0:i0 + 2, i1:i1 + 2, i2:i2 + 2, i3:i3 + 2].tolist()
+
+        # Reduksi satu dimensi per langkah: (2,2,2,2) -> (2,2,2) -> ... -> skalar
+        for f in (f0, f1, f2):
+            a, b = cube
+            cube = _lerp_nested(a, b, f)
+        a, b = cube
+        return a + (b - a) * f3
+
+    def values(self, screentime, temperature, humidity, air_quality):
+        """Versi array dari value() untuk banyak input sekaligus."""
+        arrays = np.broadcast_arrays(
+            *(np.asarray(x, dtype=float) for x in (screentime, temperature, humidity, air_quality))
+        )
+        shape = arrays[0].shape
+
+        idx, frac = [], []
+        for x, points in zip(arrays, self._arrays):
+            x = np.clip(x.ravel(), points[0], points[-1])
+            i = np.clip(np.searchsorted(points, x, side="right") - 1, 0, len(points) - 2)
+            idx.append(i)
+            frac.append((x - points[i]) / (points[i + 1] - points[i]))
+
+        result = np.zeros(idx[0].shape[0])
+        for corner in np.ndindex(2, 2, 2, 2):
+            weight = np.ones_like(result)
+            for axis, bit in enumerate(corner):
+                weight *= frac[axis] if bit else 1.0 - frac[axis]
+            result += weight * self.grid[tuple(i + bit for i, bit in zip(idx, corner))]
+
+        return result.reshape(shape)
+
+
+def _lerp_nested(a, b, f):
+    """Interpolasi linear elemen demi elemen untuk nested list yang sama bentuknya."""
+    if isinstance(a, list):
+        return [_lerp_nested(x, y, f) for x, y in zip(a, b)]
+    return a + (b - a) * f
+
+
+def _error_stats(approx, exact, exact_codes):
+    diff = np.abs(exact - approx)
+    return {
+        "max": float(diff.max()),
+        "p99": float(np.percentile(diff, 99)),
+        "mean": float(diff.mean()),
+        "category_flip_rate": float(np.mean(
+            np.digitize(approx, fuzzy_logic.CATEGORY_THRESHOLDS) != exact_codes
+        )),
+    }
+
+
+def measure_error(surface, samples=ERROR_SAMPLES, seed=0, rulebase=None):
+    """
+    Error surface pada titik acak: max, p99, mean, dan jumlah titik yang
+    kategorinya berubah. Acuan utama adalah referensi Mamdani skfuzzy
+    (batch defuzzify="sampled"); error terhadap engine analytic yang dipakai
+    membangun grid dilaporkan di kunci "analytic" (berbeda di humidity = 90).
+    """
+    rng = np.random.default_rng(seed)
+    points = []
+    for axis in surface.axes:
+        margin = (axis[-1] - axis[0]) * ERROR_EDGE_MARGIN
+        points.append(np.clip(rng.uniform(axis[0] - margin, axis[-1] + margin, samples), axis[0], axis[-1]))
+    approx = surface.values(*points)
+
+    reference = fuzzy_logic.calculate_stress_batch(*points, rulebase=rulebase, defuzzify="sampled")
+    analytic = fuzzy_logic.calculate_stress_batch(*points, rulebase=rulebase, defuzzify="analytic")
+    return dict(
+        samples=samples,
+        **_error_stats(approx, *reference),
+        analytic=_error_stats(approx, *analytic),
+    )
+
+
+def build_surface(resolution=config.SURFACE_RESOLUTION, path=config.SURFACE_PATH, rulebase=None):
+    """Menghitung grid Mamdani lalu menyimpannya ke .npy (+ metadata .json)."""
+    rulebase = rulebase or fuzzy_logic.active_rulebase()
+    axes = surface_axes(resolution, rulebase)
+    mesh = np.meshgrid(*axes, indexing="ij")
+    grid, _ = fuzzy_logic.calculate_stress_batch(*mesh, rulebase=rulebase, defuzzify="analytic")
+
+    surface = StressSurface(grid, axes, source_hash=rulebase.source_hash)
+    surface.error = measure_error(surface, rulebase=rulebase)
+
+    # Tulis ke file sementara lalu rename, agar worker lain tidak pernah
+    # membaca file yang setengah jadi.
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Nama sementara per proses: worker yang membangun bersamaan tidak
+    # saling menimpa file sementara yang sama.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, grid)
+    os.replace(tmp_path, path)
+
+    metadata = {
+        "resolution": resolution,
+        "axes": surface.axes,
+        "error": surface.error,
+        "source_hash": surface.source_hash,
+    }
+    tmp_path = f"{_metadata_path(path)}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(metadata, f)
+    os.replace(tmp_path, _metadata_path(path))
+
+    return surface
+
+
+def load_surface(path=config.SURFACE_PATH):
+    """Membuka surface dari .npy dengan memory-mapping (read-only)."""
+    grid = np.load(path, mmap_mode="r")
+
+    with open(_metadata_path(path)) as f:
+        metadata = json.load(f)
+
+    return StressSurface(grid, metadata["axes"], metadata["error"], metadata.get("source_hash"))
+
+
+def load_or_build(resolution=config.SURFACE_RESOLUTION, path=config.SURFACE_PATH, rulebase=None):
+    """
+    Memuat surface jika sudah ada dengan sumbu dan rule base (hash) yang
+    sama, jika tidak build ulang.
+    """
+    rulebase = rulebase or fuzzy_logic.active_rulebase()
+    if os.path.isfile(path) and os.path.isfile(_metadata_path(path)):
+        surface = load_surface(path)
+        if surface.source_hash == rulebase.source_hash and surface.axes == surface_axes(resolution, rulebase):
+            return surface
+
+    build_surface(resolution, path, rulebase)
+    return load_surface(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build precomputed stress surface")
+    parser.add_argument("--resolution", type=int, default=config.SURFACE_RESOLUTION)
+    parser.add_argument("--path", default=config.SURFACE_PATH)
+    args = parser.parse_args()
+
+    surface = build_surface(args.resolution, args.path)
+    shape = " x ".join(str(n) for n in surface.grid.shape)
+    error = surface.error
+
+    print("=" * 70)
+    print(f"Surface tersimpan di {args.path} ({shape} titik, {surface.grid.nbytes / 1e6:.1f} MB)")
+    print(f"Error ({error['samples']} titik acak):")
+    for label, stats in (("vs Mamdani (skfuzzy)", error), ("vs analytic", error["analytic"])):
+        print(f"  {label:<21} max={stats['max']:.4f}  p99={stats['p99']:.4f}  mean={stats['mean']:.4f}  "
+              f"category flip rate={stats['category_flip_rate']:.2%}")
+    print("=" * 70)
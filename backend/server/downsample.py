@@ -0,0 +1,78 @@
+"""
+Downsampling Time-Series
+========================
+Memilih sebagian titik dari series panjang agar grafik tetap mirip
+bentuk aslinya:
+  - lttb   : Largest-Triangle-Three-Buckets, satu titik per bucket yang
+             membentuk segitiga terbesar dengan titik terpilih sebelumnya
+             dan rata-rata bucket berikutnya.
+  - minmax : titik minimum dan maksimum setiap bucket (puncak tidak hilang).
+Kedua fungsi mengembalikan index titik terpilih (urut), titik pertama dan
+terakhir selalu ikut.
+"""
+
+import numpy as np
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+# Jumlah titik minimum per metode (titik pertama + terakhir + min. 1 bucket)
+MIN_POINTS = {"lttb": 3, "minmax": 4}
+
+
+def _check_points(points, method):
+    if points < MIN_POINTS[method]:
+        raise ValueError(f"points must be at least {MIN_POINTS[method]} for {method}")
+
+
+def lttb(x, y, points):
+    """Index hasil LTTB untuk maksimal points titik."""
+    _check_points(points, "lttb")
+    n = len(x)
+    if points >= n:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # points - 2 bucket di antara titik pertama dan terakhir
+    edges = np.linspace(1, n - 1, points - 1).astype(int)
+    edges = np.append(edges, n)
+
+    selected = np.empty(points, dtype=np.intp)
+    selected[0] = a = 0
+    for i in range(points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = edges[i + 1], edges[i + 2]
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        selected[i + 1] = a
+
+    selected[-1] = n - 1
+    return selected
+
+
+def minmax(x, y, points):
+    """Index titik min & max per bucket ((points - 2) // 2 bucket + titik ujung)."""
+    _check_points(points, "minmax")
+    n = len(x)
+    if points >= n:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(0, n, (points - 2) // 2 + 1).astype(int)
+    selected = {0, n - 1}
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi > lo:
+            selected.add(lo + int(y[lo:hi].argmin()))
+            selected.add(lo + int(y[lo:hi].argmax()))
+    return np.array(sorted(selected), dtype=np.intp)
+
+
+def downsample(x, y, points, method="lttb"):
+    if method == "lttb":
+        return lttb(x, y, points)
+    if method == "minmax":
+        return minmax(x, y, points)
+    raise ValueError(f"Unknown downsample method: {method!r} (pilih dari {DOWNSAMPLE_METHODS})")
@@ -0,0 +1,97 @@
+"""
+Server-Sent Events
+==================
+Push state dashboard ke browser hanya saat state berubah.
+
+Handler ingest cukup memanggil publish(): versi state dinaikkan dan
+subscriber dibangunkan (tanpa membangun payload). Setiap subscriber
+menunggu versi berubah, menunggu sebentar (coalesce) agar burst update
+digabung jadi satu event, lalu mengirim payload terbaru. Payload dibangun
+dan diserialisasi sekali per versi lalu dibagi ke semua viewer. Saat tidak
+ada perubahan, komentar keepalive dikirim agar koneksi tidak diputus proxy.
+
+Versi yang sama dipakai sebagai ETag (conditional GET) dan untuk long-poll
+?since=<versi> di /api/dashboard_data. ETag memuat id proses agar versi
+dari proses server sebelumnya tidak dianggap sama setelah restart.
+"""
+
+import json
+import os
+import threading
+import time
+
+
+class EventStream:
+    """Versi state + payload ter-cache + generator SSE per viewer."""
+
+    def __init__(self, build_payload, keepalive=15.0, coalesce=0.25, max_clients=100):
+        self.build_payload = build_payload
+        self.keepalive = keepalive
+        self.coalesce = coalesce
+        self.max_clients = max_clients
+
+        self.version = 0
+        self.clients = 0
+        self._instance = f"{os.getpid():x}-{int(time.time()):x}"
+        self._cond = threading.Condition()
+        self._cached = (None, None)   # (versi, body JSON)
+        self._build_lock = threading.Lock()
+
+    def publish(self):
+        """Menandai state berubah (dipanggil dari handler ingest)."""
+        with self._cond:
+            self.version += 1
+            self._cond.notify_all()
+
+    def wait(self, since, timeout):
+        """Menunggu versi != since paling lama timeout detik; mengembalikan versi saat ini."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.version != since, timeout)
+            return self.version
+
+    def payload(self):
+        """(versi, body JSON) terbaru; dibangun sekali per versi."""
+        version, body = self._cached
+        if version == self.version:
+            return version, body
+
+        with self._build_lock:
+            version = self.version
+            if self._cached[0] != version:
+                self._cached = (version, json.dumps(self.build_payload()))
+            return self._cached
+
+    def etag(self, version):
+        return f"{self._instance}-{version}"
+
+    def connect(self):
+        """Mendaftarkan viewer (SSE/long-poll); False jika sudah mencapai max_clients."""
+        with self._cond:
+            if self.clients >= self.max_clients:
+                return False
+            self.clients += 1
+            return True
+
+    def disconnect(self):
+        with self._cond:
+            self.clients -= 1
+
+    def stream(self):
+        """Generator SSE untuk satu viewer.
+
+        Slot dari connect() tidak dilepas di sini: generator bisa saja tidak
+        pernah dijalankan, jadi pemanggil melepasnya saat response ditutup.
+        """
+        version, body = self.payload()
+        yield f"retry: 3000\nid: {version}\nevent: dashboard\ndata: {body}\n\n"
+
+        while True:
+            current = self.wait(version, self.keepalive)
+            if current == version:
+                yield ": keepalive\n\n"
+                continue
+
+            # Gabungkan burst update menjadi satu event
+            time.sleep(self.coalesce)
+            version, body = self.payload()
+            yield f"id: {version}\nevent: dashboard\ndata: {body}\n\n"
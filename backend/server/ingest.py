@@ -0,0 +1,114 @@
+"""
+Antrean Ingest Asinkron
+=======================
+Upload HP divalidasi lalu dimasukkan ke antrean; request langsung dibalas
+dengan ingest id, dan scoring + penyimpanan dijalankan oleh worker.
+
+  - Setiap worker punya antrean sendiri (bounded). Upload dibagi ke worker
+    menurut hash device_id, jadi upload satu device tetap diproses urut.
+  - Antrean penuh -> submit() melempar QueueFull (HTTP 429 + Retry-After);
+    antrean sudah ditutup -> IngestClosed (HTTP 503).
+  - Status/hasil setiap ingest disimpan dalam LRU berkapasitas terbatas
+    dan bisa dilihat lewat result(ingest_id).
+"""
+
+import atexit
+import queue
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+
+QueueFull = queue.Full
+
+
+class IngestClosed(Exception):
+    """Antrean ingest sudah ditutup (server sedang berhenti)."""
+
+
+class IngestQueue:
+    """Antrean bounded per worker + penyimpanan hasil per ingest id."""
+
+    def __init__(self, process, workers=2, max_depth=1000, max_results=10000):
+        self.process = process            # fungsi(payload) -> dict hasil
+        self.max_results = max_results
+        self._queues = [queue.Queue(maxsize=max(1, max_depth // workers)) for _ in range(workers)]
+        self._results = OrderedDict()     # ingest_id -> status
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {"accepted": 0, "rejected": 0, "done": 0, "errors": 0}
+
+        self._threads = [
+            threading.Thread(target=self._run, args=(q,), name=f"ingest-worker-{i}", daemon=True)
+            for i, q in enumerate(self._queues)
+        ]
+        for thread in self._threads:
+            thread.start()
+        atexit.register(self.close)
+
+    def depth(self):
+        return sum(q.qsize() for q in self._queues)
+
+    def _store(self, ingest_id, status):
+        """Menyimpan status (lock sudah dipegang), membuang yang paling lama jika penuh."""
+        self._results[ingest_id] = status
+        self._results.move_to_end(ingest_id)
+        while len(self._results) > self.max_results:
+            self._results.popitem(last=False)
+
+    def submit(self, key, payload):
+        """Memasukkan payload ke antrean worker untuk key; mengembalikan ingest id."""
+        if self._closed:
+            raise IngestClosed()
+
+        ingest_id = uuid.uuid4().hex
+        target = self._queues[zlib.crc32(str(key).encode()) % len(self._queues)]
+        with self._lock:
+            self._store(ingest_id, {"status": "queued", "received_at": time.time()})
+        try:
+            target.put_nowait((ingest_id, payload))
+        except queue.Full:
+            with self._lock:
+                self._results.pop(ingest_id, None)
+                self.stats["rejected"] += 1
+            raise
+        with self._lock:
+            self.stats["accepted"] += 1
+        return ingest_id
+
+    def result(self, ingest_id):
+        """Status ingest (queued/done/error + hasil), atau None jika tidak dikenal."""
+        with self._lock:
+            status = self._results.get(ingest_id)
+            return None if status is None else dict(status)
+
+    def close(self, timeout=5.0):
+        """Berhenti menerima upload dan tunggu antrean yang tersisa diproses."""
+        if self._closed:
+            return
+        self._closed = True
+        for q in self._queues:
+            q.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _run(self, q):
+        while True:
+            item = q.get()
+            if item is None:
+                return
+            ingest_id, payload = item
+            try:
+                update = {"status": "done", "result": self.process(payload)}
+                counter = "done"
+            except Exception as e:
+                print(f"[INGEST ERROR] {ingest_id}: {e}")
+                update = {"status": "error", "error": str(e)}
+                counter = "errors"
+
+            with self._lock:
+                status = self._results.get(ingest_id, {})
+                status.update(update, completed_at=time.time())
+                self._store(ingest_id, status)
+                self.stats[counter] += 1
@@ -0,0 +1,103 @@
+"""
+Device Registry
+===============
+State terakhir setiap device HP (skor stres, input, waktu upload) untuk
+dashboard dan rescoring. Disimpan dalam OrderedDict yang diurutkan menurut
+waktu aktif terakhir (last_seen), sehingga:
+  - device paling baru aktif = ujung kanan, O(1),
+  - device aktif dalam N detik terakhir = iterasi dari ujung kanan sampai
+    ketemu device yang lebih lama,
+  - device idle (TTL) / kelebihan kapasitas (LRU) dibuang dari ujung kiri.
+Semua operasi memegang satu lock.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class DeviceRegistry:
+    """Registry device thread-safe dengan latest O(1) dan eviksi TTL/LRU."""
+
+    def __init__(self, ttl=None, max_devices=None):
+        self.ttl = ttl                    # detik, None = tanpa kedaluwarsa
+        self.max_devices = max_devices    # None = tanpa batas
+        self._devices = OrderedDict()     # device_id -> (last_seen, entry)
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._devices)
+
+    def _evict(self, now):
+        """Buang device idle dari ujung kiri (lock sudah dipegang)."""
+        if self.ttl is not None:
+            while self._devices:
+                device_id, (last_seen, _) = next(iter(self._devices.items()))
+                if now - last_seen <= self.ttl:
+                    break
+                del self._devices[device_id]
+                self.evictions += 1
+        if self.max_devices is not None:
+            while len(self._devices) > self.max_devices:
+                self._devices.popitem(last=False)
+                self.evictions += 1
+
+    def put(self, device_id, entry, now=None):
+        """Menyimpan state device dan menandainya sebagai yang paling baru aktif."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._devices[device_id] = (now, entry)
+            self._devices.move_to_end(device_id)
+            self._evict(now)
+
+    def get(self, device_id):
+        with self._lock:
+            item = self._devices.get(device_id)
+        return None if item is None else item[1]
+
+    def last_seen(self, device_id):
+        with self._lock:
+            item = self._devices.get(device_id)
+        return None if item is None else item[0]
+
+    def latest(self, now=None):
+        """(device_id, entry) device yang paling baru aktif, atau None."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._evict(now)
+            if not self._devices:
+                return None
+            device_id, (_, entry) = next(reversed(self._devices.items()))
+            return device_id, entry
+
+    def active(self, window, now=None):
+        """{device_id: entry} untuk device yang aktif dalam window detik terakhir."""
+        now = time.time() if now is None else now
+        result = {}
+        with self._lock:
+            self._evict(now)
+            for device_id, (last_seen, entry) in reversed(self._devices.items()):
+                if now - last_seen > window:
+                    break
+                result[device_id] = entry
+        return result
+
+    def replace_many(self, updates, expected):
+        """
+        Mengganti entry beberapa device sekaligus tanpa mengubah urutan aktif.
+        Device yang entry-nya bukan lagi expected[device_id] (mis. upload baru
+        selama update dihitung) dilewati. Mengembalikan jumlah yang diganti.
+        """
+        replaced = 0
+        with self._lock:
+            for device_id, entry in updates.items():
+                item = self._devices.get(device_id)
+                if item is not None and item[1] is expected.get(device_id):
+                    self._devices[device_id] = (item[0], entry)
+                    replaced += 1
+        return replaced
+
+    def stats(self):
+        with self._lock:
+            return {"devices": len(self._devices), "evictions": self.evictions}
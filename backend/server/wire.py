@@ -0,0 +1,112 @@
+"""
+Wire Format Ingest
+==================
+Decode body request /receive_usage dan /receive_sensor berdasarkan header:
+  - Content-Encoding: gzip  -> didekompresi (dibatasi max_size byte)
+  - Content-Type:
+      application/msgpack, application/x-msgpack -> MessagePack (paket msgpack)
+      application/cbor                           -> CBOR (paket cbor2)
+      lainnya                                    -> JSON (orjson jika terpasang)
+msgpack, cbor2 dan orjson opsional; format yang paketnya tidak terpasang
+ditolak dengan UnsupportedFormat (HTTP 415).
+
+usage_data boleh dikirim dalam bentuk kolom agar key tidak diulang per
+aplikasi: {"app_name": [...], "foreground_time_s": [...]} (lihat expand_usage).
+"""
+
+import json
+import zlib
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+CBOR_TYPES = ("application/cbor",)
+
+
+class UnsupportedFormat(ValueError):
+    """Content-Type/Content-Encoding tidak didukung di server ini."""
+
+
+def available_formats():
+    """Format body yang bisa di-decode (untuk log/endpoint debug)."""
+    formats = ["json" + ("+orjson" if orjson else "")]
+    if msgpack:
+        formats.append("msgpack")
+    if cbor2:
+        formats.append("cbor")
+    return formats
+
+
+def json_loads(data):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def json_dumps(obj):
+    """JSON ke bytes (orjson jika terpasang)."""
+    return orjson.dumps(obj) if orjson else json.dumps(obj).encode()
+
+
+def decompress(body, encoding, max_size):
+    """Dekompresi body sesuai Content-Encoding; hasil lebih dari max_size ditolak."""
+    encoding = (encoding or "identity").strip().lower()
+    if encoding == "identity":
+        return body
+    if encoding not in ("gzip", "x-gzip", "deflate"):
+        raise UnsupportedFormat(f"Unsupported Content-Encoding: {encoding}")
+
+    # wbits 31 = gzip, 15 = zlib (deflate)
+    decoder = zlib.decompressobj(31 if "gzip" in encoding else 15)
+    try:
+        data = decoder.decompress(body, max_size)
+    except zlib.error as e:
+        raise ValueError(f"Invalid {encoding} body: {e}")
+    if decoder.unconsumed_tail:
+        raise ValueError(f"Decompressed body exceeds {max_size} bytes")
+    if not decoder.eof:
+        raise ValueError(f"Truncated {encoding} body")
+    return data
+
+
+def decode_body(body, content_type=None, content_encoding=None, max_size=16 * 1024 * 1024):
+    """Bytes body request -> objek Python sesuai Content-Encoding/Content-Type."""
+    data = decompress(body, content_encoding, max_size)
+    content_type = (content_type or "").split(";")[0].strip().lower()
+
+    try:
+        if content_type in MSGPACK_TYPES:
+            if msgpack is None:
+                raise UnsupportedFormat("MessagePack is not available (pip install msgpack)")
+            return msgpack.unpackb(data, raw=False)
+        if content_type in CBOR_TYPES:
+            if cbor2 is None:
+                raise UnsupportedFormat("CBOR is not available (pip install cbor2)")
+            return cbor2.loads(data)
+        return json_loads(data)
+    except UnsupportedFormat:
+        raise
+    except Exception as e:
+        raise ValueError(f"Invalid request body: {e}")
+
+
+def expand_usage(usage):
+    """usage_data bentuk kolom {"app_name": [...], ...} -> list objek per aplikasi."""
+    if not isinstance(usage, dict):
+        return usage
+    columns = list(usage)
+    values = [usage[name] for name in columns]
+    if not all(isinstance(v, list) for v in values) or len({len(v) for v in values}) > 1:
+        raise ValueError("usage_data columns must be lists of equal length")
+    return [dict(zip(columns, row)) for row in zip(*values)]
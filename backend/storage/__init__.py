@@ -0,0 +1,37 @@
+"""
+Storage Layer
+=============
+Backend penyimpanan data upload HP & sensor, dipilih lewat
+config.STORAGE_BACKEND:
+  - "csv"    : file CSV per device (storage/csv_store.py)
+  - "sqlite" : database SQLite mode WAL (storage/sqlite_store.py)
+
+Semua backend menyediakan record_usage(), record_sensor(), flush(),
+close() dan stats; penulisan dilakukan di thread background.
+"""
+
+import os
+
+import config
+
+STORAGE_BACKENDS = ("csv", "sqlite")
+
+
+def create_storage(backend=None, folder=None):
+    """Membuat backend storage sesuai nama (default: config.STORAGE_BACKEND)."""
+    backend = backend or config.STORAGE_BACKEND
+    folder = folder or config.DATA_FOLDER
+    writer_options = {
+        "queue_size": config.WRITER_QUEUE_SIZE,
+        "flush_rows": config.WRITER_FLUSH_ROWS,
+        "flush_interval": config.WRITER_FLUSH_INTERVAL,
+    }
+
+    if backend == "csv":
+        from storage.csv_store import CsvStorage
+        return CsvStorage(folder, max_open_files=config.CSV_MAX_OPEN_FILES, **writer_options)
+    if backend == "sqlite":
+        from storage.sqlite_store import SqliteStorage
+        return SqliteStorage(os.path.join(folder, config.SQLITE_FILENAME), **writer_options)
+
+    raise ValueError(f"Unknown storage backend: {backend!r} (pilih dari {STORAGE_BACKENDS})")
@@ -0,0 +1,270 @@
+"""
+Store App Usage Terkompresi Kamus
+=================================
+detail_{device_id}.csv mengulang nama paket dan timestamp lengkap di setiap
+baris. Store ini menyimpan per device (folder {folder}/{device_id}/):
+  - apps.txt    : kamus nama aplikasi, satu per baris (app_id = nomor baris)
+  - uploads.bin : timestamp (epoch) per upload (upload_id = index)
+  - usage.bin   : record (upload_id, app_id, seconds) berukuran tetap
+
+Semua file append-only dan ditulis urut upload, jadi agregasi per aplikasi
+atau per jendela waktu cukup binary search + np.bincount di atas memmap.
+
+Usage:
+    python -m storage.app_usage          # konversi detail_*.csv + bandingkan ukuran/kecepatan dengan CSV
+"""
+
+import argparse
+import csv
+import glob
+import os
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+
+import config
+from storage.timeseries import to_epoch
+from storage.writer import BatchWriter
+
+UPLOAD_DTYPE = np.dtype([("timestamp", "<f8")])
+USAGE_DTYPE = np.dtype([("upload_id", "<u4"), ("app_id", "<u4"), ("seconds", "<u4")])
+
+APPS_FILE = "apps.txt"
+UPLOADS_FILE = "uploads.bin"
+USAGE_FILE = "usage.bin"
+
+
+def _read_apps(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read().splitlines()
+    except OSError:
+        return []
+
+
+def _memmap(path, dtype):
+    """Memmap read-only untuk record utuh di file (array kosong jika belum ada)."""
+    try:
+        count = os.path.getsize(path) // dtype.itemsize
+    except OSError:
+        count = 0
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+
+class AppUsageWriter(BatchWriter):
+    """Meng-intern nama aplikasi lalu menulis upload + record usage per device."""
+
+    name = "app-usage-writer"
+
+    def __init__(self, folder, **options):
+        self.folder = folder
+        self._apps = {}      # device_id -> {app_name: app_id}
+        self._uploads = {}   # device_id -> jumlah upload tersimpan
+        super().__init__(**options)
+
+    def _device_state(self, device_id):
+        if device_id not in self._apps:
+            device_folder = os.path.join(self.folder, device_id)
+            os.makedirs(device_folder, exist_ok=True)
+            names = _read_apps(os.path.join(device_folder, APPS_FILE))
+            self._apps[device_id] = {name: i for i, name in enumerate(names)}
+            self._uploads[device_id] = len(_memmap(os.path.join(device_folder, UPLOADS_FILE), UPLOAD_DTYPE))
+        return self._apps[device_id]
+
+    def _write(self, pending):
+        failed = 0
+        for device_id, (_, uploads) in pending.items():
+            try:
+                failed += self._write_device(device_id, uploads)
+            except Exception as e:
+                # Satu device gagal tidak boleh membuang device lain di batch ini
+                failed += len(uploads)
+                print(f"[APP USAGE] Gagal menulis {device_id}: {e!r}")
+                # Muat ulang state dari disk pada penulisan berikutnya
+                self._apps.pop(device_id, None)
+        return failed
+
+    def _write_device(self, device_id, uploads):
+        apps = self._device_state(device_id)
+        device_folder = os.path.join(self.folder, device_id)
+        new_names = []
+        upload_id = self._uploads[device_id]
+        timestamps = []
+        records = []
+
+        failed = 0
+        for timestamp, usage in uploads:
+            # Konversi dulu sebelum nama aplikasi diberi id: upload yang
+            # tidak valid dilewati tanpa menggeser id aplikasi berikutnya.
+            try:
+                epoch = to_epoch(timestamp)
+                usage = [
+                    (str(app_name).replace("\n", " "), max(0, int(round(float(seconds)))))
+                    for app_name, seconds in usage
+                ]
+            except (TypeError, ValueError, OverflowError) as e:
+                failed += 1
+                print(f"[APP USAGE] Upload {device_id} dilewati: {e}")
+                continue
+
+            for app_name, seconds in usage:
+                app_id = apps.get(app_name)
+                if app_id is None:
+                    app_id = apps[app_name] = len(apps)
+                    new_names.append(app_name)
+                records.append((upload_id, app_id, seconds))
+            timestamps.append((epoch,))
+            upload_id += 1
+
+        # Urutan: kamus -> usage -> uploads, agar pembaca tidak pernah melihat
+        # upload yang record/nama aplikasinya belum tertulis
+        if new_names:
+            with open(os.path.join(device_folder, APPS_FILE), "a", encoding="utf-8") as f:
+                f.write("".join(name + "\n" for name in new_names))
+        with open(os.path.join(device_folder, USAGE_FILE), "ab") as f:
+            np.array(records, dtype=USAGE_DTYPE).tofile(f)
+        with open(os.path.join(device_folder, UPLOADS_FILE), "ab") as f:
+            np.array(timestamps, dtype=UPLOAD_DTYPE).tofile(f)
+
+        self._uploads[device_id] = upload_id
+        return failed
+
+
+class AppUsageStore:
+    """Append lewat writer background; agregasi lewat memmap."""
+
+    def __init__(self, folder, **writer_options):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+        self.writer = AppUsageWriter(folder, **writer_options)
+        self._apps_cache = {}   # device_id -> (ukuran apps.txt, daftar nama)
+        self._lock = threading.Lock()
+
+    def append(self, device_id, timestamp, usage):
+        """usage: [(app_name, seconds)] untuk satu upload."""
+        self.writer.append(device_id, None, [(timestamp, list(usage))])
+
+    def flush(self, timeout=None):
+        return self.writer.flush(timeout)
+
+    def close(self):
+        self.writer.close()
+
+    def apps(self, device_id):
+        """Kamus app_id -> nama aplikasi."""
+        path = os.path.join(self.folder, device_id, APPS_FILE)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return []
+        with self._lock:
+            cached = self._apps_cache.get(device_id)
+            if cached is None or cached[0] != size:
+                cached = self._apps_cache[device_id] = (size, _read_apps(path))
+            return cached[1]
+
+    def _usage(self, device_id, start=None, end=None):
+        """(timestamps upload, record usage) untuk upload dalam [start, end]."""
+        device_folder = os.path.join(self.folder, device_id)
+        uploads = _memmap(os.path.join(device_folder, UPLOADS_FILE), UPLOAD_DTYPE)["timestamp"]
+        usage = _memmap(os.path.join(device_folder, USAGE_FILE), USAGE_DTYPE)
+
+        lo = 0 if start is None else int(np.searchsorted(uploads, to_epoch(start), side="left"))
+        hi = len(uploads) if end is None else int(np.searchsorted(uploads, to_epoch(end), side="right"))
+        ids = usage["upload_id"]
+        first, last = np.searchsorted(ids, [lo, hi], side="left")
+        return uploads, usage[first:last]
+
+    def app_totals(self, device_id, start=None, end=None):
+        """Total detik per aplikasi dalam rentang waktu, urut terbesar."""
+        _, usage = self._usage(device_id, start, end)
+        names = self.apps(device_id)
+        totals = np.bincount(usage["app_id"], weights=usage["seconds"], minlength=len(names))
+        order = np.argsort(totals)[::-1]
+        return {names[i]: int(totals[i]) for i in order if totals[i] > 0}
+
+    def window_totals(self, device_id, window, app_name=None, start=None, end=None):
+        """
+        Total detik per jendela waktu (window detik), opsional hanya satu aplikasi.
+        Mengembalikan [(awal jendela epoch, detik)] untuk jendela yang berisi data.
+        """
+        uploads, usage = self._usage(device_id, start, end)
+        if app_name is not None:
+            names = self.apps(device_id)
+            if app_name not in names:
+                return []
+            usage = usage[usage["app_id"] == names.index(app_name)]
+        if len(usage) == 0:
+            return []
+
+        times = uploads[usage["upload_id"]]
+        buckets = np.floor_divide(times, window).astype(np.int64)
+        keys, inverse = np.unique(buckets, return_inverse=True)
+        totals = np.bincount(inverse, weights=usage["seconds"])
+        return [(float(k * window), int(t)) for k, t in zip(keys, totals)]
+
+
+def convert_csv(csv_path, store, device_id):
+    """Memasukkan detail_{device_id}.csv ke store (baris bertimestamp sama = satu upload)."""
+    uploads = []
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            if not uploads or uploads[-1][0] != row["timestamp"]:
+                uploads.append((row["timestamp"], []))
+            uploads[-1][1].append((row["app_name"], row["duration_sec"]))
+    for timestamp, usage in uploads:
+        store.append(device_id, timestamp, usage)
+    return len(uploads)
+
+
+def _csv_app_totals(csv_path):
+    totals = defaultdict(float)
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            totals[row["app_name"]] += float(row["duration_sec"])
+    return totals
+
+
+def _folder_size(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def _timed(func, repeats=20):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = func()
+    return result, (time.perf_counter() - start) / repeats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Konversi detail_*.csv ke app usage store + perbandingan")
+    parser.add_argument("--folder", default=config.DATA_FOLDER)
+    parser.add_argument("--output", default=config.APP_USAGE_FOLDER)
+    args = parser.parse_args()
+
+    store = AppUsageStore(args.output)
+    print("=" * 70)
+    print(f"{'device':<20}{'CSV (B)':>10}{'store (B)':>11}{'rasio':>7}{'CSV ms':>9}{'store ms':>10}")
+    for csv_path in sorted(glob.glob(os.path.join(args.folder, "detail_*.csv"))):
+        device_id = os.path.basename(csv_path)[len("detail_"):-len(".csv")]
+        if os.path.isdir(os.path.join(args.output, device_id)):
+            print(f"{device_id:<20} sudah ada di {args.output}, konversi dilewati")
+        else:
+            convert_csv(csv_path, store, device_id)
+            store.flush()
+
+        csv_totals, csv_time = _timed(lambda: _csv_app_totals(csv_path))
+        store_totals, store_time = _timed(lambda: store.app_totals(device_id))
+        if {k: int(v) for k, v in csv_totals.items() if v > 0} != store_totals:
+            print(f"  ⚠️ total per aplikasi {device_id} berbeda dengan CSV")
+
+        csv_size = os.path.getsize(csv_path)
+        store_size = _folder_size(os.path.join(args.output, device_id))
+        print(f"{device_id[:19]:<20}{csv_size:>10,}{store_size:>11,}{csv_size / store_size:>6.1f}x"
+              f"{csv_time * 1000:>9.2f}{store_time * 1000:>10.3f}")
+    store.close()
+    print("=" * 70)
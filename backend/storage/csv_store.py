@@ -0,0 +1,50 @@
+"""
+Storage CSV
+===========
+Format lama: satu file CSV per device di folder data.
+  - dataset_{device_id}.csv : ringkasan per upload (skor stres)
+  - detail_{device_id}.csv  : durasi per aplikasi
+Data sensor ruangan tidak disimpan pada backend ini.
+"""
+
+import os
+
+from storage.csv_writer import CsvWriter
+
+READING_HEADER = ["timestamp", "temp", "humid", "aq", "screen_hours", "stress_val", "category"]
+DETAIL_HEADER = ["timestamp", "app_name", "duration_sec"]
+
+
+class CsvStorage:
+    """Menulis readings & detail aplikasi ke CSV per device (lewat CsvWriter)."""
+
+    def __init__(self, folder, **writer_options):
+        self.folder = folder
+        self.writer = CsvWriter(**writer_options)
+
+    @property
+    def stats(self):
+        return self.writer.stats
+
+    def record_usage(self, device_id, timestamp, reading, usage):
+        """reading: dict kolom READING_HEADER (tanpa timestamp); usage: [(app_name, duration_sec)]."""
+        self.writer.append(
+            os.path.join(self.folder, f"dataset_{device_id}.csv"),
+            READING_HEADER,
+            [[timestamp] + [reading[name] for name in READING_HEADER[1:]]]
+        )
+        if usage:
+            self.writer.append(
+                os.path.join(self.folder, f"detail_{device_id}.csv"),
+                DETAIL_HEADER,
+                [[timestamp, app_name, duration] for app_name, duration in usage]
+            )
+
+    def record_sensor(self, sensor_id, timestamp, temp, humid, aq):
+        pass
+
+    def flush(self, timeout=None):
+        return self.writer.flush(timeout)
+
+    def close(self):
+        self.writer.close()
@@ -0,0 +1,66 @@
+"""
+Background CSV Writer (Group Commit)
+====================================
+BatchWriter (storage/writer.py) untuk file CSV append-only: baris
+dikumpulkan per file lalu ditulis sekaligus. File handle dibiarkan terbuka
+dalam LRU berkapasitas terbatas sehingga tidak ada open/close per request.
+Header ditulis saat file yang masih kosong pertama kali dibuka.
+"""
+
+import csv
+from collections import OrderedDict
+
+from storage.writer import BatchWriter
+
+
+class CsvWriter(BatchWriter):
+    """Penulis CSV append-only dengan antrean + thread background."""
+
+    name = "csv-writer"
+
+    def __init__(self, queue_size=10000, flush_rows=500, flush_interval=1.0, max_open_files=64):
+        self.max_open_files = max_open_files
+        self._files = OrderedDict()  # path -> (file, csv.writer), urutan LRU
+        super().__init__(queue_size, flush_rows, flush_interval)
+        self.stats["opens"] = 0
+
+    def _open(self, path, header):
+        """Handle file dari LRU, atau buka (dan tulis header jika file baru)."""
+        if path in self._files:
+            self._files.move_to_end(path)
+            return self._files[path][1]
+
+        if len(self._files) >= self.max_open_files:
+            _, (old_file, _) = self._files.popitem(last=False)
+            old_file.close()
+
+        f = open(path, 'a', newline='', encoding='utf-8')
+        writer = csv.writer(f)
+        if f.tell() == 0 and header:
+            writer.writerow(header)
+        self._files[path] = (f, writer)
+        self.stats["opens"] += 1
+        return writer
+
+    def _write(self, pending):
+        failed = 0
+        for path, (header, rows) in pending.items():
+            try:
+                self._open(path, header).writerows(rows)
+                self._files[path][0].flush()
+            except OSError as e:
+                failed += len(rows)
+                print(f"[CSV WRITER] Gagal menulis {path}: {e}")
+                # Buang handle yang rusak; dibuka ulang pada penulisan berikutnya
+                handle = self._files.pop(path, None)
+                if handle:
+                    try:
+                        handle[0].close()
+                    except OSError:
+                        pass
+        return failed
+
+    def _shutdown(self):
+        for f, _ in self._files.values():
+            f.close()
+        self._files.clear()
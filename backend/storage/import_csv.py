@@ -0,0 +1,75 @@
+"""
+Impor CSV ke SQLite
+===================
+Memindahkan data lama dataset_{device_id}.csv dan detail_{device_id}.csv
+dari folder data ke database SQLite (tabel readings & app_usage). Setiap
+file diimpor dalam satu transaksi; file yang device-nya sudah punya baris
+di tabel tujuan dilewati kecuali --force, agar impor aman dijalankan ulang.
+
+Usage:
+    python -m storage.import_csv
+    python -m storage.import_csv --folder data --db data/stress.db --force
+"""
+
+import argparse
+import csv
+import glob
+import os
+
+import config
+from storage.sqlite_store import COLUMNS, connect
+
+# Prefix file CSV -> (tabel, kolom CSV sesuai urutan kolom tabel setelah device_id)
+SOURCES = {
+    "dataset_": ("readings", ["timestamp", "temp", "humid", "aq", "screen_hours", "stress_val", "category"]),
+    "detail_": ("app_usage", ["timestamp", "app_name", "duration_sec"]),
+}
+
+
+def import_file(conn, path, table, fields, force=False):
+    """Mengimpor satu CSV; mengembalikan jumlah baris (None jika dilewati)."""
+    prefix = os.path.basename(path).split("_", 1)[0] + "_"
+    device_id = os.path.basename(path)[len(prefix):-len(".csv")]
+
+    if not force and conn.execute(f"SELECT 1 FROM {table} WHERE device_id = ? LIMIT 1", (device_id,)).fetchone():
+        return None
+
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = [(device_id,) + tuple(row.get(name) for name in fields) for row in csv.DictReader(f)]
+
+    columns = COLUMNS[table]
+    with conn:
+        conn.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            rows
+        )
+    return len(rows)
+
+
+def import_folder(folder, db_path, force=False):
+    """Mengimpor semua CSV di folder; mengembalikan {path: jumlah baris atau None}."""
+    conn = connect(db_path)
+    results = {}
+    try:
+        for prefix, (table, fields) in SOURCES.items():
+            for path in sorted(glob.glob(os.path.join(folder, f"{prefix}*.csv"))):
+                results[path] = import_file(conn, path, table, fields, force)
+    finally:
+        conn.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Impor CSV per device ke database SQLite")
+    parser.add_argument("--folder", default=config.DATA_FOLDER)
+    parser.add_argument("--db", default=os.path.join(config.DATA_FOLDER, config.SQLITE_FILENAME))
+    parser.add_argument("--force", action="store_true", help="impor walau device sudah ada di database")
+    args = parser.parse_args()
+
+    results = import_folder(args.folder, args.db, args.force)
+    print("=" * 60)
+    for path, count in results.items():
+        status = "dilewati (sudah ada)" if count is None else f"{count} baris"
+        print(f"  {os.path.basename(path)}: {status}")
+    print(f"Database: {args.db}")
+    print("=" * 60)
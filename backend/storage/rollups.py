@@ -0,0 +1,240 @@
+"""
+Rollup Per Jam / Per Hari
+=========================
+Ringkasan per device yang diperbarui O(1) setiap upload: untuk setiap
+bucket jam ("YYYY-MM-DDTHH") dan hari ("YYYY-MM-DD", waktu lokal server)
+disimpan jumlah data, total/min/max stres dan setiap input, serta histogram
+5 kategori stres (urutan fuzzy_logic.CATEGORY_LABELS).
+
+Rollup disimpan sebagai JSON per device ({folder}/{device_id}.json).
+Update hanya mengubah memori dan menandai device "dirty"; thread
+background menulis device yang dirty setiap save_interval detik dan saat
+close() (terdaftar di atexit). Setelah menyimpan, device yang idle lebih
+dari ttl detik (atau yang paling lama tidak dipakai jika lebih dari
+max_devices) dilepas dari memori dan dimuat ulang dari disk saat dipakai.
+Bucket jam dibatasi max_hour_buckets terbaru per device.
+
+Usage:
+    python -m storage.rollups            # bangun ulang dari dataset_*.csv di DATA_FOLDER
+"""
+
+import argparse
+import atexit
+import csv
+import glob
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import config
+from logic.fuzzy_logic import CATEGORY_LABELS
+
+PERIODS = {
+    "hour": "%Y-%m-%dT%H",
+    "day": "%Y-%m-%d",
+}
+FIELDS = ("stress_val", "screen_hours", "temp", "humid", "aq")
+
+
+def bucket_key(period, timestamp):
+    """Key bucket untuk epoch detik (waktu lokal)."""
+    return datetime.fromtimestamp(timestamp).strftime(PERIODS[period])
+
+
+def _new_bucket():
+    return {
+        "count": 0,
+        "fields": {name: [0.0, None, None] for name in FIELDS},   # [total, min, max]
+        "categories": [0] * len(CATEGORY_LABELS),
+    }
+
+
+def _add(bucket, values, category):
+    bucket["count"] += 1
+    for name in FIELDS:
+        stats = bucket["fields"][name]
+        value = float(values[name])
+        stats[0] += value
+        stats[1] = value if stats[1] is None else min(stats[1], value)
+        stats[2] = value if stats[2] is None else max(stats[2], value)
+    bucket["categories"][category] += 1
+
+
+def summarize(key, bucket):
+    """Bucket -> dict API (mean dihitung dari total)."""
+    count = bucket["count"]
+    return {
+        "bucket": key,
+        "count": count,
+        **{
+            name: {"mean": total / count, "min": low, "max": high}
+            for name, (total, low, high) in bucket["fields"].items()
+        },
+        "categories": dict(zip(CATEGORY_LABELS, bucket["categories"])),
+    }
+
+
+class RollupStore:
+    """Rollup per device di memori + penyimpanan JSON berkala."""
+
+    def __init__(self, folder, save_interval=5.0, autosave=True, ttl=None, max_devices=None,
+                 max_hour_buckets=None):
+        self.folder = folder
+        self.save_interval = save_interval
+        self.ttl = ttl                              # detik, None = tanpa kedaluwarsa
+        self.max_devices = max_devices              # None = tanpa batas
+        self.max_hour_buckets = max_hour_buckets    # None = tanpa batas
+        os.makedirs(folder, exist_ok=True)
+
+        self._devices = OrderedDict()   # device_id -> {period: {key: bucket}}, urut terakhir dipakai
+        self._last_used = {}            # device_id -> epoch terakhir dipakai
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self._thread = None
+        if autosave:
+            self._thread = threading.Thread(target=self._run, name="rollup-saver", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def path(self, device_id):
+        return os.path.join(self.folder, f"{device_id}.json")
+
+    def _load(self, device_id, create=False):
+        """
+        Rollup device dari memori atau disk (lock sudah dipegang).
+        Device yang belum punya data hanya dibuat jika create=True (saat add),
+        agar query untuk device_id sembarang tidak menambah entri di memori.
+        """
+        rollups = self._devices.get(device_id)
+        if rollups is None:
+            try:
+                with open(self.path(device_id)) as f:
+                    rollups = json.load(f)
+            except (OSError, ValueError):
+                if not create:
+                    return None
+                rollups = {period: {} for period in PERIODS}
+            self._devices[device_id] = rollups
+        self._devices.move_to_end(device_id)
+        self._last_used[device_id] = time.time()
+        return rollups
+
+    def _evict(self):
+        """Melepas device idle / kelebihan yang sudah tersimpan (lock sudah dipegang)."""
+        now = time.time()
+        for device_id in list(self._devices):
+            over_limit = self.max_devices is not None and len(self._devices) > self.max_devices
+            idle = self.ttl is not None and now - self._last_used[device_id] > self.ttl
+            if not (over_limit or idle):
+                break
+            if device_id not in self._dirty:
+                del self._devices[device_id]
+                del self._last_used[device_id]
+
+    def add(self, device_id, timestamp, values, category):
+        """
+        Menambahkan satu upload ke bucket jam & harinya (O(1)).
+        values: dict dengan kunci FIELDS; category: label atau index kategori.
+        """
+        if isinstance(category, str):
+            category = CATEGORY_LABELS.index(category)
+        with self._lock:
+            rollups = self._load(device_id, create=True)
+            for period, buckets in rollups.items():
+                key = bucket_key(period, timestamp)
+                bucket = buckets.get(key)
+                if bucket is None:
+                    bucket = buckets[key] = _new_bucket()
+                    if period == "hour" and self.max_hour_buckets is not None:
+                        while len(buckets) > self.max_hour_buckets:
+                            del buckets[min(buckets)]
+                _add(bucket, values, category)
+            self._dirty.add(device_id)
+
+    def query(self, device_id, period="day", start=None, end=None):
+        """Bucket period dengan start <= waktu bucket <= end (epoch), urut waktu."""
+        if period not in PERIODS:
+            raise ValueError(f"Unknown period: {period!r} (pilih dari {tuple(PERIODS)})")
+        low = None if start is None else bucket_key(period, start)
+        high = None if end is None else bucket_key(period, end)
+        with self._lock:
+            rollups = self._load(device_id)
+            if rollups is None:
+                return []
+            buckets = rollups[period]
+            return [
+                summarize(key, buckets[key]) for key in sorted(buckets)
+                if (low is None or key >= low) and (high is None or key <= high)
+            ]
+
+    def reset(self, device_id):
+        with self._lock:
+            self._devices[device_id] = {period: {} for period in PERIODS}
+            self._last_used[device_id] = time.time()
+            self._dirty.add(device_id)
+
+    def save(self):
+        """Menulis device yang berubah ke disk (atomic per file)."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            snapshots = {device_id: json.dumps(self._devices[device_id]) for device_id in dirty}
+
+        for device_id, data in snapshots.items():
+            path = self.path(device_id)
+            try:
+                with open(path + ".tmp", "w") as f:
+                    f.write(data)
+                os.replace(path + ".tmp", path)
+            except OSError as e:
+                print(f"[ROLLUP] Gagal menyimpan {path}: {e}")
+                with self._lock:
+                    self._dirty.add(device_id)
+
+        with self._lock:
+            self._evict()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(5.0)
+            self._thread = None
+        self.save()
+
+    def _run(self):
+        while not self._stop.wait(self.save_interval):
+            self.save()
+
+
+def rebuild_from_csv(store, csv_path, device_id):
+    """Menghitung ulang rollup device dari dataset_{device_id}.csv; mengembalikan jumlah baris."""
+    store.reset(device_id)
+    count = 0
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            timestamp = datetime.strptime(row["timestamp"], "%Y-%m-%d %H:%M:%S").timestamp()
+            store.add(device_id, timestamp, row, row["category"])
+            count += 1
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bangun ulang rollup per jam/hari dari dataset_*.csv")
+    parser.add_argument("--folder", default=config.DATA_FOLDER)
+    parser.add_argument("--output", default=config.ROLLUP_FOLDER)
+    args = parser.parse_args()
+
+    store = RollupStore(args.output, autosave=False)
+    print("=" * 60)
+    for csv_path in sorted(glob.glob(os.path.join(args.folder, "dataset_*.csv"))):
+        device_id = os.path.basename(csv_path)[len("dataset_"):-len(".csv")]
+        count = rebuild_from_csv(store, csv_path, device_id)
+        days = len(store.query(device_id, "day"))
+        print(f"  {device_id}: {count} baris -> {days} hari")
+    store.save()
+    print(f"Rollup tersimpan di {args.output}")
+    print("=" * 60)
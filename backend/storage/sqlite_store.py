@@ -0,0 +1,169 @@
+"""
+Storage SQLite (WAL)
+====================
+Satu database SQLite dengan tabel:
+  - readings       : ringkasan per upload HP (skor stres)
+  - app_usage      : durasi per aplikasi per upload
+  - sensor_samples : data sensor ruangan
+Setiap tabel punya index (device_id/sensor_id, timestamp) sehingga query
+rentang waktu tidak perlu scan penuh. Timestamp disimpan sebagai teks
+"YYYY-MM-DD HH:MM:SS" (urut secara leksikografis).
+
+Penulisan lewat BatchWriter: baris dikumpulkan lalu dimasukkan dalam satu
+transaksi (executemany) per flush. Mode WAL membuat pembacaan dari thread
+lain tidak terblokir oleh penulisan.
+"""
+
+import os
+import sqlite3
+import threading
+
+from storage.writer import BatchWriter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS readings (
+    device_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    temp REAL,
+    humid REAL,
+    aq REAL,
+    screen_hours REAL,
+    stress_val REAL,
+    category TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_readings_device_time ON readings (device_id, timestamp);
+
+CREATE TABLE IF NOT EXISTS app_usage (
+    device_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    app_name TEXT,
+    duration_sec REAL
+);
+CREATE INDEX IF NOT EXISTS idx_app_usage_device_time ON app_usage (device_id, timestamp);
+
+CREATE TABLE IF NOT EXISTS sensor_samples (
+    sensor_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    temp REAL,
+    humid REAL,
+    aq REAL
+);
+CREATE INDEX IF NOT EXISTS idx_sensor_samples_sensor_time ON sensor_samples (sensor_id, timestamp);
+"""
+
+# Kolom per tabel (urutan INSERT)
+COLUMNS = {
+    "readings": ("device_id", "timestamp", "temp", "humid", "aq", "screen_hours", "stress_val", "category"),
+    "app_usage": ("device_id", "timestamp", "app_name", "duration_sec"),
+    "sensor_samples": ("sensor_id", "timestamp", "temp", "humid", "aq"),
+}
+
+
+def connect(path):
+    """Koneksi SQLite dengan WAL + skema siap pakai."""
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class SqliteWriter(BatchWriter):
+    """BatchWriter yang menulis semua tabel tertunda dalam satu transaksi."""
+
+    name = "sqlite-writer"
+
+    def __init__(self, path, **options):
+        self.path = path
+        self._conn = None
+        super().__init__(**options)
+
+    def _write(self, pending):
+        if self._conn is None:
+            self._conn = connect(self.path)
+        try:
+            with self._conn:
+                for table, (_, rows) in pending.items():
+                    columns = COLUMNS[table]
+                    self._conn.executemany(
+                        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                        rows
+                    )
+            return 0
+        except sqlite3.Error as e:
+            print(f"[SQLITE WRITER] Gagal menulis ke {self.path}: {e}")
+            return sum(len(rows) for _, rows in pending.values())
+
+    def _shutdown(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class SqliteStorage:
+    """Storage berbasis SQLite (WAL) dengan query rentang waktu per device."""
+
+    def __init__(self, path, **writer_options):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        connect(path).close()
+        self.writer = SqliteWriter(path, **writer_options)
+        self._local = threading.local()
+
+    @property
+    def stats(self):
+        return self.writer.stats
+
+    def record_usage(self, device_id, timestamp, reading, usage):
+        """reading: dict temp/humid/aq/screen_hours/stress_val/category; usage: [(app_name, duration_sec)]."""
+        self.writer.append("readings", None, [(device_id, timestamp) + tuple(
+            reading[name] for name in COLUMNS["readings"][2:]
+        )])
+        if usage:
+            self.writer.append("app_usage", None, [
+                (device_id, timestamp, app_name, duration) for app_name, duration in usage
+            ])
+
+    def record_sensor(self, sensor_id, timestamp, temp, humid, aq):
+        self.writer.append("sensor_samples", None, [(sensor_id, timestamp, temp, humid, aq)])
+
+    def flush(self, timeout=None):
+        return self.writer.flush(timeout)
+
+    def close(self):
+        self.writer.close()
+
+    # === Query (koneksi baca per thread) ===
+
+    def _reader(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+        return conn
+
+    def query(self, table, key, start=None, end=None, limit=None):
+        """Baris table untuk device/sensor key dengan start <= timestamp <= end (urut waktu)."""
+        key_column = COLUMNS[table][0]
+        sql = f"SELECT * FROM {table} WHERE {key_column} = ?"
+        params = [key]
+        if start is not None:
+            sql += " AND timestamp >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND timestamp <= ?"
+            params.append(end)
+        sql += " ORDER BY timestamp"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self._reader().execute(sql, params)]
+
+    def readings(self, device_id, start=None, end=None, limit=None):
+        return self.query("readings", device_id, start, end, limit)
+
+    def app_usage(self, device_id, start=None, end=None, limit=None):
+        return self.query("app_usage", device_id, start, end, limit)
+
+    def sensor_samples(self, sensor_id, start=None, end=None, limit=None):
+        return self.query("sensor_samples", sensor_id, start, end, limit)
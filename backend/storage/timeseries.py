@@ -0,0 +1,162 @@
+"""
+Time-Series Biner per Device (memmap)
+=====================================
+Ringkasan per upload (timestamp, temp, humid, aq, screen_hours, stress_val,
+kode kategori) disimpan sebagai record NumPy berukuran tetap, append-only,
+satu file per device: {folder}/{device_id}.ts1. File dibaca lewat
+np.memmap, jadi riwayat untuk grafik/analisis adalah slice tanpa salinan
+dan tanpa parsing teks; rentang waktu dicari dengan binary search
+(np.searchsorted) karena record ditulis urut waktu.
+
+Penulisan lewat BatchWriter (thread background, group commit).
+
+Usage:
+    python -m storage.timeseries              # konversi CSV lama di DATA_FOLDER
+    python -m storage.timeseries --folder data --output data/series
+"""
+
+import argparse
+import csv
+import glob
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+
+import config
+from logic.fuzzy_logic import CATEGORY_LABELS
+from storage.writer import BatchWriter
+
+# Layout record (little-endian, tanpa padding). Ubah EXTENSION jika layout berubah.
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),      # epoch detik (waktu lokal server)
+    ("temp", "<f4"),
+    ("humid", "<f4"),
+    ("aq", "<f4"),
+    ("screen_hours", "<f4"),
+    ("stress_val", "<f4"),
+    ("category", "u1"),        # index ke CATEGORY_LABELS
+])
+EXTENSION = ".ts1"
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def to_epoch(value):
+    """Timestamp (epoch, datetime, atau teks TIMESTAMP_FORMAT) -> epoch detik."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.strptime(value, TIMESTAMP_FORMAT).timestamp()
+    return float(value)
+
+
+def make_record(timestamp, temp, humid, aq, screen_hours, stress_val, category):
+    """Satu record; category boleh label (CATEGORY_LABELS) atau kode."""
+    if isinstance(category, str):
+        category = CATEGORY_LABELS.index(category)
+    return (to_epoch(timestamp), temp, humid, aq, screen_hours, stress_val, category)
+
+
+class TimeSeriesWriter(BatchWriter):
+    """Menulis record tertunda ke file per device (mode append biner)."""
+
+    name = "timeseries-writer"
+
+    def _write(self, pending):
+        failed = 0
+        for path, (_, rows) in pending.items():
+            try:
+                with open(path, "ab") as f:
+                    np.array(rows, dtype=RECORD_DTYPE).tofile(f)
+            except (OSError, ValueError) as e:
+                failed += len(rows)
+                print(f"[TIMESERIES] Gagal menulis {path}: {e}")
+        return failed
+
+
+class TimeSeriesStore:
+    """Store record per device: append lewat writer, baca lewat memmap."""
+
+    def __init__(self, folder, **writer_options):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+        self.writer = TimeSeriesWriter(**writer_options)
+        self._maps = {}   # device_id -> memmap (dipetakan ulang jika file bertambah)
+        self._lock = threading.Lock()
+
+    def path(self, device_id):
+        return os.path.join(self.folder, f"{device_id}{EXTENSION}")
+
+    def append(self, device_id, *records):
+        self.writer.append(self.path(device_id), None, list(records))
+
+    def flush(self, timeout=None):
+        return self.writer.flush(timeout)
+
+    def close(self):
+        self.writer.close()
+
+    def records(self, device_id):
+        """Semua record device sebagai memmap read-only (array kosong jika belum ada)."""
+        path = self.path(device_id)
+        try:
+            count = os.path.getsize(path) // RECORD_DTYPE.itemsize
+        except OSError:
+            count = 0
+        if count == 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+
+        with self._lock:
+            mapped = self._maps.get(device_id)
+            if mapped is None or len(mapped) != count:
+                # Hanya record utuh yang dipetakan (record terakhir bisa sedang ditulis)
+                mapped = np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(count,))
+                self._maps[device_id] = mapped
+            return mapped
+
+    def read(self, device_id, start=None, end=None):
+        """Slice record dengan start <= timestamp <= end (tanpa salinan)."""
+        data = self.records(device_id)
+        timestamps = data["timestamp"]
+        lo = 0 if start is None else int(np.searchsorted(timestamps, to_epoch(start), side="left"))
+        hi = len(data) if end is None else int(np.searchsorted(timestamps, to_epoch(end), side="right"))
+        return data[lo:hi]
+
+    def devices(self):
+        return sorted(os.path.basename(p)[:-len(EXTENSION)] for p in glob.glob(os.path.join(self.folder, f"*{EXTENSION}")))
+
+
+def convert_csv(csv_path, output_path):
+    """Konversi satu dataset_{device_id}.csv ke file record (ditimpa); mengembalikan jumlah record."""
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        records = [
+            make_record(row["timestamp"], float(row["temp"]), float(row["humid"]), float(row["aq"]),
+                        float(row["screen_hours"]), float(row["stress_val"]), row["category"])
+            for row in csv.DictReader(f)
+        ]
+
+    data = np.array(records, dtype=RECORD_DTYPE)
+    # Urutkan agar binary search berlaku walau CSV tidak urut
+    data = data[np.argsort(data["timestamp"], kind="stable")]
+    tmp_path = output_path + ".tmp"
+    data.tofile(tmp_path)
+    os.replace(tmp_path, output_path)
+    return len(data)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Konversi dataset_*.csv ke time-series biner per device")
+    parser.add_argument("--folder", default=config.DATA_FOLDER)
+    parser.add_argument("--output", default=config.TIMESERIES_FOLDER)
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    print("=" * 60)
+    for csv_path in sorted(glob.glob(os.path.join(args.folder, "dataset_*.csv"))):
+        device_id = os.path.basename(csv_path)[len("dataset_"):-len(".csv")]
+        output_path = os.path.join(args.output, f"{device_id}{EXTENSION}")
+        count = convert_csv(csv_path, output_path)
+        print(f"  {device_id}: {count} record -> {output_path}")
+    print("=" * 60)
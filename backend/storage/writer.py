@@ -0,0 +1,126 @@
+"""
+Background Batch Writer
+=======================
+Dasar penulis group-commit: request thread hanya memasukkan baris ke
+antrean (bounded queue); satu thread background mengumpulkan baris per
+tujuan (file CSV, tabel SQLite, ...) lalu menulisnya sekaligus lewat
+_write(pending).
+
+Baris di-flush saat:
+  - jumlah baris tertunda mencapai flush_rows,
+  - baris tertua sudah menunggu flush_interval detik,
+  - flush() / close() dipanggil (close() juga terdaftar di atexit).
+
+Jika antrean penuh, append() menunggu (backpressure) sampai ada ruang.
+"""
+
+import atexit
+import queue
+import threading
+import time
+
+# Sinyal internal di antrean
+_FLUSH = object()
+_STOP = object()
+
+
+class BatchWriter:
+    """Antrean + thread background; subclass mengimplementasikan _write()."""
+
+    name = "batch-writer"
+
+    def __init__(self, queue_size=10000, flush_rows=500, flush_interval=1.0):
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._pending = {}           # key -> (meta, [rows])
+        self._pending_rows = 0
+        self._oldest = None          # waktu baris tertunda tertua
+        self._closed = False
+
+        self.stats = {"rows": 0, "flushes": 0, "errors": 0}
+
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def append(self, key, meta, rows):
+        """Menjadwalkan penulisan rows ke tujuan key (meta: info tujuan, mis. header)."""
+        if self._closed:
+            raise RuntimeError(f"{type(self).__name__} sudah ditutup")
+        self._queue.put((key, meta, rows))
+
+    def flush(self, timeout=None):
+        """Menunggu sampai semua baris yang sudah di-append tertulis."""
+        done = threading.Event()
+        self._queue.put((_FLUSH, done, None))
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Flush semua baris tertunda, tutup tujuan, hentikan thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put((_STOP, None, None))
+        self._thread.join(timeout)
+
+    # === Diimplementasikan subclass (dipanggil dari thread background) ===
+
+    def _write(self, pending):
+        """Menulis {key: (meta, rows)}; mengembalikan jumlah baris yang gagal."""
+        raise NotImplementedError
+
+    def _shutdown(self):
+        pass
+
+    # === Thread background ===
+
+    def _run(self):
+        while True:
+            timeout = None
+            if self._oldest is not None:
+                timeout = max(0.0, self._oldest + self.flush_interval - time.monotonic())
+
+            try:
+                key, meta, rows = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._write_pending()
+                continue
+
+            if key is _FLUSH:
+                self._write_pending()
+                meta.set()
+            elif key is _STOP:
+                self._write_pending()
+                try:
+                    self._shutdown()
+                except Exception as e:
+                    print(f"[{self.name.upper()}] Gagal menutup: {e!r}")
+                return
+            else:
+                entry = self._pending.setdefault(key, (meta, []))
+                entry[1].extend(rows)
+                self._pending_rows += len(rows)
+                if self._oldest is None:
+                    self._oldest = time.monotonic()
+                if self._pending_rows >= self.flush_rows:
+                    self._write_pending()
+
+    def _write_pending(self):
+        pending, self._pending = self._pending, {}
+        total, self._pending_rows = self._pending_rows, 0
+        self._oldest = None
+        if not pending:
+            return
+
+        try:
+            failed = self._write(pending)
+        except Exception as e:
+            # Thread tidak boleh mati: append() akan terblokir selamanya
+            # begitu antrean penuh, dan flush()/close() tidak pernah selesai.
+            print(f"[{self.name.upper()}] Gagal menulis {total} baris: {e!r}")
+            failed = total
+        self.stats["rows"] += total - failed
+        self.stats["errors"] += bool(failed)
+        self.stats["flushes"] += 1
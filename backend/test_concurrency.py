@@ -0,0 +1,188 @@
+"""
+test_concurrency.py
+Stress test untuk memastikan inferensi fuzzy aman dipanggil paralel:
+setiap request harus mendapat skor untuk inputnya sendiri, bukan skor
+device lain yang kebetulan dihitung bersamaan.
+
+Tidak butuh server berjalan (memakai Flask test client).
+Usage: python test_concurrency.py
+"""
+
+import os
+import random
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import app as server
+from logic import fuzzy_logic
+from storage import create_storage
+from storage.app_usage import AppUsageStore
+from storage.rollups import RollupStore
+from storage.timeseries import TimeSeriesStore
+
+# ========================================
+# KONFIGURASI
+# ========================================
+NUM_THREADS = 16
+NUM_INPUTS = 24          # jumlah kombinasi input berbeda
+REPEATS = 4              # setiap input dihitung ulang beberapa kali secara acak
+ENGINE_MODES = ["mamdani", "analytic", "sparse", "kernel"]
+
+# app mengaktifkan cache inferensi saat diimpor; dengan cache, panggilan
+# paralel setelah hitungan berurutan semuanya cache hit dan engine tidak
+# pernah berjalan paralel. Cache dimatikan untuk seluruh test ini.
+fuzzy_logic.configure_cache(0)
+
+
+def print_header(text):
+    """Print header dengan border"""
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70)
+
+def print_success(text):
+    """Print success message"""
+    print(f"✅ {text}")
+
+def print_error(text):
+    """Print error message"""
+    print(f"❌ {text}")
+
+def print_info(text):
+    """Print info message"""
+    print(f"ℹ️  {text}")
+
+def run_test(test):
+    """Jalankan satu test (gagal = AssertionError) -> True jika lulus"""
+    try:
+        test()
+        return True
+    except AssertionError as e:
+        print_error(str(e))
+        return False
+
+def make_inputs(seed=42):
+    """Kombinasi input acak (screen, temp, humid, aq) yang berbeda-beda"""
+    rng = random.Random(seed)
+    return [
+        (
+            round(rng.uniform(0, 24), 2),
+            round(rng.uniform(15, 35), 2),
+            round(rng.uniform(30, 90), 1),
+            round(rng.uniform(0, 5), 2),
+        )
+        for _ in range(NUM_INPUTS)
+    ]
+
+def run_parallel(func, jobs):
+    """Jalankan func(job) untuk semua job di NUM_THREADS thread"""
+    with ThreadPoolExecutor(max_workers=NUM_THREADS) as pool:
+        return list(pool.map(func, jobs))
+
+def test_1_engine_isolation():
+    """Test 1: calculate_stress paralel = calculate_stress berurutan (per engine)"""
+    print_header("TEST 1: Isolasi calculate_stress antar thread")
+
+    inputs = make_inputs()
+    original_mode = fuzzy_logic.ENGINE_MODE
+    failed_modes = []
+
+    for mode in ENGINE_MODES:
+        fuzzy_logic.set_engine(mode)
+        expected = [fuzzy_logic.calculate_stress(*case)["stress_value"] for case in inputs]
+
+        jobs = list(range(len(inputs))) * REPEATS
+        random.Random(7).shuffle(jobs)
+        results = run_parallel(lambda i: (i, fuzzy_logic.calculate_stress(*inputs[i])["stress_value"]), jobs)
+
+        mismatches = [(i, got) for i, got in results if got != expected[i]]
+        if mismatches:
+            failed_modes.append(mode)
+            print_error(f"[{mode}] {len(mismatches)}/{len(results)} hasil tertukar antar thread")
+            for i, got in mismatches[:5]:
+                print(f"   Input {inputs[i]} -> dapat {got}, seharusnya {expected[i]}")
+        else:
+            print_success(f"[{mode}] {len(results)} inferensi paralel cocok dengan hasil berurutan")
+
+    fuzzy_logic.set_engine(original_mode)
+    assert not failed_modes, f"Hasil tertukar antar thread pada engine {failed_modes}"
+
+def test_2_receive_usage_isolation():
+    """Test 2: /receive_usage paralel dari banyak device"""
+    print_header("TEST 2: Isolasi /receive_usage antar device")
+
+    # CSV ditulis ke folder sementara agar data/ tidak tercemar
+    tmp_dir = tempfile.mkdtemp(prefix="stress_test_")
+    originals = server.STORAGE, server.TIMESERIES, server.APP_USAGE, server.ROLLUPS
+    server.STORAGE = create_storage(folder=tmp_dir)
+    server.TIMESERIES = TimeSeriesStore(os.path.join(tmp_dir, "series"))
+    server.APP_USAGE = AppUsageStore(os.path.join(tmp_dir, "app_usage"))
+    server.ROLLUPS = RollupStore(os.path.join(tmp_dir, "rollups"))
+
+    try:
+        iot = server.LAST_IOT_DATA
+        screen_hours = [case[0] for case in make_inputs()]
+        expected = [
+            fuzzy_logic.calculate_stress(h, iot["temperature"], iot["humidity"], iot["air_quality"])["stress_value"]
+            for h in screen_hours
+        ]
+
+        def post(i):
+            payload = {
+                "device_id": f"stress_device_{i}",
+                "total_screen_time_s": screen_hours[i] * 3600,
+                "usage_data": [{"app_name": "com.example.app", "foreground_time_s": 60}],
+            }
+            with server.app.test_client() as client:
+                response = client.post("/receive_usage", json=payload)
+            return i, response.status_code, response.get_json()
+
+        jobs = list(range(len(screen_hours))) * REPEATS
+        random.Random(11).shuffle(jobs)
+        results = run_parallel(post, jobs)
+
+        failures = [
+            (i, status, body) for i, status, body in results
+            if status != 200
+            or body["device_id"] != f"stress_device_{i}"
+            or body["fuzzy_analysis"]["stress_value"] != expected[i]
+        ]
+        for i, status, body in failures[:5]:
+            print(f"   Device {i}: status={status}, body={body}")
+        assert not failures, f"{len(failures)}/{len(results)} response tidak sesuai device-nya"
+
+        print_success(f"{len(results)} request paralel mendapat skor device masing-masing")
+
+    finally:
+        # Tunggu penulisan background selesai sebelum folder sementara dihapus
+        server.STORAGE.close()
+        server.TIMESERIES.close()
+        server.APP_USAGE.close()
+        server.ROLLUPS.close()
+        server.STORAGE, server.TIMESERIES, server.APP_USAGE, server.ROLLUPS = originals
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def main():
+    """Main test function"""
+    print_header("🧪 CONCURRENCY STRESS TEST")
+    print_info(f"{NUM_THREADS} thread, {NUM_INPUTS} input x {REPEATS} ulangan")
+
+    tests = {
+        "Engine Isolation": test_1_engine_isolation,
+        "Receive Usage Isolation": test_2_receive_usage_isolation,
+    }
+    results = {name: run_test(test) for name, test in tests.items()}
+
+    print_header("RINGKASAN HASIL TEST")
+    for test_name, result in results.items():
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"  {test_name}: {status}")
+
+    if all(results.values()):
+        print("\n🎉 SEMUA TEST BERHASIL!")
+    else:
+        print("\n⚠️  BEBERAPA TEST GAGAL!")
+
+if __name__ == "__main__":
+    main()
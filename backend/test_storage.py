@@ -0,0 +1,205 @@
+"""
+test_storage.py
+Test lapisan storage:
+- storage/writer.py: thread penulis harus tetap hidup walau _write() gagal,
+  sehingga append() tidak terblokir saat antrean penuh dan flush()/close()
+  tetap selesai.
+- storage/rollups.py: query untuk device yang tidak dikenal tidak boleh
+  menambah entri di memori; device idle dilepas dari memori dan bucket jam
+  dibatasi.
+- storage/app_usage.py: upload dengan detik tidak valid dilewati tanpa
+  menggeser id aplikasi device tersebut.
+
+Tidak butuh server berjalan.
+Usage: python test_storage.py
+"""
+
+import shutil
+import tempfile
+import threading
+
+from storage.app_usage import AppUsageStore
+from storage.rollups import RollupStore
+from storage.writer import BatchWriter
+
+# ========================================
+# KONFIGURASI
+# ========================================
+QUEUE_SIZE = 4
+NUM_APPENDS = 50
+FAILING_WRITES = 3       # jumlah _write() pertama yang melempar exception
+TIMEOUT = 5.0            # detik sebelum dianggap hang
+
+
+def print_header(text):
+    """Print header dengan border"""
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70)
+
+def print_success(text):
+    """Print success message"""
+    print(f"✅ {text}")
+
+def print_error(text):
+    """Print error message"""
+    print(f"❌ {text}")
+
+def print_info(text):
+    """Print info message"""
+    print(f"ℹ️  {text}")
+
+
+class FlakyWriter(BatchWriter):
+    """BatchWriter yang gagal (bukan OSError) pada beberapa _write() pertama."""
+
+    name = "flaky-writer"
+
+    def __init__(self, **options):
+        self.calls = 0
+        self.written = []
+        super().__init__(**options)
+
+    def _write(self, pending):
+        self.calls += 1
+        if self.calls <= FAILING_WRITES:
+            raise RuntimeError(f"gagal disengaja #{self.calls}")
+        for _, rows in pending.values():
+            self.written.extend(rows)
+        return 0
+
+
+def test_1_writer_survives_failing_write():
+    """Test 1: exception di _write() tidak mematikan thread penulis"""
+    print_header("TEST 1: BatchWriter tetap hidup saat _write() gagal")
+
+    writer = FlakyWriter(queue_size=QUEUE_SIZE, flush_rows=1, flush_interval=0.05)
+
+    # append() dijalankan di thread lain agar hang bisa dideteksi
+    def produce():
+        for i in range(NUM_APPENDS):
+            writer.append("rows", None, [i])
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    producer.join(TIMEOUT)
+    assert not producer.is_alive(), f"append() terblokir (antrean {QUEUE_SIZE} penuh, thread penulis mati?)"
+    print_success(f"{NUM_APPENDS} append selesai walau antrean hanya {QUEUE_SIZE}")
+
+    assert writer.flush(TIMEOUT), "flush() tidak selesai"
+    writer.close(TIMEOUT)
+    assert not writer._thread.is_alive(), "close() tidak menghentikan thread penulis"
+
+    print_info(f"Statistik: {writer.stats}")
+    assert writer.stats["errors"] == FAILING_WRITES, \
+        f"errors={writer.stats['errors']}, seharusnya {FAILING_WRITES}"
+    assert writer.written and writer.stats["rows"] == len(writer.written), \
+        "Baris setelah kegagalan tidak tertulis"
+
+    print_success(f"{FAILING_WRITES} kegagalan tercatat, {len(writer.written)} baris berikutnya tetap tertulis")
+
+
+def test_2_rollup_query_unknown_device():
+    """Test 2: query device tak dikenal tidak di-cache di RollupStore"""
+    print_header("TEST 2: RollupStore tidak menyimpan query device tak dikenal")
+
+    tmp_dir = tempfile.mkdtemp(prefix="stress_rollups_")
+    store = RollupStore(tmp_dir, autosave=False)
+    try:
+        for i in range(100):
+            assert store.query(f"unknown-{i}", "hour") == [], "Device tak dikenal mengembalikan bucket"
+        assert not store._devices, f"{len(store._devices)} device tak dikenal ter-cache"
+        print_success("100 query device tak dikenal -> [] tanpa entri di memori")
+
+        values = {"stress_val": 50.0, "screen_hours": 2.0, "temp": 30.0, "humid": 60.0, "aq": 100.0}
+        store.add("dev-1", 1700000000, values, 1)
+        assert len(store.query("dev-1", "hour")) == 1 and list(store._devices) == ["dev-1"], \
+            "add() tidak membuat entri device"
+        print_success("add() tetap membuat entri untuk device baru")
+    finally:
+        store.close()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def test_3_app_usage_invalid_seconds():
+    """Test 3: foreground_time_s tidak valid tidak menggeser id aplikasi"""
+    print_header("TEST 3: AppUsageStore melewati upload dengan detik tidak valid")
+
+    tmp_dir = tempfile.mkdtemp(prefix="stress_app_usage_")
+    store = AppUsageStore(tmp_dir, flush_rows=1000, flush_interval=0.05)
+    try:
+        store.append("dev-1", "2026-01-01 10:00:00", [("Instagram", 100)])
+        store.append("dev-2", "2026-01-01 10:00:00", [("YouTube", 30)])
+        store.append("dev-1", "2026-01-01 10:01:00", [("BadApp", None)])
+        store.append("dev-1", "2026-01-01 10:02:00", [("WhatsApp", 50)])
+        store.flush(TIMEOUT)
+
+        totals = store.app_totals("dev-1")
+        print_info(f"dev-1: {totals}")
+        assert totals == {"Instagram": 100, "WhatsApp": 50}, \
+            "Total per aplikasi dev-1 salah (id aplikasi bergeser?)"
+        assert store.app_totals("dev-2") == {"YouTube": 30}, "Device lain di batch yang sama ikut hilang"
+        print_success("Upload tidak valid dilewati, aplikasi lain tetap benar")
+    finally:
+        store.close()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def test_4_rollup_eviction():
+    """Test 4: RollupStore melepas device berlebih dan membatasi bucket jam"""
+    print_header("TEST 4: Eviksi device & batas bucket jam RollupStore")
+
+    tmp_dir = tempfile.mkdtemp(prefix="stress_rollups_")
+    store = RollupStore(tmp_dir, autosave=False, max_devices=2, max_hour_buckets=3)
+    values = {"stress_val": 50.0, "screen_hours": 2.0, "temp": 30.0, "humid": 60.0, "aq": 100.0}
+    try:
+        for hour in range(5):
+            store.add("dev-1", 1700000000 + hour * 3600, values, 1)
+        assert len(store.query("dev-1", "hour")) == 3, "Bucket jam tidak dibatasi max_hour_buckets"
+        print_success("Hanya 3 bucket jam terbaru yang disimpan")
+
+        for device_id in ("dev-2", "dev-3"):
+            store.add(device_id, 1700000000, values, 1)
+        store.save()
+        assert list(store._devices) == ["dev-2", "dev-3"], f"Device di memori: {list(store._devices)}"
+        assert len(store.query("dev-1", "hour")) == 3, "Device yang dilepas tidak dimuat ulang dari disk"
+        print_success("Device paling lama dilepas setelah disimpan, lalu dimuat ulang dari disk")
+    finally:
+        store.close()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def run_test(test):
+    """Jalankan satu test (gagal = AssertionError) -> True jika lulus"""
+    try:
+        test()
+        return True
+    except AssertionError as e:
+        print_error(str(e))
+        return False
+
+
+def main():
+    """Main test function"""
+    print_header("🧪 STORAGE WRITER TEST")
+
+    tests = {
+        "Writer Survives Failing Write": test_1_writer_survives_failing_write,
+        "Rollup Unknown Device": test_2_rollup_query_unknown_device,
+        "App Usage Invalid Seconds": test_3_app_usage_invalid_seconds,
+        "Rollup Eviction": test_4_rollup_eviction,
+    }
+    results = {name: run_test(test) for name, test in tests.items()}
+
+    print_header("RINGKASAN HASIL TEST")
+    for test_name, result in results.items():
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"  {test_name}: {status}")
+
+    if all(results.values()):
+        print("\n🎉 SEMUA TEST BERHASIL!")
+    else:
+        print("\n⚠️  BEBERAPA TEST GAGAL!")
+
+if __name__ == "__main__":
+    main()